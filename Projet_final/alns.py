@@ -0,0 +1,362 @@
+# Fichier: alns.py
+#
+# RECHERCHE ADAPTATIVE À GRAND VOISINAGE (ALNS, Ropke & Pisinger 2006):
+# second moteur, à côté du MGA (config MOTEUR = "alns").
+#
+# Une seule solution courante: à chaque itération, un opérateur de
+# destruction retire q clients, un opérateur de réparation les réinsère.
+#   - Destructions: aléatoire, pire coût, Shaw (clients "liés": proches en
+#     distance, en fenêtre de temps et en demande), tournée entière (même
+#     choix que la mutation "Destroy" du MGA, _remove_route).
+#   - Réparations: best insertion (_repair_with_best_insertion), regret-k,
+#     best insertion bruitée (insertion.py).
+#   - Choix des opérateurs par roulette; les poids sont adaptés à la fin de
+#     chaque segment d'itérations selon les scores obtenus (nouvelle
+#     meilleure, amélioration, solution acceptée).
+#   - Acceptation par recuit simulé (température décroissante géométrique).
+# Même interface que MemeticAlgorithm: run() / run_iter(), best_solution,
+# stop_reason, get_operator_statistics().
+
+import math
+import random
+import time
+from problem import ProblemInstance
+from operators_genetic import _repair_with_best_insertion, _remove_route
+from operators_local_search import apply_local_search, LocalSearchStats
+from operators_local_search import _calculate_route_cost, _get_routes, _build_individual
+from constructors import CONSTRUCTORS, initial_solution
+from insertion import RegretCriterion, NoiseCriterion
+from mga import Incumbent
+
+# ---------------------------------------------------------------------------
+# OPÉRATEURS DE DESTRUCTION
+# Signature: (tournées, nombre de clients à retirer, problème, alns) ->
+# clients retirés (les tournées sont modifiées sur place).
+# ---------------------------------------------------------------------------
+
+def _remove_clients(routes, removed):
+    """Retire les clients 'removed' des tournées (les tournées vides disparaissent)."""
+    removed_set = set(removed)
+    routes[:] = [kept for kept in ([c for c in route if c not in removed_set] for route in routes) if kept]
+    return removed
+
+def random_removal(routes, q, problem: ProblemInstance, alns):
+    """Retire q clients tirés au hasard."""
+    clients = [c for route in routes for c in route]
+    return _remove_clients(routes, random.sample(clients, min(q, len(clients))))
+
+def worst_removal(routes, q, problem: ProblemInstance, alns):
+    """
+    Retire les clients qui coûtent le plus (gain à les retirer de leur
+    tournée), avec un tirage biaisé (puissance 'alns.worst_randomness').
+    """
+    gains = []
+    for route in routes:
+        cost = _calculate_route_cost(route, problem)
+        for k, client_id in enumerate(route):
+            gains.append((cost - _calculate_route_cost(route[:k] + route[k + 1:], problem), client_id))
+    gains.sort(reverse=True)
+
+    removed = []
+    while gains and len(removed) < q:
+        _, client_id = gains.pop(int(random.random() ** alns.worst_randomness * len(gains)))
+        removed.append(client_id)
+    return _remove_clients(routes, removed)
+
+def shaw_removal(routes, q, problem: ProblemInstance, alns):
+    """
+    Retrait de Shaw: part d'un client au hasard, puis retire les clients
+    les plus liés (distance, début de fenêtre, demande; valeurs normalisées)
+    à un client déjà retiré, avec un tirage biaisé.
+    """
+    clients = [c for route in routes for c in route]
+    removed = [random.choice(clients)]
+    remaining = set(clients) - set(removed)
+    while remaining and len(removed) < q:
+        reference = random.choice(removed)
+        candidates = sorted(remaining, key=lambda c: alns.relatedness(reference, c))
+        chosen = candidates[int(random.random() ** alns.shaw_randomness * len(candidates))]
+        removed.append(chosen)
+        remaining.discard(chosen)
+    return _remove_clients(routes, removed)
+
+def route_removal(routes, q, problem: ProblemInstance, alns):
+    """Retire une tournée entière (parmi les 3 plus petites, voir _remove_route)."""
+    if len(routes) < 2:
+        return random_removal(routes, q, problem, alns)
+    return _remove_route(routes, problem, candidates=3)
+
+DESTROY_OPERATORS = [
+    ('random', random_removal),
+    ('worst', worst_removal),
+    ('shaw', shaw_removal),
+    ('route', route_removal),
+]
+
+# ---------------------------------------------------------------------------
+# MOTEUR ALNS
+# ---------------------------------------------------------------------------
+
+class ALNS:
+    """
+    Moteur ALNS (voir l'en-tête du fichier).
+    'iterations' joue le rôle de GENERATIONS; les critères d'arrêt
+    communs (max_time, max_stagnation en itérations, target_cost) sont
+    testés à chaque itération.
+    """
+
+    def __init__(self, problem: ProblemInstance, iterations,
+                 removal_rate=(0.1, 0.3), max_removed=60,
+                 start_worse=0.05, end_temperature_ratio=0.002,
+                 segment_length=100, reaction=0.1, scores=(33, 9, 13),
+                 worst_randomness=3, shaw_randomness=6,
+                 regret_k=2, noise=0.025, local_search=True,
+                 constructor='best_insertion', seeds=None, seed=None,
+                 max_time=None, max_stagnation=None, target_cost=None):
+        self.problem = problem
+        self.iterations = iterations
+
+        # Nombre de clients retirés: tiré dans [rate_min x n, rate_max x n], borné
+        self.removal_rate = removal_rate
+        self.max_removed = max_removed
+
+        # Recuit simulé: une solution 'start_worse' (5%) plus chère que la
+        # solution initiale est acceptée avec une probabilité 1/2 au départ;
+        # la température finale vaut 'end_temperature_ratio' x la température initiale.
+        self.start_worse = start_worse
+        self.end_temperature_ratio = end_temperature_ratio
+
+        # Adaptation des poids: tous les 'segment_length' itérations,
+        # poids = (1 - reaction) x poids + reaction x score moyen du segment.
+        # scores = (nouvelle meilleure, meilleure que la courante, acceptée)
+        self.segment_length = segment_length
+        self.reaction = reaction
+        self.scores = scores
+        self.worst_randomness = worst_randomness
+        self.shaw_randomness = shaw_randomness
+
+        self.repair_operators = [
+            ('greedy', None),
+            ('regret', RegretCriterion(regret_k)),
+            ('noise', NoiseCriterion(noise)),
+        ]
+        self.destroy_operators = list(DESTROY_OPERATORS)
+        self.destroy_weights = [1.0] * len(self.destroy_operators)
+        self.repair_weights = [1.0] * len(self.repair_operators)
+
+        # Recherche locale (VND du MGA) appliquée à chaque nouvelle meilleure solution
+        self.local_search = local_search
+        if constructor != 'best_insertion' and constructor not in CONSTRUCTORS:
+            raise ValueError(f"Constructeur initial inconnu: {constructor}")
+        self.constructor = constructor
+        self.seeds = seeds or []
+        self.seed = seed
+
+        self.max_time = max_time
+        self.max_stagnation = max_stagnation
+        self.target_cost = target_cost
+
+        self.best_solution = None
+        self.current = None
+        self.time_to_first_generation = None # Temps jusqu'à la solution initiale
+        self.stop_reason = None
+        self.generations_done = 0            # Itérations effectuées
+        self.ls_stats = LocalSearchStats(deterministic=seed is not None)
+        # Statistiques par opérateur ALNS: appels, succès (nouvelle meilleure
+        # ou amélioration), temps, gain
+        self.operator_stats = {
+            name: {'appels': 0, 'succes': 0, 'temps': 0.0, 'gain': 0.0}
+            for name, _ in self.destroy_operators + self.repair_operators
+        }
+        self._relatedness_scale = None
+
+    # ---------------------------------------------------------------------------
+    # OUTILS
+    # ---------------------------------------------------------------------------
+
+    def relatedness(self, i, j):
+        """Mesure de Shaw (plus petite = plus liés): distance + |e_i - e_j| + |q_i - q_j|, normalisés."""
+        if self._relatedness_scale is None:
+            nodes = [self.problem.get_node(c) for c in self.problem.clients]
+            D = self.problem.get_distance_array()
+            max_distance = float(D.max()) if D is not None else max(
+                self.problem.get_distance(a, b) for a in self.problem.clients for b in self.problem.clients)
+            span_e = max(n['e'] for n in nodes) - min(n['e'] for n in nodes)
+            span_q = max(n['demand'] for n in nodes) - min(n['demand'] for n in nodes)
+            self._relatedness_scale = (max_distance or 1.0, span_e or 1.0, span_q or 1.0)
+        scale_d, scale_e, scale_q = self._relatedness_scale
+        node_i, node_j = self.problem.get_node(i), self.problem.get_node(j)
+        return (9 * self.problem.get_distance(i, j) / scale_d
+                + 3 * abs(node_i['e'] - node_j['e']) / scale_e
+                + 2 * abs(node_i['demand'] - node_j['demand']) / scale_q)
+
+    def _evaluate(self, routes):
+        """Individu évalué; fitness infinie s'il manque des clients (non réinsérables)."""
+        individual = _build_individual(routes)
+        individual.calculate_fitness(self.problem)
+        if sum(len(route) for route in routes) != len(self.problem.clients):
+            individual.fitness = float('inf')
+        return individual
+
+    def _roulette(self, weights):
+        """Indice tiré proportionnellement aux poids."""
+        pick = random.uniform(0, sum(weights))
+        for idx, weight in enumerate(weights):
+            pick -= weight
+            if pick <= 0:
+                return idx
+        return len(weights) - 1
+
+    def _record(self, name, elapsed, gain, improved):
+        s = self.operator_stats[name]
+        s['appels'] += 1
+        s['temps'] += elapsed
+        if improved:
+            s['succes'] += 1
+            s['gain'] += gain
+
+    def _check_stop(self, stagnation):
+        """Raison d'arrêter avant la prochaine itération (None = continuer)."""
+        if self.target_cost is not None and self.best_solution.fitness <= self.target_cost:
+            return 'target_cost'
+        if self.max_stagnation is not None and stagnation >= self.max_stagnation:
+            return 'stagnation'
+        if self.max_time is not None and time.perf_counter() - self._start_time >= self.max_time:
+            return 'time_limit'
+        return None
+
+    # ---------------------------------------------------------------------------
+    # BOUCLE PRINCIPALE
+    # ---------------------------------------------------------------------------
+
+    def run(self, callback=None):
+        """Lance l'ALNS; 'callback(incumbent)' à chaque nouvelle meilleure solution."""
+        for incumbent in self.run_iter():
+            if callback is not None:
+                callback(incumbent)
+        return self.best_solution
+
+    def run_iter(self):
+        """Générateur "anytime": un Incumbent à chaque nouvelle meilleure solution (voir mga.py)."""
+        self._start_time = time.perf_counter()
+        if self.seed is not None:
+            random.seed(self.seed)
+        try:
+            yield from self._run()
+        except GeneratorExit:
+            self.stop_reason = 'interrupted'
+            raise
+
+    def _run(self):
+        problem = self.problem
+        self.current = initial_solution(problem, self.constructor, self.seeds)
+        if self.current.fitness == float('inf'):
+            raise Exception("Échec de la construction de la solution initiale (ALNS).")
+        self.best_solution = self.current
+        self.time_to_first_generation = time.perf_counter() - self._start_time
+        print(f"Solution initiale: {self.current.fitness:.2f} ({self.current.num_vehicles} véhicules)")
+        yield Incumbent(self.best_solution, self.time_to_first_generation, 0)
+
+        if self.local_search:
+            # Première réponse rendue avant la VND (longue sur les grandes instances)
+            self.current = apply_local_search(self.current, problem, self.ls_stats)
+            self.current.calculate_fitness(problem)
+            if self.current.fitness < self.best_solution.fitness:
+                self.best_solution = self.current
+                yield Incumbent(self.best_solution, time.perf_counter() - self._start_time, 0)
+
+        n = len(problem.clients)
+        q_min = max(1, int(self.removal_rate[0] * n))
+        q_max = max(q_min, min(self.max_removed, int(self.removal_rate[1] * n)))
+        temperature = -self.start_worse * self.current.fitness / math.log(0.5)
+        cooling = self.end_temperature_ratio ** (1.0 / max(1, self.iterations))
+
+        destroy_scores = [0.0] * len(self.destroy_operators)
+        destroy_uses = [0] * len(self.destroy_operators)
+        repair_scores = [0.0] * len(self.repair_operators)
+        repair_uses = [0] * len(self.repair_operators)
+        last_improvement = 0
+
+        self.stop_reason = 'generations'
+        for it in range(self.iterations):
+            reason = self._check_stop(it - last_improvement)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Arrêt avant l'itération {it+1}: {reason}")
+                break
+
+            d_idx = self._roulette(self.destroy_weights)
+            r_idx = self._roulette(self.repair_weights)
+            destroy_name, destroy = self.destroy_operators[d_idx]
+            repair_name, criterion = self.repair_operators[r_idx]
+
+            # Destruction puis réparation
+            start = time.perf_counter()
+            routes = [route.copy() for route in _get_routes(self.current)]
+            removed = destroy(routes, random.randint(q_min, q_max), problem, self)
+            destroy_time = time.perf_counter() - start
+            start = time.perf_counter()
+            routes = _repair_with_best_insertion(routes, removed, problem, criterion)
+            candidate = self._evaluate(routes)
+            repair_time = time.perf_counter() - start
+
+            # Acceptation (recuit simulé) et score des opérateurs
+            delta = candidate.fitness - self.current.fitness
+            score = 0
+            gain = 0.0
+            if candidate.fitness < self.best_solution.fitness:
+                if self.local_search:
+                    candidate = apply_local_search(candidate, problem, self.ls_stats)
+                    candidate.calculate_fitness(problem)
+                gain = self.best_solution.fitness - candidate.fitness
+                self.current = self.best_solution = candidate
+                last_improvement = it + 1
+                score = self.scores[0]
+                yield Incumbent(candidate, time.perf_counter() - self._start_time, it + 1)
+            elif delta < 0:
+                gain = -delta
+                self.current = candidate
+                score = self.scores[1]
+            elif candidate.fitness != float('inf') and random.random() < math.exp(-delta / temperature):
+                self.current = candidate
+                score = self.scores[2]
+
+            self._record(destroy_name, destroy_time, gain, gain > 0)
+            self._record(repair_name, repair_time, gain, gain > 0)
+            destroy_scores[d_idx] += score
+            destroy_uses[d_idx] += 1
+            repair_scores[r_idx] += score
+            repair_uses[r_idx] += 1
+            temperature *= cooling
+
+            # Fin de segment: adaptation des poids
+            if (it + 1) % self.segment_length == 0:
+                for weights, scores, uses in ((self.destroy_weights, destroy_scores, destroy_uses),
+                                              (self.repair_weights, repair_scores, repair_uses)):
+                    for k in range(len(weights)):
+                        if uses[k]:
+                            weights[k] = (1 - self.reaction) * weights[k] + self.reaction * scores[k] / uses[k]
+                        weights[k] = max(weights[k], 0.01) # Un opérateur reste toujours possible
+                        scores[k], uses[k] = 0.0, 0
+                print(f"Itération {it+1}/{self.iterations} | Meilleure Fitness: {self.best_solution.fitness:.2f} "
+                      f"| Courante: {self.current.fitness:.2f} | T = {temperature:.2f}")
+
+            self.generations_done = it + 1
+
+        print("\n--- Optimisation Terminée (ALNS) ---")
+
+    def get_operator_statistics(self):
+        """Statistiques par opérateur: ALNS (destruction, réparation) puis VND."""
+        rows = []
+        for name, s in self.operator_stats.items():
+            rows.append({
+                'operateur': name,
+                'appels': s['appels'],
+                'succes': s['succes'],
+                'taux_succes': s['succes'] / s['appels'] if s['appels'] else 0.0,
+                'temps': s['temps'],
+                'evaluations': 0,
+                'gain': s['gain'],
+                'gain_par_seconde': s['gain'] / s['temps'] if s['temps'] > 0 else 0.0,
+            })
+        return rows + self.ls_stats.summary()
@@ -0,0 +1,113 @@
+# Fichier: bounds.py
+#
+# BORNE INFÉRIEURE du coût Z = distance + alpha x véhicules + beta x retards.
+#
+# Sert au critère d'arrêt "borne inférieure atteinte" du MGA. La borne est
+# simple (calculée une fois, en O(n^2)) mais tient compte des arcs
+# impossibles: un arc p -> c n'est possible que si p et c sont compatibles
+# et que e_p + s_p + d(p,c) <= l_c.
+
+import math
+from problem import ProblemInstance
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Repli en Python pur (plus lent)
+
+def _min_vehicles(problem: ProblemInstance):
+    """
+    Nombre minimal de véhicules: capacité (demande totale / Q) et
+    incompatibilités (une clique de clients deux à deux incompatibles,
+    construite gloutonnement, demande autant de véhicules que de clients).
+    """
+    clients = sorted(problem.clients)
+    total_demand = sum(problem.get_node(c)['demand'] for c in clients)
+    by_capacity = math.ceil(total_demand / problem.vehicle_capacity) if clients else 0
+
+    clique = 0
+    candidates = 0
+    for c in clients:
+        candidates |= 1 << c
+    for c in sorted(clients, key=lambda cid: -bin(problem.get_incompatibility_mask(cid)).count('1')):
+        if candidates & (1 << c):
+            clique += 1
+            candidates &= problem.get_incompatibility_mask(c)
+    return max(by_capacity, clique)
+
+def _arc_bounds(problem: ProblemInstance):
+    """
+    Pour chaque client c, sur les arcs possibles: (plus court arc entrant,
+    plus court arc sortant, heure de début au plus tôt). Les arcs du dépôt
+    sont toujours possibles (dans le sens dépôt -> c si d(0,c) <= l_c).
+    """
+    clients = sorted(problem.clients)
+    D = problem.get_distance_array()
+    if D is None:
+        return _arc_bounds_python(problem, clients)
+
+    ids = np.array(clients)
+    n = len(ids)
+    e = np.array([problem.get_node(c)['e'] for c in clients])
+    s = np.array([problem.get_node(c)['s'] for c in clients])
+    l = np.array([problem.get_node(c)['l'] for c in clients])
+    D_cc = D[np.ix_(ids, ids)]
+
+    # arc[i, j]: arc client i -> client j possible
+    earliest_arrival = (e + s)[:, None] + D_cc
+    arc = (earliest_arrival <= l[None, :]) & ~np.eye(n, dtype=bool)
+    index = {c: k for k, c in enumerate(clients)}
+    for c1, c2 in problem.incompatibilities:
+        if c1 in index and c2 in index:
+            arc[index[c1], index[c2]] = False
+            arc[index[c2], index[c1]] = False
+
+    min_in = np.minimum(np.where(arc, D_cc, np.inf).min(axis=0), D[0, ids])
+    min_out = np.minimum(np.where(arc, D_cc, np.inf).min(axis=1), D[ids, 0])
+    earliest_start = np.maximum(e, np.minimum(np.where(arc, earliest_arrival, np.inf).min(axis=0), D[0, ids]))
+    return min_in.tolist(), min_out.tolist(), earliest_start.tolist()
+
+def _arc_bounds_python(problem: ProblemInstance, clients):
+    """Même calcul que _arc_bounds, sans NumPy."""
+    min_in, min_out, earliest_start = [], [], []
+    for c in clients:
+        node_c = problem.get_node(c)
+        incomp = problem.get_incompatibility_mask(c)
+        best_in = problem.get_distance(0, c)
+        best_out = problem.get_distance(c, 0)
+        best_arrival = problem.get_distance(0, c)
+        for p in clients:
+            if p == c or incomp & (1 << p):
+                continue
+            node_p = problem.get_node(p)
+            d_pc = problem.get_distance(p, c)
+            if node_p['e'] + node_p['s'] + d_pc <= node_c['l']:
+                best_in = min(best_in, d_pc)
+                best_arrival = min(best_arrival, node_p['e'] + node_p['s'] + d_pc)
+            if node_c['e'] + node_c['s'] + problem.get_distance(c, p) <= node_p['l']:
+                best_out = min(best_out, problem.get_distance(c, p))
+        min_in.append(best_in)
+        min_out.append(best_out)
+        earliest_start.append(max(node_c['e'], best_arrival))
+    return min_in, min_out, earliest_start
+
+def lower_bound(problem: ProblemInstance):
+    """
+    Borne inférieure de Z:
+      - véhicules: K = max(demande / capacité, clique d'incompatibilités),
+      - distance: chaque arc entre dans un nœud et sort d'un nœud, donc
+        distance >= 1/2 x somme (plus court entrant + plus court sortant)
+        des clients + K x (plus court trajet dépôt-client), chaque tournée
+        partant du dépôt et y revenant,
+      - retards: chaque client commence au plus tôt après son meilleur
+        prédécesseur possible (dépôt compris).
+    """
+    if not problem.clients:
+        return 0.0
+    vehicles = _min_vehicles(problem)
+    min_in, min_out, earliest_start = _arc_bounds(problem)
+
+    depot_leg = min(problem.get_distance(0, c) for c in problem.clients)
+    distance = 0.5 * (sum(min_in) + sum(min_out)) + vehicles * depot_leg
+    delay = sum(start - problem.get_node(c)['e'] for c, start in zip(sorted(problem.clients), earliest_start))
+    return distance + problem.alpha * vehicles + problem.beta * delay
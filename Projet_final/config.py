@@ -50,4 +50,110 @@ POP_SIZE = 50        # Taille de la population (N)
 GENERATIONS = 500    # Nombre de générations (G)
 CROSSOVER_RATE = 0.8 # Taux de croisement (pc)
 MUTATION_RATE = 0.02  # Taux de mutation (pm) - Augmenté pour plus d'exploration
-ELITE_SIZE = 5       # Nombre d'élites (élitisme)
\ No newline at end of file
+ELITE_SIZE = 5       # Nombre d'élites (élitisme)
+
+# Budget de recherche locale PAR GÉNÉRATION, réparti entre les enfants
+# (None = pas de limite). Rend la durée d'une génération prévisible.
+LS_BUDGET_TEMPS_GENERATION = None   # secondes
+LS_BUDGET_EVALS_GENERATION = None   # nombre de mouvements évalués
+
+# Phase de réduction du nombre de véhicules (pool d'éjection), lancée
+# avant le MGA sur la meilleure solution initiale (None = désactivée).
+# Pour l'activer, donner un budget en secondes (ex: 10.0), utile quand
+# alpha domine l'objectif; chaque île le paie aussi.
+ROUTE_MIN_TEMPS = None        # secondes par lancement
+ROUTE_MIN_INTERVALLE = None   # relancer toutes les N générations (None = jamais)
+
+# Mode pénalisé: autorise les solutions infaisables (fenêtres de temps,
+# capacité) dans la population et la recherche locale, avec des poids de
+# pénalité adaptés pour viser une proportion cible de solutions faisables.
+MODE_PENALISE = False
+CIBLE_FAISABILITE = 0.2
+
+# Parallélisme: nombre de processus pour créer les enfants (1 = séquentiel).
+# SEED fixe la graine maître (None = aléatoire) pour des runs reproductibles.
+NB_WORKERS = 1
+SEED = None
+
+# Modèle en îles: NB_ILES populations MGA indépendantes (un processus
+# chacune) qui échangent leurs meilleurs individus (1 = désactivé).
+NB_ILES = 1
+# Paramètres propres à chaque île (réutilisés en boucle si moins d'entrées)
+ILES_PARAMS = [
+    {"crossover_rate": 0.8, "mutation_rate": 0.02},
+    {"crossover_rate": 0.9, "mutation_rate": 0.10},
+    {"crossover_rate": 0.6, "mutation_rate": 0.05},
+]
+MIGRATION_TOPOLOGIE = "ring"  # "ring" ou "random"
+MIGRATION_INTERVALLE = 10     # générations entre deux migrations
+MIGRATION_TAILLE = 2          # nombre d'individus envoyés
+
+# Remplacement: "generational" (population reconstruite à chaque génération)
+# ou "steady_state" (chaque enfant remplace aussitôt un individu moins bon).
+MODE_REMPLACEMENT = "generational"
+
+# Gestion de la diversité: sélection (parents et survivants) sur une fitness
+# biaisée combinant le coût et la distance "broken pairs" moyenne aux
+# NB_PROCHES individus les plus proches; les clones sont éliminés en premier.
+SELECTION_DIVERSITE = False
+NB_PROCHES = 5
+
+# Heuristique de construction de la population initiale:
+# "best_insertion" (défaut), "savings" (économies de Clarke & Wright, vectorisé)
+# "sweep" (balayage polaire autour du dépôt, efficace sur les familles C1/C2)
+# ou "i1" (insertion I1 de Solomon, adaptée aux fenêtres serrées R1/RC1).
+CONSTRUCTEUR_INITIAL = "best_insertion"
+
+# Critère de réinsertion des réparations (croisement, mutation "Destroy"):
+# "best_insertion" (coût seul), "i1" (détour + décalage des heures de service)
+# ou "regret" (regret-k: les clients qui ont le moins de bonnes places d'abord).
+CRITERE_REPARATION = "best_insertion"
+REGRET_K = 2 # 2, 3, ... ou "m" (toutes les tournées)
+# Poids I1: c1 = alpha1 * (d_iu + d_uj - mu * d_ij) + (1 - alpha1) * décalage,
+# client choisi par c2 = lam * d_0u - c1 (maximal).
+I1_PARAMS = {"mu": 1.0, "alpha1": 0.5, "lam": 1.0}
+
+# Chromosome du MGA: "routes" (croisement BCRC + réparation par insertion)
+# ou "giant_tour" (permutation des clients, croisement OX + découpage Split
+# optimal: croisement bon marché, sans réparation).
+CHROMOSOME = "routes"
+
+# Critères d'arrêt (en plus de GENERATIONS), testés entre deux générations
+# (None = désactivé). La raison de l'arrêt est exportée dans le CSV.
+TEMPS_MAX = None                   # secondes depuis le lancement
+GENERATIONS_SANS_AMELIORATION = None
+COUT_CIBLE = None                  # arrêt dès que Z <= COUT_CIBLE
+ECART_BORNE_INF = None             # arrêt si Z <= borne inférieure x (1 + écart); 0.0 = borne atteinte
+
+# Checkpoint (MGA sans îles): état du run écrit toutes les
+# CHECKPOINT_INTERVALLE générations (écriture atomique). Avec
+# REPRENDRE_CHECKPOINT = True et un fichier existant, main.py reprend le run
+# là où il s'était arrêté (mêmes paramètres que le run d'origine).
+CHECKPOINT_FICHIER = None          # ex: os.path.join(script_dir, "results_mga", "checkpoint.bin")
+CHECKPOINT_INTERVALLE = 10
+REPRENDRE_CHECKPOINT = False
+
+# Démarrage à chaud: solutions injectées dans la population initiale après
+# réparation de faisabilité. Fichiers .sol (Vrp-Set), CSV de résultats
+# (results_mga) ou listes de tournées, ex:
+# [os.path.join(script_dir, "results_mga", "Results_C1_2_1_20251112_151743.csv")]
+SOLUTIONS_INITIALES = []
+
+# --- 4. Moteur de résolution ---
+# "mga" (algorithme mémétique, paramètres ci-dessus), "alns" (recherche
+# adaptative à grand voisinage, alns.py) ou "tabu" (recherche tabou
+# granulaire, tabu.py). L'ALNS et le tabou partagent CONSTRUCTEUR_INITIAL,
+# SOLUTIONS_INITIALES, SEED, TEMPS_MAX et COUT_CIBLE (REGRET_K pour l'ALNS).
+MOTEUR = "mga"
+ALNS_ITERATIONS = 20000
+ALNS_TAUX_DESTRUCTION = (0.1, 0.3)         # part des clients retirés par itération (min, max)
+ALNS_RECHERCHE_LOCALE = True               # VND sur chaque nouvelle meilleure solution
+ALNS_ITERATIONS_SANS_AMELIORATION = None   # arrêt par stagnation (None = désactivé)
+
+TABOU_ITERATIONS = 5000
+TABOU_VOISINS = 20                         # mouvements vers les k plus proches voisins compatibles
+TABOU_DUREE = (7, 15)                      # durée tabou des arcs supprimés (min, max), en itérations
+TABOU_ITERATIONS_SANS_AMELIORATION = 1000  # arrêt par stagnation (None = désactivé)
+# Intensification: recherche tabou lancée depuis la meilleure solution du
+# MGA (ou de l'ALNS) à la fin de l'optimisation
+TABOU_INTENSIFICATION = False
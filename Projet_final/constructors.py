@@ -0,0 +1,311 @@
+# Fichier: constructors.py
+#
+# HEURISTIQUES DE CONSTRUCTION de solutions initiales (alternatives à la
+# "Best Insertion" de mga.py), sélectionnables via CONSTRUCTEUR_INITIAL.
+#
+# Chaque constructeur a la signature (problem, randomized=False) -> Individual.
+# Avec randomized=True, il produit une variante aléatoire (diversité de la
+# population initiale).
+
+import math
+import random
+from problem import ProblemInstance
+from operators_local_search import _DEPOT_SEGMENT, _node_segment, _concat_segments
+from operators_local_search import _calculate_route_cost, _build_individual
+from operators_local_search import _apply_2_opt_to_route, SearchBudget
+from insertion import i1_construction
+from vector_scoring import _route_schedule, _insertion_delta
+from operators_genetic import _repair_with_best_insertion
+from warm_start import load_seeds
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Repli en Python pur (plus lent)
+
+# ---------------------------------------------------------------------------
+# FONCTIONS UTILITAIRES
+# ---------------------------------------------------------------------------
+
+def _single_client_routes(problem: ProblemInstance):
+    """
+    Une tournée par client servable seul. Retourne (clients servables,
+    clients non servables).
+    """
+    servable, unserved = [], []
+    for client_id in sorted(problem.clients):
+        if _calculate_route_cost([client_id], problem) != float('inf'):
+            servable.append(client_id)
+        else:
+            unserved.append(client_id)
+    return servable, unserved
+
+def _warn_unserved(name, unserved):
+    if unserved:
+        print(f"  > Avertissement: Heuristique '{name}' n'a pas pu servir {len(unserved)} clients.")
+        print(f"  > Clients non servis: {unserved}")
+
+# ---------------------------------------------------------------------------
+# CONSTRUCTEUR 1: ÉCONOMIES DE CLARKE & WRIGHT (version parallèle)
+# ---------------------------------------------------------------------------
+
+SAVINGS_NEIGHBORS = 80        # Taille des listes de voisins pour les grandes instances
+SAVINGS_FULL_PAIRS_MAX_N = 300 # En dessous, toutes les paires sont considérées
+SAVINGS_NOISE = 0.05          # Bruit multiplicatif sur les économies (mode randomisé)
+
+def _savings_pairs(problem: ProblemInstance, clients, randomized):
+    """
+    Paires orientées (i, j) = "i en fin de tournée, j en début de la
+    suivante", triées par économie s_ij = d(0,i) + d(0,j) - d(i,j)
+    décroissante. Seules les paires d'économie positive et compatibles
+    avec les fenêtres de temps (e_i + s_i + d_ij <= l_j) sont gardées.
+    Pour les grandes instances, j est restreint aux plus proches voisins de i.
+    """
+    D = problem.get_distance_array()
+    if D is None:
+        return _savings_pairs_python(problem, clients, randomized)
+
+    ids = np.array(clients)
+    n = len(ids)
+    e = np.array([problem.get_node(c)['e'] for c in clients])
+    s = np.array([problem.get_node(c)['s'] for c in clients])
+    l = np.array([problem.get_node(c)['l'] for c in clients])
+    D_cc = D[np.ix_(ids, ids)]
+
+    if n <= SAVINGS_FULL_PAIRS_MAX_N:
+        I, J = np.nonzero(~np.eye(n, dtype=bool))
+    else:
+        # Listes de voisins (k plus proches), dans les deux sens
+        k = min(SAVINGS_NEIGHBORS, n - 1)
+        masked = D_cc + np.diag(np.full(n, np.inf))
+        neighbors = np.argpartition(masked, k - 1, axis=1)[:, :k]
+        I = np.repeat(np.arange(n), k)
+        J = neighbors.ravel()
+        I, J = np.concatenate([I, J]), np.concatenate([J, I])
+        codes = np.unique(I * n + J)
+        I, J = codes // n, codes % n
+
+    savings = D[0, ids[I]] + D[0, ids[J]] - D_cc[I, J]
+    if randomized:
+        savings = savings * np.random.default_rng(random.getrandbits(32)).uniform(
+            1 - SAVINGS_NOISE, 1 + SAVINGS_NOISE, size=len(savings))
+    keep = (savings > 0) & (e[I] + s[I] + D_cc[I, J] <= l[J])
+    I, J, savings = I[keep], J[keep], savings[keep]
+
+    order = np.argsort(-savings, kind='stable')
+    return list(zip(ids[I[order]].tolist(), ids[J[order]].tolist()))
+
+def _savings_pairs_python(problem: ProblemInstance, clients, randomized):
+    """Même calcul que _savings_pairs, sans NumPy (toutes les paires)."""
+    pairs = []
+    for i in clients:
+        node_i = problem.get_node(i)
+        for j in clients:
+            if i == j:
+                continue
+            d_ij = problem.get_distance(i, j)
+            saving = problem.get_distance(0, i) + problem.get_distance(0, j) - d_ij
+            if randomized:
+                saving *= random.uniform(1 - SAVINGS_NOISE, 1 + SAVINGS_NOISE)
+            if saving > 0 and node_i['e'] + node_i['s'] + d_ij <= problem.get_node(j)['l']:
+                pairs.append((saving, i, j))
+    pairs.sort(key=lambda p: -p[0])
+    return [(i, j) for _, i, j in pairs]
+
+def savings_construction(problem: ProblemInstance, randomized=False):
+    """
+    HEURISTIQUE DES ÉCONOMIES (Clarke & Wright, version parallèle).
+
+    Part d'une tournée par client, puis fusionne les tournées (fin de A ->
+    début de B) par économie décroissante, si la fusion respecte la
+    capacité, les incompatibilités (masques binaires) et les fenêtres de
+    temps (concaténation de segments, O(1) par test).
+    """
+    servable, unserved = _single_client_routes(problem)
+
+    # État de chaque tournée (indexée par son premier client à la création)
+    route_of = {}
+    routes = {}
+    for c in servable:
+        seg = _node_segment(c, problem)
+        routes[c] = {
+            'clients': [c],
+            'seg': seg, # Segment sans le dépôt
+            'head': _concat_segments(_DEPOT_SEGMENT, 0, seg, c, problem), # Dépôt + tournée
+            'demand': problem.get_node(c)['demand'],
+            'bits': 1 << c,
+            'incomp': problem.get_incompatibility_mask(c),
+        }
+        route_of[c] = c
+
+    for i, j in _savings_pairs(problem, servable, randomized):
+        ri, rj = route_of[i], route_of[j]
+        if ri == rj:
+            continue
+        A, B = routes[ri], routes[rj]
+        if A['clients'][-1] != i or B['clients'][0] != j:
+            continue
+        if A['demand'] + B['demand'] > problem.vehicle_capacity:
+            continue
+        if A['bits'] & B['incomp']:
+            continue
+        head = _concat_segments(A['head'], i, B['seg'], j, problem)
+        if not head[3]:
+            continue
+
+        # Fusion: B est ajoutée à la fin de A
+        A['clients'].extend(B['clients'])
+        A['seg'] = _concat_segments(A['seg'], i, B['seg'], j, problem)
+        A['head'] = head
+        A['demand'] += B['demand']
+        A['bits'] |= B['bits']
+        A['incomp'] |= B['incomp']
+        for c in B['clients']:
+            route_of[c] = ri
+        del routes[rj]
+
+    _warn_unserved('Savings', unserved)
+    return _build_individual([r['clients'] for r in routes.values()])
+
+# ---------------------------------------------------------------------------
+# CONSTRUCTEUR 2: BALAYAGE (SWEEP, "cluster first, route second")
+# ---------------------------------------------------------------------------
+
+SWEEP_2OPT_EVALS = 2000 # Budget d'évaluations du 2-opt rapide, par tournée
+SWEEP_MAX_OPEN = 16      # Nombre maximal de tournées ouvertes en même temps
+
+def _cheapest_position(route, schedule, client_id, problem: ProblemInstance):
+    """
+    Position d'insertion faisable la moins chère dans la tournée et hausse
+    du coût, ou (None, inf). 'schedule' = _route_schedule(route): chaque
+    position est évaluée par _insertion_delta, sans re-simuler la tournée.
+    """
+    best_pos = None
+    best_increase = float('inf')
+    for pos in range(len(route) + 1):
+        increase = _insertion_delta(route, schedule, pos, client_id, problem)
+        if increase is not None and increase < best_increase:
+            best_increase = increase
+            best_pos = pos
+    return best_pos, best_increase
+
+def sweep_construction(problem: ProblemInstance, randomized=False):
+    """
+    HEURISTIQUE DE BALAYAGE (Sweep).
+
+    Les clients sont triés par angle polaire autour du dépôt, puis ajoutés
+    un par un (à la position faisable la moins chère) à une tournée
+    "ouverte" compatible. Les incompatibilités étant fréquentes, plusieurs
+    tournées peuvent être ouvertes en même temps. Une tournée est fermée:
+      - si c'est la tournée en cours de balayage (la dernière complétée) et
+        que sa capacité empêche d'y ajouter un client compatible (coupure
+        classique du sweep);
+      - si sa capacité restante est inférieure à la demande de tous les
+        clients restant à balayer;
+      - si SWEEP_MAX_OPEN tournées sont déjà ouvertes quand il faut en
+        ouvrir une nouvelle (la moins récemment complétée est fermée).
+    Un client qu'une fenêtre de temps empêche d'insérer ne ferme aucune
+    tournée, et un client à forte demande ne ferme que la tournée balayée.
+    Chaque tournée reçoit ensuite un 2-opt rapide. En mode randomisé,
+    l'angle de départ et le sens de balayage sont tirés au hasard.
+    """
+    servable, unserved = _single_client_routes(problem)
+
+    depot = problem.depot
+    start_angle = random.uniform(0, 2 * math.pi) if randomized else 0.0
+    direction = random.choice((1, -1)) if randomized else 1
+
+    def sweep_key(client_id):
+        client = problem.get_node(client_id)
+        angle = math.atan2(client['y'] - depot['y'], client['x'] - depot['x'])
+        return (direction * (angle - start_angle)) % (2 * math.pi)
+
+    order = sorted(servable, key=sweep_key)
+    # min_demand_after[k] = plus petite demande parmi order[k:]
+    min_demand_after = [float('inf')] * (len(order) + 1)
+    for k in range(len(order) - 1, -1, -1):
+        min_demand_after[k] = min(min_demand_after[k + 1], problem.get_node(order[k])['demand'])
+
+    routes = []      # Tournées fermées
+    open_routes = [] # [tournée, demande, masque des clients, dernier client ajouté (rang), calendrier]
+    current = None   # Tournée en cours de balayage
+    for k, client_id in enumerate(order):
+        client_demand = problem.get_node(client_id)['demand']
+        incomp_mask = problem.get_incompatibility_mask(client_id)
+
+        best = None
+        best_increase = float('inf')
+        for state in list(open_routes):
+            route, demand, bits, _, schedule = state
+            if bits & incomp_mask:
+                continue
+            if demand + client_demand > problem.vehicle_capacity:
+                if state is current:
+                    # Coupure: la tournée balayée est pleine
+                    open_routes.remove(state)
+                    routes.append(route)
+                    current = None
+                continue
+            pos, increase = _cheapest_position(route, schedule, client_id, problem)
+            if pos is None:
+                continue # Fenêtres de temps: la tournée reste ouverte
+            if increase < best_increase:
+                best_increase = increase
+                best = (state, pos)
+
+        if best is None:
+            if len(open_routes) >= SWEEP_MAX_OPEN:
+                oldest = min(open_routes, key=lambda state: state[3])
+                open_routes.remove(oldest)
+                routes.append(oldest[0])
+            current = [[client_id], client_demand, 1 << client_id, k, _route_schedule([client_id], problem)]
+            open_routes.append(current)
+        else:
+            state, pos = best
+            state[0].insert(pos, client_id)
+            state[1] += client_demand
+            state[2] |= 1 << client_id
+            state[3] = k
+            state[4] = _route_schedule(state[0], problem)
+            current = state
+
+        # Tournées qui ne peuvent plus recevoir aucun client restant
+        for state in list(open_routes):
+            if state[1] + min_demand_after[k + 1] > problem.vehicle_capacity:
+                open_routes.remove(state)
+                routes.append(state[0])
+                if state is current:
+                    current = None
+    routes.extend(state[0] for state in open_routes)
+
+    # 2-opt rapide de chaque tournée
+    routes = [_apply_2_opt_to_route(r, problem, SearchBudget(max_evaluations=SWEEP_2OPT_EVALS)) for r in routes]
+
+    _warn_unserved('Sweep', unserved)
+    return _build_individual(routes)
+
+# Constructeurs disponibles (en plus de "best_insertion", défini dans mga.py)
+CONSTRUCTORS = {
+    'savings': savings_construction,
+    'sweep': sweep_construction,
+    'i1': i1_construction, # Critère I1 de Solomon (voir insertion.py)
+}
+
+def initial_solution(problem: ProblemInstance, constructor='best_insertion', seeds=None):
+    """
+    Solution de départ des moteurs à solution unique (ALNS, tabou): la
+    meilleure (évaluée) entre le constructeur choisi et les graines
+    (warm_start.py). 'best_insertion' = réparation par meilleure insertion
+    à partir de zéro, clients triés par échéance (l_i).
+    """
+    if constructor == 'best_insertion':
+        clients = sorted(problem.clients, key=lambda cid: problem.get_node(cid)['l'])
+        best = _build_individual(_repair_with_best_insertion([], clients, problem))
+    else:
+        best = CONSTRUCTORS[constructor](problem)
+    best.calculate_fitness(problem)
+    for seed_individual in load_seeds(seeds or [], problem):
+        seed_individual.calculate_fitness(problem)
+        if seed_individual.fitness < best.fitness:
+            best = seed_individual
+    return best
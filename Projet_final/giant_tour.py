@@ -0,0 +1,132 @@
+# Fichier: giant_tour.py
+#
+# REPRÉSENTATION "GRAND TOUR" (giant tour) + décodeur SPLIT.
+#
+# Un chromosome est une simple permutation des clients (sans dépôt). Le
+# découpage optimal en tournées (Split) est obtenu par programmation
+# dynamique sur les coupures possibles: chaque tournée est une suite
+# CONSÉCUTIVE du grand tour, qui doit respecter capacité, fenêtres de temps
+# et incompatibilités. Le croisement OX (Order Crossover) produit toujours
+# une permutation valide: aucune réparation n'est nécessaire.
+#
+# Dans le MGA, les individus gardent la représentation [0, ..., 0] (décodée):
+# le grand tour d'un individu est la concaténation de ses tournées.
+
+import random
+from individual import Individual
+from problem import ProblemInstance
+from operators_local_search import _build_individual
+
+# ---------------------------------------------------------------------------
+# DÉCODEUR SPLIT
+# ---------------------------------------------------------------------------
+
+def split(tour, problem: ProblemInstance):
+    """
+    Découpage optimal du grand tour 'tour' en tournées (coût Z minimal:
+    distance + beta x retards + alpha par véhicule).
+
+    V[j] = min sur i < j de V[i] + alpha + coût(tour[i:j]), où tour[i:j]
+    est une tournée faisable. Pour chaque i, la tournée est prolongée client
+    par client (coût mis à jour en O(1)) jusqu'à la première violation:
+    ajouter des clients en fin de tournée ne peut jamais la rendre à
+    nouveau faisable. Complexité O(n x B), B = longueur maximale d'une
+    tournée faisable.
+    Retourne la liste des tournées, ou None si aucun découpage n'existe.
+    """
+    n = len(tour)
+    V = [0.0] + [float('inf')] * n
+    pred = [-1] * (n + 1)
+
+    for i in range(n):
+        if V[i] == float('inf'):
+            continue
+        load = 0.0
+        bits = 0
+        incomp = 0
+        distance = 0.0
+        delay = 0.0
+        current_time = 0.0
+        last = 0
+        for j in range(i, n):
+            client_id = tour[j]
+            client = problem.get_node(client_id)
+
+            load += client['demand']
+            if load > problem.vehicle_capacity:
+                break
+            if incomp & (1 << client_id):
+                break
+            bits |= 1 << client_id
+            incomp |= problem.get_incompatibility_mask(client_id)
+
+            travel = problem.get_distance(last, client_id)
+            start = max(client['e'], current_time + travel)
+            if start > client['l']:
+                break
+            distance += travel
+            delay += start - client['e']
+            current_time = start + client['s']
+            last = client_id
+
+            cost = V[i] + problem.alpha + distance + problem.get_distance(last, 0) + problem.beta * delay
+            if cost < V[j + 1]:
+                V[j + 1] = cost
+                pred[j + 1] = i
+
+    if V[n] == float('inf'):
+        return None
+
+    routes = []
+    j = n
+    while j > 0:
+        i = pred[j]
+        routes.append(list(tour[i:j]))
+        j = i
+    routes.reverse()
+    return routes
+
+def giant_tour(individual: Individual):
+    """Grand tour d'un individu: concaténation de ses tournées."""
+    return [node_id for node_id in individual.representation if node_id != 0]
+
+def decode(tour, problem: ProblemInstance):
+    """Individu (représentation [0, ..., 0]) issu du découpage optimal du grand tour."""
+    routes = split(tour, problem)
+    if routes is None:
+        # Aucun découpage faisable (client non servable seul): une tournée
+        # par client, l'individu sera jugé infaisable à l'évaluation
+        routes = [[client_id] for client_id in tour]
+    return _build_individual(routes)
+
+# ---------------------------------------------------------------------------
+# CROISEMENT OX (Order Crossover)
+# ---------------------------------------------------------------------------
+
+def order_crossover(tour1, tour2):
+    """
+    OX: l'enfant hérite d'un segment [a, b] de tour1 (même positions), puis
+    les autres clients sont placés dans l'ordre où ils apparaissent dans
+    tour2, en partant de b + 1 (circulairement).
+    """
+    n = len(tour1)
+    if n < 2:
+        return list(tour1)
+    a, b = sorted(random.sample(range(n), 2))
+
+    child = [None] * n
+    child[a:b + 1] = tour1[a:b + 1]
+    inherited = set(tour1[a:b + 1])
+
+    position = (b + 1) % n
+    for k in range(n):
+        client_id = tour2[(b + 1 + k) % n]
+        if client_id in inherited:
+            continue
+        child[position] = client_id
+        position = (position + 1) % n
+    return child
+
+def crossover_giant_tour(parent1: Individual, parent2: Individual, problem: ProblemInstance) -> Individual:
+    """Croisement OX sur les grands tours des parents, puis décodage Split."""
+    return decode(order_crossover(giant_tour(parent1), giant_tour(parent2)), problem)
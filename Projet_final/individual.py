@@ -3,6 +3,65 @@
 from problem import ProblemInstance
 import math
 
+class PenaltyWeights:
+    """
+    Poids des pénalités du mode "pénalisé" (recherche dans l'espace
+    infaisable):
+      - time warp: retour dans le temps nécessaire pour respecter l_i,
+      - excès de charge: demande au-delà de la capacité du véhicule.
+
+    Les poids sont ajustés pour viser une proportion cible de solutions
+    faisables après recherche locale (trop peu -> poids augmentés).
+    """
+
+    def __init__(self, time_warp_weight=10.0, capacity_weight=10.0,
+                 target_feasibility=0.2, adapt_every=100,
+                 min_weight=0.1, max_weight=100000.0):
+        self.time_warp_weight = time_warp_weight
+        self.capacity_weight = capacity_weight
+        self.target_feasibility = target_feasibility
+        self.adapt_every = adapt_every
+        self.min_weight = min_weight
+        self.max_weight = max_weight
+        # Historique récent (faisable en temps / en capacité)
+        self._time_feasible = []
+        self._load_feasible = []
+
+    def scaled(self, factor):
+        """Copie avec des poids multipliés (utilisée pour la réparation)."""
+        return PenaltyWeights(self.time_warp_weight * factor, self.capacity_weight * factor,
+                              self.target_feasibility, self.adapt_every,
+                              self.min_weight, self.max_weight * factor)
+
+    def copy(self):
+        """Copie indépendante (poids ET historique)."""
+        clone = self.scaled(1.0)
+        clone._time_feasible = list(self._time_feasible)
+        clone._load_feasible = list(self._load_feasible)
+        return clone
+
+    def record(self, time_feasible, load_feasible):
+        """
+        Enregistre la faisabilité (fenêtres de temps, capacité) d'un
+        individu évalué en mode pénalisé, avant toute réparation.
+        """
+        self._time_feasible.append(time_feasible)
+        self._load_feasible.append(load_feasible)
+        if len(self._time_feasible) >= self.adapt_every:
+            self.time_warp_weight = self._adapt(self.time_warp_weight, self._time_feasible)
+            self.capacity_weight = self._adapt(self.capacity_weight, self._load_feasible)
+            self._time_feasible = []
+            self._load_feasible = []
+
+    def _adapt(self, weight, history):
+        ratio = sum(history) / len(history)
+        if ratio < self.target_feasibility - 0.05:
+            weight *= 1.2
+        elif ratio > self.target_feasibility + 0.05:
+            weight *= 0.85
+        return min(self.max_weight, max(self.min_weight, weight))
+
+
 class Individual:
     """
     Représente un individu (un "chromosome") de la population.
@@ -19,16 +78,54 @@ class Individual:
         self.num_vehicles = 0
         self.total_delay_penalty = 0    # Pénalité Beta (t_i - e_i)
 
-    def calculate_fitness(self, problem: 'ProblemInstance'):
+        # Violations (mode pénalisé uniquement; 0 pour une solution faisable)
+        self.time_warp = 0
+        self.excess_load = 0
+        self.is_feasible = False
+
+        self._edges = None # Cache de edges()
+
+    def edges(self):
+        """
+        Ensemble des arêtes (non orientées) de la solution, dépôt compris.
+        Calculé une seule fois (la représentation n'est pas modifiée en place).
+        """
+        if self._edges is None:
+            rep = self.representation
+            self._edges = frozenset(
+                (min(a, b), max(a, b)) for a, b in zip(rep, rep[1:]) if a != b
+            )
+        return self._edges
+
+    def broken_pairs_distance(self, other: 'Individual'):
+        """
+        Distance "broken pairs" normalisée entre deux solutions: proportion
+        d'arêtes de l'une absentes de l'autre (0 = identiques, 1 = aucune
+        arête commune).
+        """
+        edges_a, edges_b = self.edges(), other.edges()
+        size = max(len(edges_a), len(edges_b))
+        if size == 0:
+            return 0.0
+        return 1.0 - len(edges_a & edges_b) / size
+
+    def calculate_fitness(self, problem: 'ProblemInstance', penalties: PenaltyWeights = None):
         """
         Calcule la fitness (coût Z) de cet individu.
         Modèle "Strict": t_i <= l_i est une contrainte DURE.
-       
+
+        Si 'penalties' est fourni (mode pénalisé), les violations de
+        fenêtres de temps (time warp) et de capacité (excès de charge)
+        ne rendent plus la solution invalide: elles sont ajoutées au coût,
+        pondérées par les poids courants. Les incompatibilités restent dures.
         """
         
         self.total_distance = 0
         self.num_vehicles = 0
         self.total_delay_penalty = 0 
+        self.time_warp = 0
+        self.excess_load = 0
+        self.is_feasible = False
         
         # 1. Diviser la représentation en tournées (routes)
         routes = []
@@ -55,7 +152,7 @@ class Individual:
                 
                 # Capacité
                 current_capacity += client['demand']
-                if current_capacity > problem.vehicle_capacity:
+                if current_capacity > problem.vehicle_capacity and penalties is None:
                     self.fitness = float('inf'); return self.fitness
 
                 # Incompatibilité
@@ -65,6 +162,8 @@ class Individual:
                     if pair in problem.incompatibilities:
                         self.fitness = float('inf'); return self.fitness
 
+            self.excess_load += max(0, current_capacity - problem.vehicle_capacity)
+
             # 2b. Calculer le coût (Distance et Pénalités de temps)
             for client_id in route:
                 client = problem.get_node(client_id)
@@ -79,9 +178,13 @@ class Individual:
                 start_service_time = max(client['e'], arrival_time)
                 
                 # 2. CONTRAINTE DURE (REMISE EN PLACE)
+                #    En mode pénalisé: "time warp" jusqu'à l_i
                 if start_service_time > client['l']:
-                    self.fitness = float('inf') # Solution INVALIDE
-                    return self.fitness
+                    if penalties is None:
+                        self.fitness = float('inf') # Solution INVALIDE
+                        return self.fitness
+                    self.time_warp += start_service_time - client['l']
+                    start_service_time = client['l']
                 
                 # 3. PÉNALITÉ "RETARD" (Beta)
                 delay_penalty = start_service_time - client['e']
@@ -100,6 +203,12 @@ class Individual:
             (problem.alpha * self.num_vehicles) +
             (problem.beta * self.total_delay_penalty)
         )
-        
+        if penalties is not None:
+            cost_z += (
+                penalties.time_warp_weight * self.time_warp +
+                penalties.capacity_weight * self.excess_load
+            )
+
+        self.is_feasible = self.time_warp <= 1e-9 and self.excess_load <= 1e-9
         self.fitness = cost_z
         return self.fitness
\ No newline at end of file
@@ -0,0 +1,467 @@
+# Fichier: insertion.py
+#
+# HEURISTIQUES D'INSERTION:
+#   - cache des meilleures insertions par (client, tournée) (InsertionCache),
+#     utilisé par la "Best Insertion" (construction et réparation),
+#   - réparation par regret-k (clients "difficiles" insérés en premier),
+#   - réparation bruitée (best insertion sur des coûts perturbés, ALNS),
+#   - critère I1 de Solomon (orienté fenêtres de temps).
+#
+# Critère I1:
+# Pour insérer le client u entre i et j (b = heure de début de service):
+#   c11 = d(i,u) + d(u,j) - mu * d(i,j)            (détour)
+#   c12 = b_j' - b_j                                (décalage "push forward" de j)
+#   c1  = alpha1 * c11 + (1 - alpha1) * c12         (meilleure position de u)
+#   c2  = lam * d(0,u) - c1                         (client choisi: c2 maximal)
+# La faisabilité d'une insertion est testée en O(1) grâce, pour chaque
+# position, à l'heure de début au plus tard qui garde la fin de la tournée
+# faisable ("slack").
+
+import random
+from problem import ProblemInstance
+from operators_local_search import _calculate_route_cost, _build_individual
+from vector_scoring import _route_schedule, _insertion_delta, InsertionScorer, vector_scoring_available
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ---------------------------------------------------------------------------
+# CACHE DES MEILLEURES INSERTIONS (Best Insertion)
+# ---------------------------------------------------------------------------
+
+class InsertionCache:
+    """
+    Cache de la meilleure insertion (hausse de coût, position) de chaque
+    client dans chaque tournée, pour les heuristiques "Best Insertion".
+
+    Une entrée (client, tournée) n'est calculée qu'à la demande, puis
+    réutilisée tant que la tournée n'a pas été modifiée: après une
+    insertion, seules les entrées de la tournée modifiée sont recalculées.
+    La demande, le masque des clients, le coût et le calendrier (heures de
+    début, heures de début au plus tard) de chaque tournée sont tenus à
+    jour: une insertion est évaluée sans re-simuler la tournée
+    (_insertion_delta: faisabilité O(1), décalage des suivants).
+    Quand beaucoup d'entrées sont à (re)calculer pour un client, toutes
+    ses insertions sont d'abord évaluées d'un coup avec NumPy
+    (InsertionScorer): seules les positions faisables sont ensuite
+    évaluées exactement (_insertion_delta), par borne inférieure croissante.
+    Les tournées sont modifiées EN PLACE (la liste 'routes' est partagée).
+    """
+
+    def __init__(self, routes, problem: ProblemInstance):
+        self.routes = routes
+        self.problem = problem
+        self.demands = [sum(problem.get_node(c)['demand'] for c in route) for route in routes]
+        self.bits = [self._mask(route) for route in routes]
+        self.costs = [_calculate_route_cost(route, problem) for route in routes]
+        self.schedules = [_route_schedule(route, problem) for route in routes]
+        self.versions = [0] * len(routes)
+        self._entries = {} # client -> {r_idx: (version, (hausse, position) ou None)}
+        self._scorer = None # InsertionScorer, créé au premier calcul vectorisé
+
+    @staticmethod
+    def _mask(route):
+        bits = 0
+        for client_id in route:
+            bits |= 1 << client_id
+        return bits
+
+    def _compute(self, client_id, r_idx):
+        """Meilleure insertion FAISABLE du client dans la tournée r_idx."""
+        problem = self.problem
+        route = self.routes[r_idx]
+        if self.demands[r_idx] + problem.get_node(client_id)['demand'] > problem.vehicle_capacity:
+            return None
+        if problem.get_incompatibility_mask(client_id) & self.bits[r_idx]:
+            return None
+        if self.costs[r_idx] == float('inf'):
+            return None # Tournée déjà infaisable (mode pénalisé)
+
+        best = None
+        for pos in range(len(route) + 1):
+            increase = _insertion_delta(route, self.schedules[r_idx], pos, client_id, problem)
+            if increase is not None and (best is None or increase < best[0]):
+                best = (increase, pos)
+        return best
+
+    def insertion(self, client_id, r_idx):
+        """(hausse de coût, position) du client dans la tournée r_idx, ou None."""
+        entries = self._entries.setdefault(client_id, {})
+        cached = entries.get(r_idx)
+        if cached is None or cached[0] != self.versions[r_idx]:
+            cached = (self.versions[r_idx], self._compute(client_id, r_idx))
+            entries[r_idx] = cached
+        return cached[1]
+
+    def _compute_vectorized(self, client_id, stale):
+        """Calcule en une passe vectorisée les entrées du client pour les tournées 'stale'."""
+        problem = self.problem
+        if self._scorer is None:
+            self._scorer = InsertionScorer(self.routes, problem)
+
+        demand = problem.get_node(client_id)['demand']
+        incomp_mask = problem.get_incompatibility_mask(client_id)
+        allowed = np.zeros(len(self.routes), dtype=bool)
+        for r_idx in stale:
+            allowed[r_idx] = (self.demands[r_idx] + demand <= problem.vehicle_capacity
+                              and not (incomp_mask & self.bits[r_idx])
+                              and self.costs[r_idx] != float('inf'))
+
+        best = {}
+        for r_idx, pos, lower_bound in self._scorer.score(client_id, allowed):
+            if r_idx in best and lower_bound > best[r_idx][0] + 1e-6:
+                continue # Ne peut pas battre la meilleure position de cette tournée
+            increase = _insertion_delta(self.routes[r_idx], self.schedules[r_idx], pos, client_id, problem)
+            if increase is None:
+                continue
+            candidate = (increase, pos)
+            if r_idx not in best or candidate < best[r_idx]:
+                best[r_idx] = candidate
+
+        entries = self._entries.setdefault(client_id, {})
+        for r_idx in stale:
+            entries[r_idx] = (self.versions[r_idx], best.get(r_idx))
+
+    def options(self, client_id):
+        """Insertions faisables du client: liste de (hausse, r_idx, position)."""
+        entries = self._entries.get(client_id, {})
+        stale = [r_idx for r_idx in range(len(self.routes))
+                 if r_idx not in entries or entries[r_idx][0] != self.versions[r_idx]]
+        if vector_scoring_available(sum(len(self.routes[r_idx]) + 1 for r_idx in stale)):
+            self._compute_vectorized(client_id, stale)
+
+        result = []
+        for r_idx in range(len(self.routes)):
+            best = self.insertion(client_id, r_idx)
+            if best is not None:
+                result.append((best[0], r_idx, best[1]))
+        return result
+
+    def best(self, client_id):
+        """
+        Meilleure insertion du client toutes tournées confondues:
+        (hausse, r_idx, position), ou None. En cas d'égalité, la première
+        tournée (puis la première position) l'emporte.
+        """
+        best = None
+        for option in self.options(client_id):
+            if best is None or option[0] < best[0]:
+                best = option
+        return best
+
+    def regret(self, client_id, k=2, new_route_cost=None):
+        """
+        Regret-k du client: somme des écarts entre ses k meilleures
+        insertions (dans des tournées différentes) et la meilleure.
+        'new_route_cost' (coût d'ouverture d'une tournée dédiée) compte
+        comme une option, notée (coût, None, None). Les options manquantes
+        (moins de k possibles) coûtent +inf: le regret est alors infini.
+        Retourne (regret, meilleure option ou None, nombre d'options); le
+        regret est mesuré depuis cette meilleure option, celle à appliquer.
+        """
+        options = sorted(self.options(client_id))
+        if new_route_cost is not None and new_route_cost != float('inf'):
+            # Tournée dédiée après les tournées existantes à coût égal
+            options.append((new_route_cost, None, None))
+            options.sort(key=lambda option: option[0])
+        best = options[0] if options else None
+        if len(options) < k:
+            return float('inf'), best, len(options)
+        regret = sum(options[i][0] - best[0] for i in range(1, k))
+        return regret, best, len(options)
+
+    def insert(self, client_id, r_idx, pos):
+        """Insère le client et invalide les entrées de la tournée r_idx."""
+        self.routes[r_idx].insert(pos, client_id)
+        self.demands[r_idx] += self.problem.get_node(client_id)['demand']
+        self.bits[r_idx] |= 1 << client_id
+        self.costs[r_idx] = _calculate_route_cost(self.routes[r_idx], self.problem)
+        self.schedules[r_idx] = _route_schedule(self.routes[r_idx], self.problem)
+        self.versions[r_idx] += 1
+        self._entries.pop(client_id, None)
+        if self._scorer is not None:
+            self._scorer.update_route(r_idx, self.routes[r_idx])
+
+    def open_route(self, client_id):
+        """Ouvre une nouvelle tournée pour le client; retourne son indice."""
+        self.routes.append([client_id])
+        self.demands.append(self.problem.get_node(client_id)['demand'])
+        self.bits.append(1 << client_id)
+        self.costs.append(_calculate_route_cost([client_id], self.problem))
+        self.schedules.append(_route_schedule([client_id], self.problem))
+        self.versions.append(0)
+        self._entries.pop(client_id, None)
+        if self._scorer is not None:
+            self._scorer.update_route(len(self.routes) - 1, self.routes[-1])
+        return len(self.routes) - 1
+
+# ---------------------------------------------------------------------------
+# RÉPARATION PAR REGRET-K
+# ---------------------------------------------------------------------------
+
+class RegretCriterion:
+    """
+    Paramètre de la réparation par regret: k = 2, 3, ... ou 'm' (toutes
+    les tournées).
+    """
+
+    def __init__(self, k=2):
+        self.k = k
+
+def repair_with_regret(routes, missing_clients, problem: ProblemInstance, criterion: RegretCriterion):
+    """
+    Réparation par REGRET-K: à chaque étape, on insère (selon sa meilleure
+    option) le client dont le regret est le plus grand, c.-à-d. celui
+    qui perdrait le plus à ne pas être inséré maintenant. L'ouverture d'une
+    tournée dédiée (coût alpha + tournée seule) compte comme une option,
+    appliquée quand c'est la moins chère;
+    un client qui a moins de k options a un regret infini. Entre regrets
+    infinis, le client qui a le moins d'options passe devant (puis celui
+    dont la meilleure insertion coûte le moins), au lieu de forcer plus
+    tard une nouvelle tournée.
+    Les coûts d'insertion viennent d'InsertionCache: seule la tournée
+    modifiée est réévaluée entre deux étapes.
+    """
+    cache = InsertionCache(routes, problem)
+    remaining = []
+    for client_id in missing_clients:
+        if problem.get_node(client_id):
+            remaining.append(client_id)
+    new_route_costs = {c: problem.alpha + _calculate_route_cost([c], problem) for c in remaining}
+
+    while remaining:
+        k = len(routes) + 1 if criterion.k == 'm' else criterion.k
+        best_client = None
+        best_key = None
+        best_option = None
+        for client_id in remaining:
+            regret, option, num_options = cache.regret(client_id, k, new_route_costs[client_id])
+            if option is None:
+                continue # Le client ne peut pas être servi (on l'ignore)
+            # Regret maximal, puis moins d'options, puis coût de la
+            # meilleure option minimal (puis ordre donné)
+            key = (regret, -num_options, -option[0])
+            if best_key is None or key > best_key:
+                best_client, best_key, best_option = client_id, key, option
+
+        if best_client is None:
+            break # Plus aucun client servable
+        remaining.remove(best_client)
+        _, r_idx, pos = best_option
+        if r_idx is None:
+            cache.open_route(best_client) # La tournée dédiée est la moins chère
+        else:
+            cache.insert(best_client, r_idx, pos)
+
+    return routes
+
+# ---------------------------------------------------------------------------
+# RÉPARATION BRUITÉE (Ropke & Pisinger)
+# ---------------------------------------------------------------------------
+
+class NoiseCriterion:
+    """
+    Paramètre de la réparation bruitée: chaque coût d'insertion reçoit un
+    bruit uniforme dans [-eta x dmax, eta x dmax] (dmax = plus grande
+    distance de l'instance).
+    """
+
+    def __init__(self, eta=0.025):
+        self.eta = eta
+
+def repair_with_noise(routes, missing_clients, problem: ProblemInstance, criterion: NoiseCriterion):
+    """
+    "Best Insertion" sur des coûts bruités: diversifie les réparations
+    (les insertions presque aussi bonnes que la meilleure ont une chance).
+    Les clients sont insérés dans l'ordre donné.
+    """
+    D = problem.get_distance_array()
+    if D is not None:
+        max_distance = float(D.max())
+    else:
+        nodes = [0] + list(problem.clients)
+        max_distance = max(problem.get_distance(i, j) for i in nodes for j in nodes)
+    amplitude = criterion.eta * max_distance
+
+    cache = InsertionCache(routes, problem)
+    for client_id in missing_clients:
+        if not problem.get_node(client_id): continue
+
+        best = None
+        best_cost = float('inf')
+        for cost, r_idx, pos in cache.options(client_id):
+            noisy_cost = max(0.0, cost + random.uniform(-amplitude, amplitude))
+            if noisy_cost < best_cost:
+                best, best_cost = (r_idx, pos), noisy_cost
+        if best is not None:
+            cache.insert(client_id, *best)
+        elif _calculate_route_cost([client_id], problem) != float('inf'):
+            cache.open_route(client_id)
+        # else: le client ne peut pas être servi (on l'ignore)
+
+    return routes
+
+# ---------------------------------------------------------------------------
+# I1: PARAMÈTRES ET COÛT D'UNE INSERTION
+# ---------------------------------------------------------------------------
+
+class I1Criterion:
+    """Poids du critère I1 (mu, alpha1, lam); alpha2 = 1 - alpha1."""
+
+    def __init__(self, mu=1.0, alpha1=0.5, lam=1.0):
+        self.mu = mu
+        self.alpha1 = alpha1
+        self.lam = lam
+
+def _i1_cost(route, start, latest, pos, client_id, problem: ProblemInstance, criterion: I1Criterion):
+    """
+    Critère c1 pour l'insertion de 'client_id' à la position 'pos'
+    (None si les fenêtres de temps sont violées). O(1).
+    """
+    client = problem.get_node(client_id)
+    i = route[pos - 1] if pos > 0 else 0
+    departure_i = start[pos - 1] + problem.get_node(i)['s'] if pos > 0 else 0.0
+
+    start_u = max(client['e'], departure_i + problem.get_distance(i, client_id))
+    if start_u > client['l']:
+        return None
+    departure_u = start_u + client['s']
+
+    if pos < len(route):
+        j = route[pos]
+        new_start_j = max(problem.get_node(j)['e'], departure_u + problem.get_distance(client_id, j))
+        if new_start_j > latest[pos]:
+            return None
+        push_forward = new_start_j - start[pos]
+    else:
+        # Fin de tournée: décalage de l'heure de retour au dépôt
+        j = 0
+        push_forward = departure_u + problem.get_distance(client_id, 0) - (departure_i + problem.get_distance(i, 0))
+
+    detour = problem.get_distance(i, client_id) + problem.get_distance(client_id, j) - criterion.mu * problem.get_distance(i, j)
+    return criterion.alpha1 * detour + (1 - criterion.alpha1) * push_forward
+
+def _best_i1_position(route, schedule, client_id, problem: ProblemInstance, criterion: I1Criterion):
+    """Meilleure position I1 du client dans la tournée: (c1, pos) ou None."""
+    start, latest = schedule
+    best = None
+    for pos in range(len(route) + 1):
+        c1 = _i1_cost(route, start, latest, pos, client_id, problem, criterion)
+        if c1 is not None and (best is None or c1 < best[0]):
+            best = (c1, pos)
+    return best
+
+# ---------------------------------------------------------------------------
+# CONSTRUCTEUR I1 (séquentiel) ET RÉPARATION I1 (parallèle)
+# ---------------------------------------------------------------------------
+
+def i1_construction(problem: ProblemInstance, randomized=False, criterion: I1Criterion = None):
+    """
+    HEURISTIQUE I1 DE SOLOMON (construction séquentielle).
+
+    Ouvre une tournée sur un client "graine" (le plus éloigné du dépôt;
+    tiré parmi les 5 plus éloignés en mode randomisé), puis y insère à
+    chaque étape le client de c2 maximal, à sa meilleure position c1, tant
+    qu'une insertion faisable existe. Recommence jusqu'à ce que tous les
+    clients soient servis.
+    """
+    criterion = criterion or I1Criterion()
+    unrouted = set()
+    unserved = []
+    for client_id in problem.clients:
+        if _calculate_route_cost([client_id], problem) != float('inf'):
+            unrouted.add(client_id)
+        else:
+            unserved.append(client_id)
+
+    routes = []
+    while unrouted:
+        # 1. Client graine
+        by_distance = sorted(unrouted, key=lambda c: (-problem.get_distance(0, c), c))
+        seed = random.choice(by_distance[:5]) if randomized else by_distance[0]
+        route = [seed]
+        unrouted.remove(seed)
+        demand = problem.get_node(seed)['demand']
+        bits = 1 << seed
+
+        # 2. Insertions successives (c2 maximal)
+        while True:
+            schedule = _route_schedule(route, problem)
+            best = None
+            for client_id in unrouted:
+                if demand + problem.get_node(client_id)['demand'] > problem.vehicle_capacity:
+                    continue
+                if problem.get_incompatibility_mask(client_id) & bits:
+                    continue
+                position = _best_i1_position(route, schedule, client_id, problem, criterion)
+                if position is None:
+                    continue
+                c1, pos = position
+                c2 = criterion.lam * problem.get_distance(0, client_id) - c1
+                if best is None or (c2, -client_id) > (best[0], -best[1]):
+                    best = (c2, client_id, pos)
+            if best is None:
+                break
+            _, client_id, pos = best
+            route.insert(pos, client_id)
+            unrouted.remove(client_id)
+            demand += problem.get_node(client_id)['demand']
+            bits |= 1 << client_id
+
+        routes.append(route)
+
+    if unserved:
+        print(f"  > Avertissement: Heuristique 'I1' n'a pas pu servir {len(unserved)} clients.")
+        print(f"  > Clients non servis: {unserved}")
+    return _build_individual(routes)
+
+def repair_with_i1(routes, missing_clients, problem: ProblemInstance, criterion: I1Criterion):
+    """
+    Réparation par le critère I1: chaque client manquant (dans l'ordre
+    donné) est inséré à la position de c1 minimal parmi toutes les
+    tournées, sinon dans une nouvelle tournée. Seul le calendrier de la
+    tournée modifiée est recalculé après une insertion.
+    """
+    schedules = [_route_schedule(route, problem) for route in routes]
+    demands = [sum(problem.get_node(c)['demand'] for c in route) for route in routes]
+    bits = []
+    for route in routes:
+        mask = 0
+        for c in route:
+            mask |= 1 << c
+        bits.append(mask)
+
+    for client_id in missing_clients:
+        client = problem.get_node(client_id)
+        if not client: continue
+        incomp_mask = problem.get_incompatibility_mask(client_id)
+
+        best = None
+        for r_idx, route in enumerate(routes):
+            if demands[r_idx] + client['demand'] > problem.vehicle_capacity:
+                continue
+            if incomp_mask & bits[r_idx]:
+                continue
+            position = _best_i1_position(route, schedules[r_idx], client_id, problem, criterion)
+            if position is not None and (best is None or position[0] < best[0]):
+                best = (position[0], r_idx, position[1])
+
+        if best is not None:
+            _, r_idx, pos = best
+            routes[r_idx].insert(pos, client_id)
+        elif _calculate_route_cost([client_id], problem) != float('inf'):
+            routes.append([client_id])
+            schedules.append(None)
+            demands.append(0.0)
+            bits.append(0)
+            r_idx = len(routes) - 1
+        else:
+            continue # Le client ne peut pas être servi (on l'ignore)
+
+        schedules[r_idx] = _route_schedule(routes[r_idx], problem)
+        demands[r_idx] += client['demand']
+        bits[r_idx] |= 1 << client_id
+
+    return routes
@@ -0,0 +1,219 @@
+# Fichier: islands.py
+#
+# MODÈLE EN ÎLES: N populations MGA indépendantes, chacune dans son propre
+# processus, qui échangent périodiquement leurs meilleurs individus.
+#
+# - Pas de synchronisation à chaque génération: chaque île a une boîte aux
+#   lettres (Queue). Toutes les 'migration_interval' générations, une île
+#   envoie ses meilleurs individus à ses voisines (topologie "ring" ou
+#   "random") et intègre les migrants reçus entre-temps, sans attendre.
+# - Chaque île peut avoir ses propres paramètres (crossover_rate,
+#   mutation_rate, ...).
+
+import io
+import sys
+import queue
+import random
+import traceback
+import contextlib
+import multiprocessing
+from problem import ProblemInstance
+from individual import Individual
+from mga import MemeticAlgorithm
+from operators_local_search import LocalSearchStats
+
+ISLAND_POLL_SECONDS = 1.0 # Intervalle de vérification des processus îles par le maître
+
+# ---------------------------------------------------------------------------
+# UNE ÎLE (exécutée dans un processus dédié)
+# ---------------------------------------------------------------------------
+
+class IslandMGA(MemeticAlgorithm):
+    """
+    MGA d'une île: identique au MGA, avec une étape de migration
+    toutes les 'migration_interval' générations.
+    """
+
+    def __init__(self, problem: ProblemInstance, island_id, inboxes, topology='ring',
+                 migration_interval=10, migration_size=2, **mga_kwargs):
+        super().__init__(problem, **mga_kwargs)
+        self.island_id = island_id
+        self.inboxes = inboxes
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+
+    def _neighbors(self):
+        """Îles destinataires des migrants."""
+        n = len(self.inboxes)
+        if n < 2:
+            return []
+        if self.topology == 'random':
+            return [random.choice([i for i in range(n) if i != self.island_id])]
+        return [(self.island_id + 1) % n] # "ring"
+
+    def _after_generation(self, g):
+        if (g + 1) % self.migration_interval != 0:
+            return
+
+        # 1. Émigration: les meilleurs individus (représentations compactes)
+        emigrants = sorted(self.population, key=lambda ind: ind.fitness)[:self.migration_size]
+        for neighbor in self._neighbors():
+            for ind in emigrants:
+                self.inboxes[neighbor].put(ind.representation)
+
+        # 2. Immigration: tout ce qui est arrivé, sans attendre
+        arrivals = []
+        while True:
+            try:
+                arrivals.append(self.inboxes[self.island_id].get_nowait())
+            except queue.Empty:
+                break
+        accepted = self.immigrate(arrivals) if arrivals else 0
+
+        print(f"[Île {self.island_id}] Génération {g+1} | Meilleure Fitness: "
+              f"{self.best_solution.fitness:.2f} | migrants reçus: {accepted}",
+              file=sys.__stdout__, flush=True)
+
+def _run_island(island_id, filepath, alpha, beta, inboxes, results, island_kwargs):
+    """
+    Point d'entrée d'un processus île. Envoie toujours un message au
+    maître: (island_id, 'ok', résultats) ou (island_id, 'error', trace).
+    """
+    try:
+        # Les affichages détaillés du MGA de l'île sont masqués
+        with contextlib.redirect_stdout(io.StringIO()):
+            problem = ProblemInstance(filepath, alpha, beta)
+            island = IslandMGA(problem, island_id, inboxes, **island_kwargs)
+            best = island.run()
+        message = (island_id, 'ok', (best.representation, best.fitness, island.ls_stats,
+                                     island.time_to_first_generation, island.stop_reason,
+                                     island.generations_done))
+    except Exception:
+        message = (island_id, 'error', traceback.format_exc())
+    finally:
+        # Les migrants jamais lus ne doivent pas bloquer la fin du processus
+        for inbox in inboxes:
+            inbox.cancel_join_thread()
+    results.put(message)
+
+# ---------------------------------------------------------------------------
+# MODÈLE EN ÎLES (processus maître)
+# ---------------------------------------------------------------------------
+
+class IslandModel:
+    """
+    Lance N îles MGA en parallèle (un processus par île) avec migration
+    périodique. Même interface que MemeticAlgorithm: run() retourne la
+    meilleure solution, get_operator_statistics() les statistiques VND
+    cumulées de toutes les îles.
+    """
+
+    def __init__(self, problem: ProblemInstance, num_islands, island_params=None,
+                 topology='ring', migration_interval=10, migration_size=2,
+                 seed=None, **mga_kwargs):
+        self.problem = problem
+        self.num_islands = num_islands
+        # Paramètres propres à chaque île (cyclés si la liste est plus courte)
+        self.island_params = island_params or [{}]
+        self.topology = topology
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.seed = seed
+        self.mga_kwargs = mga_kwargs
+
+        self.best_solution = None
+        self.time_to_first_generation = None # Île la plus lente à démarrer
+        self.stop_reason = None              # Raisons d'arrêt des îles (distinctes)
+        self.generations_done = 0            # Île ayant fait le plus de générations
+        self.island_results = []
+        self.ls_stats = LocalSearchStats(deterministic=seed is not None)
+
+    def _island_kwargs(self, island_id):
+        kwargs = dict(self.mga_kwargs)
+        kwargs.update(self.island_params[island_id % len(self.island_params)])
+        kwargs['workers'] = 1 # Une île = un processus
+        kwargs['seed'] = self.seed + island_id if self.seed is not None else None
+        kwargs['topology'] = self.topology
+        kwargs['migration_interval'] = self.migration_interval
+        kwargs['migration_size'] = self.migration_size
+        return kwargs
+
+    def _collect_results(self, processes, results):
+        """
+        Résultats de toutes les îles. Lève RuntimeError si une île a échoué
+        (trace de l'exception) ou s'est arrêtée sans envoyer de résultat
+        (processus tué, par exemple), au lieu d'attendre indéfiniment.
+        """
+        received = {}
+        silent_dead = set() # Îles terminées sans résultat au dernier passage
+        while len(received) < len(processes):
+            try:
+                island_id, status, payload = results.get(timeout=ISLAND_POLL_SECONDS)
+            except queue.Empty:
+                for island_id, process in enumerate(processes):
+                    if island_id in received or process.is_alive():
+                        continue
+                    # Un résultat envoyé juste avant la fin peut encore être
+                    # en transit: l'île n'est déclarée perdue qu'au passage suivant.
+                    if island_id in silent_dead:
+                        raise RuntimeError(f"L'île {island_id} s'est arrêtée sans résultat "
+                                           f"(code de sortie {process.exitcode}).")
+                    silent_dead.add(island_id)
+                continue
+            if status == 'error':
+                raise RuntimeError(f"Échec de l'île {island_id}:\n{payload}")
+            received[island_id] = (island_id,) + payload
+        return list(received.values())
+
+    def run(self):
+        print(f"Lancement de {self.num_islands} îles (topologie: {self.topology}, "
+              f"migration toutes les {self.migration_interval} générations)...")
+
+        inboxes = [multiprocessing.Queue() for _ in range(self.num_islands)]
+        results = multiprocessing.Queue()
+        processes = []
+        for island_id in range(self.num_islands):
+            process = multiprocessing.Process(
+                target=_run_island,
+                args=(island_id, self.problem.filepath, self.problem.alpha, self.problem.beta,
+                      inboxes, results, self._island_kwargs(island_id)),
+            )
+            process.start()
+            processes.append(process)
+
+        # Récupérer les résultats AVANT join (évite un blocage sur les Queues)
+        try:
+            self.island_results = self._collect_results(processes, results)
+        except BaseException:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+            raise
+        for process in processes:
+            process.join()
+        self.island_results.sort(key=lambda r: r[0])
+
+        empty_stats = LocalSearchStats()
+        reasons = []
+        for island_id, representation, fitness, island_stats, ttfg, reason, generations in self.island_results:
+            print(f"  > Île {island_id}: meilleure fitness {fitness:.2f} (arrêt: {reason})")
+            self.ls_stats.merge(island_stats, empty_stats)
+            self.time_to_first_generation = max(self.time_to_first_generation or 0.0, ttfg)
+            self.generations_done = max(self.generations_done, generations)
+            if reason not in reasons:
+                reasons.append(reason)
+
+            candidate = Individual(representation)
+            candidate.calculate_fitness(self.problem)
+            if candidate.fitness != float('inf') and (
+                    self.best_solution is None or candidate.fitness < self.best_solution.fitness):
+                self.best_solution = candidate
+
+        self.stop_reason = '+'.join(reasons)
+
+        print("\n--- Optimisation Terminée (îles) ---")
+        return self.best_solution
+
+    def get_operator_statistics(self):
+        return self.ls_stats.summary()
@@ -10,6 +10,9 @@ if proj_root not in sys.path:
 
 from problem import ProblemInstance
 from mga import MemeticAlgorithm
+from islands import IslandModel
+from alns import ALNS
+from tabu import TabuSearch
 from individual import Individual
 from collections import Counter
 import config
@@ -106,16 +109,104 @@ def run_solver():
 
     # 2. Initialiser l'algorithme
     print("--- 2. Initialisation du MGA ---")
-    mga = MemeticAlgorithm(problem=problem,
-                           pop_size=config.POP_SIZE,
-                           generations=config.GENERATIONS,
-                           crossover_rate=config.CROSSOVER_RATE,
-                           mutation_rate=config.MUTATION_RATE,
-                           elite_size=config.ELITE_SIZE)
+    mga_kwargs = dict(pop_size=config.POP_SIZE,
+                      generations=config.GENERATIONS,
+                      crossover_rate=config.CROSSOVER_RATE,
+                      mutation_rate=config.MUTATION_RATE,
+                      elite_size=config.ELITE_SIZE,
+                      ls_time_per_generation=config.LS_BUDGET_TEMPS_GENERATION,
+                      ls_evals_per_generation=config.LS_BUDGET_EVALS_GENERATION,
+                      route_min_time=config.ROUTE_MIN_TEMPS,
+                      route_min_interval=config.ROUTE_MIN_INTERVALLE,
+                      penalized=config.MODE_PENALISE,
+                      target_feasibility=config.CIBLE_FAISABILITE,
+                      replacement=config.MODE_REMPLACEMENT,
+                      diversity=config.SELECTION_DIVERSITE,
+                      n_closest=config.NB_PROCHES,
+                      constructor=config.CONSTRUCTEUR_INITIAL,
+                      repair_criterion=config.CRITERE_REPARATION,
+                      i1_params=config.I1_PARAMS,
+                      regret_k=config.REGRET_K,
+                      chromosome=config.CHROMOSOME,
+                      max_time=config.TEMPS_MAX,
+                      max_stagnation=config.GENERATIONS_SANS_AMELIORATION,
+                      target_cost=config.COUT_CIBLE,
+                      lower_bound_gap=config.ECART_BORNE_INF,
+                      seeds=config.SOLUTIONS_INITIALES)
+
+    if config.MOTEUR == "alns":
+        print("Moteur: ALNS")
+        solver = ALNS(problem=problem,
+                      iterations=config.ALNS_ITERATIONS,
+                      removal_rate=config.ALNS_TAUX_DESTRUCTION,
+                      local_search=config.ALNS_RECHERCHE_LOCALE,
+                      regret_k=config.REGRET_K,
+                      constructor=config.CONSTRUCTEUR_INITIAL,
+                      seeds=config.SOLUTIONS_INITIALES,
+                      seed=config.SEED,
+                      max_time=config.TEMPS_MAX,
+                      max_stagnation=config.ALNS_ITERATIONS_SANS_AMELIORATION,
+                      target_cost=config.COUT_CIBLE)
+    elif config.MOTEUR == "tabu":
+        print("Moteur: recherche tabou")
+        solver = TabuSearch(problem=problem,
+                            iterations=config.TABOU_ITERATIONS,
+                            neighbors=config.TABOU_VOISINS,
+                            tenure=config.TABOU_DUREE,
+                            constructor=config.CONSTRUCTEUR_INITIAL,
+                            seeds=config.SOLUTIONS_INITIALES,
+                            seed=config.SEED,
+                            max_time=config.TEMPS_MAX,
+                            max_stagnation=config.TABOU_ITERATIONS_SANS_AMELIORATION,
+                            target_cost=config.COUT_CIBLE)
+    elif config.NB_ILES > 1:
+        solver = IslandModel(problem=problem,
+                          num_islands=config.NB_ILES,
+                          island_params=config.ILES_PARAMS,
+                          topology=config.MIGRATION_TOPOLOGIE,
+                          migration_interval=config.MIGRATION_INTERVALLE,
+                          migration_size=config.MIGRATION_TAILLE,
+                          seed=config.SEED,
+                          **mga_kwargs)
+    elif config.REPRENDRE_CHECKPOINT and config.CHECKPOINT_FICHIER and os.path.exists(config.CHECKPOINT_FICHIER):
+        print(f"Reprise du checkpoint: {config.CHECKPOINT_FICHIER}")
+        solver = MemeticAlgorithm.resume(config.CHECKPOINT_FICHIER, problem)
+    else:
+        solver = MemeticAlgorithm(problem=problem,
+                               workers=config.NB_WORKERS,
+                               seed=config.SEED,
+                               checkpoint_path=config.CHECKPOINT_FICHIER,
+                               checkpoint_interval=config.CHECKPOINT_INTERVALLE,
+                               **mga_kwargs)
     
     # 3. Lancer l'optimisation
     print("--- 3. Lancement de l'optimisation ---")
-    best_solution = mga.run()
+    solve_start = time.perf_counter()
+    best_solution = solver.run()
+
+    # Intensification tabou depuis la meilleure solution trouvée, dans le
+    # temps restant sur TEMPS_MAX (le budget est partagé avec le moteur)
+    intensifier = None
+    remaining_time = None
+    if config.TEMPS_MAX is not None:
+        remaining_time = max(0.0, config.TEMPS_MAX - (time.perf_counter() - solve_start))
+    if remaining_time == 0.0 and config.TABOU_INTENSIFICATION:
+        print("Intensification tabou ignorée: TEMPS_MAX écoulé.")
+    elif config.TABOU_INTENSIFICATION and config.MOTEUR != "tabu":
+        print("--- Intensification: recherche tabou ---")
+        intensifier = TabuSearch(problem=problem,
+                                 iterations=config.TABOU_ITERATIONS,
+                                 neighbors=config.TABOU_VOISINS,
+                                 tenure=config.TABOU_DUREE,
+                                 initial=best_solution,
+                                 seed=config.SEED,
+                                 max_time=remaining_time,
+                                 max_stagnation=config.TABOU_ITERATIONS_SANS_AMELIORATION,
+                                 target_cost=config.COUT_CIBLE)
+        intensified = intensifier.run()
+        print(f"Intensification: {best_solution.fitness:.2f} -> {intensified.fitness:.2f}")
+        if intensified.fitness < best_solution.fitness:
+            best_solution = intensified
 
     # 4. Étape de Vérification
     verify_solution_completeness(problem, best_solution)
@@ -138,7 +229,18 @@ def run_solver():
     print(f"Coût Véhicules (Alpha): {cost_alpha:.2f} ({best_solution.num_vehicles} x {problem.alpha})")
     print(f"Pénalité Retard (Beta): {cost_beta:.2f} ({best_solution.total_delay_penalty:.2f} x {problem.beta})")
         
+    print("\n--- Statistiques des Opérateurs (ALNS / tabou / VND) ---")
+    operator_statistics = solver.get_operator_statistics()
+    if intensifier is not None:
+        operator_statistics += intensifier.get_operator_statistics()
+    for row in operator_statistics:
+        print(f"{row['operateur']:<10} | appels: {row['appels']:>6} | succès: {row['taux_succes']*100:5.1f}% "
+              f"| temps: {row['temps']:7.2f}s | gain/s: {row['gain_par_seconde']:9.2f}")
+        
+    if solver.time_to_first_generation is not None:
+        print(f"\nTemps jusqu'à la 1ère génération: {solver.time_to_first_generation:.2f} secondes.")
     print(f"\nTemps total d'exécution: {elapsed_time:.2f} secondes.")
+    print(f"Arrêt: {solver.stop_reason} ({solver.generations_done} générations)")
 
     # --- EXPORT CSV DES RÉSULTATS (MGA) ---
     try:
@@ -179,7 +281,7 @@ def run_solver():
             writer.writerow([
                 "Instance", "Nb_Clients", "Nb_Vehicules_alloc", "Vehicules_utilisés",
                 "Capacité", "Coût_total_Z*", "Coût_distance", "Coût_véhicules",
-                "Coût_pénalité", "Alpha", "Beta", "Statut"
+                "Coût_pénalité", "Alpha", "Beta", "Statut", "Raison_arrêt", "Générations"
             ])
             writer.writerow([
                 instance_base, nb_clients, config.POP_SIZE, vehicles_used,
@@ -187,7 +289,8 @@ def run_solver():
                 round(total_dist, 4) if isinstance(total_dist, (int, float)) else total_dist,
                 round(vehicle_cost, 4) if isinstance(vehicle_cost, (int, float)) else vehicle_cost,
                 round(penalty_cost, 4) if isinstance(penalty_cost, (int, float)) else penalty_cost,
-                config.COUT_FIXE_VEHICULE, config.PENALITE_RETARD, 'Heuristic'
+                config.COUT_FIXE_VEHICULE, config.PENALITE_RETARD, 'Heuristic',
+                solver.stop_reason, solver.generations_done
             ])
 
             writer.writerow([])
@@ -2,11 +2,25 @@
 
 import random
 import os
+import time
+import bisect
+import io
+import contextlib
+import pickle
+from array import array
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from problem import ProblemInstance
-from individual import Individual
-from operators_genetic import crossover, mutation
-from operators_local_search import apply_local_search
-from operators_local_search import _calculate_route_cost
+from individual import Individual, PenaltyWeights
+from operators_genetic import crossover, mutation, _repair_with_best_insertion
+from operators_local_search import apply_local_search, LocalSearchStats, SearchBudget
+from operators_local_search import _calculate_route_cost, _route_violation, _get_routes, _build_individual
+from route_minimization import minimize_routes
+from constructors import CONSTRUCTORS
+from insertion import I1Criterion, RegretCriterion, InsertionCache
+from giant_tour import crossover_giant_tour
+from bounds import lower_bound
+from warm_start import load_seeds
 
 # --- Configuration dynamique des chemins (similaire à main_m_e.py) ---
 # BASE_DIR pointe au dossier Projet (où se trouve ce fichier)
@@ -17,6 +31,61 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 RESULTS_DIR = os.path.join(BASE_DIR, 'results_mga')
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Nouvelle meilleure solution produite par MemeticAlgorithm.run_iter():
+# solution, secondes depuis le lancement, génération (0 = avant la 1ère)
+Incumbent = namedtuple('Incumbent', ['solution', 'elapsed', 'generation'])
+
+# ---------------------------------------------------------------------------
+# PROCESSUS WORKERS (mode parallèle)
+# ---------------------------------------------------------------------------
+
+# MGA "local" de chaque processus worker (créé une seule fois par worker)
+_WORKER_MGA = None
+
+def _init_worker(filepath, alpha, beta, mga_kwargs):
+    """
+    Initialiseur d'un processus worker: charge l'instance UNE fois
+    (sans affichage) et crée un MGA local qui sert à "élever" les enfants.
+    """
+    global _WORKER_MGA
+    with contextlib.redirect_stdout(io.StringIO()):
+        problem = ProblemInstance(filepath, alpha, beta)
+    _WORKER_MGA = MemeticAlgorithm(problem, **mga_kwargs)
+
+def _worker_breed(task):
+    """
+    Crée un enfant dans un worker à partir d'une tâche compacte:
+    (représentation parent 1, représentation parent 2, graine,
+     budget (secondes, évaluations), statistiques VND, poids de pénalité).
+    Retourne (représentation de l'enfant, faisabilité avant réparation,
+    statistiques VND après l'appel).
+    """
+    rep1, rep2, seed, max_seconds, max_evals, ls_stats, penalty_weights = task
+    mga = _WORKER_MGA
+    random.seed(seed)
+    mga.ls_stats = ls_stats
+    mga.penalty_weights = penalty_weights
+
+    budget = None
+    if max_seconds is not None or max_evals is not None:
+        budget = SearchBudget(max_seconds, max_evals)
+
+    child, feasibility = mga._breed(Individual(rep1), Individual(rep2), budget)
+    return child.representation, feasibility, ls_stats
+
+def _worker_construct(task):
+    """
+    Construit une solution initiale dans un worker à partir d'une tâche
+    (graine, randomisée ?). Retourne sa représentation.
+    """
+    seed, randomized = task
+    mga = _WORKER_MGA
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if randomized:
+            return mga._create_randomized_solution().representation
+        return mga._create_initial_solution().representation
+
 class MemeticAlgorithm:
     """
     Implémente l'Algorithme Génétique Mémétique (MGA)
@@ -24,8 +93,19 @@ class MemeticAlgorithm:
    
     """
     def __init__(self, problem: ProblemInstance, pop_size, generations, 
-                 crossover_rate, mutation_rate, elite_size):
-        
+                 crossover_rate, mutation_rate, elite_size,
+                 ls_time_per_generation=None, ls_evals_per_generation=None,
+                 route_min_time=None, route_min_interval=None,
+                 penalized=False, target_feasibility=0.2, repair_rate=0.5,
+                 workers=1, seed=None, replacement='generational',
+                 diversity=False, n_closest=5, constructor='best_insertion',
+                 repair_criterion='best_insertion', i1_params=None, regret_k=2,
+                 chromosome='routes', max_time=None, max_stagnation=None,
+                 target_cost=None, lower_bound_gap=None,
+                 checkpoint_path=None, checkpoint_interval=10, seeds=None):
+        # Paramètres du constructeur (enregistrés dans les checkpoints)
+        self._params = {name: value for name, value in locals().items() if name not in ('self', 'problem')}
+
         self.problem = problem
         self.pop_size = pop_size
         self.generations = generations
@@ -33,8 +113,121 @@ class MemeticAlgorithm:
         self.mutation_rate = mutation_rate
         self.elite_size = elite_size # Nombre d'élites à conserver
 
+        # Budget de recherche locale PAR GÉNÉRATION (None = illimité),
+        # réparti entre les enfants de la génération.
+        self.ls_time_per_generation = ls_time_per_generation
+        self.ls_evals_per_generation = ls_evals_per_generation
+
+        # Phase de réduction du nombre de véhicules (route_minimization.py):
+        # budget en secondes (None = désactivée), lancée avant le MGA puis,
+        # si 'route_min_interval' est défini, toutes les N générations.
+        self.route_min_time = route_min_time
+        self.route_min_interval = route_min_interval
+
+        # Mode pénalisé: la population et la recherche locale peuvent
+        # contenir des solutions infaisables (time warp / excès de charge),
+        # pénalisées par des poids adaptés vers 'target_feasibility'.
+        # Un enfant infaisable est réparé avec la probabilité 'repair_rate';
+        # seule une solution faisable peut devenir la meilleure solution.
+        self.penalized = penalized
+        self.penalty_weights = PenaltyWeights(target_feasibility=target_feasibility) if penalized else None
+        self.repair_rate = repair_rate
+
+        # Mode parallèle: les enfants d'une génération sont créés par un
+        # ProcessPoolExecutor de 'workers' processus (1 = séquentiel).
+        # 'seed' fixe la graine maître: le résultat est reproductible
+        # (et ne dépend pas de l'ordonnancement des workers), tant qu'aucun
+        # budget exprimé en secondes n'est utilisé (LS, réduction des véhicules).
+        self.workers = workers
+        self.seed = seed
+        self._executor = None
+
+        # Remplacement: 'generational' (population reconstruite à chaque
+        # génération) ou 'steady_state' (chaque enfant remplace aussitôt le
+        # pire individu, ou le plus semblable parmi les moins bons: voir
+        # _steady_state_insert). En steady-state, la population reste triée.
+        self.replacement = replacement
+
+        # Gestion de la diversité (fitness biaisée): le rang de coût est
+        # combiné au rang de contribution à la diversité (distance "broken
+        # pairs" moyenne aux 'n_closest' plus proches voisins). Sert à la
+        # sélection des parents et à celle des survivants (clones d'abord).
+        self.diversity = diversity
+        self.n_closest = n_closest
+        self._proximity = {}       # individu -> {autre individu: distance}
+        self._biased_fitness = {}  # individu -> fitness biaisée (population courante)
+        # Pool suivi incrémentalement: pour chacun de ses individus, les
+        # distances aux autres membres, triées (une ligne ajoutée / retirée
+        # par insertion / suppression au lieu de tout recalculer)
+        self._sorted_distances = {}
+
+        # Heuristique de construction des solutions initiales:
+        # 'best_insertion' (ci-dessous) ou une entrée de constructors.CONSTRUCTORS
+        if constructor != 'best_insertion' and constructor not in CONSTRUCTORS:
+            raise ValueError(f"Constructeur initial inconnu: {constructor}")
+        self.constructor = constructor
+
+        # Critère de réinsertion des réparations (croisement, mutation
+        # "Destroy", reconstruction): 'best_insertion' (coût seul), 'i1'
+        # (Solomon) ou 'regret' (regret-k, k = regret_k: 2, 3, ... ou 'm').
+        # Les poids I1 servent aussi au constructeur 'i1'.
+        self.repair_criterion = repair_criterion
+        self.i1_params = i1_params or {}
+        self.i1_criterion = I1Criterion(**self.i1_params)
+        self.regret_k = regret_k
+        if repair_criterion == 'i1':
+            self._repair = self.i1_criterion
+        elif repair_criterion == 'regret':
+            self._repair = RegretCriterion(regret_k)
+        elif repair_criterion == 'best_insertion':
+            self._repair = None
+        else:
+            raise ValueError(f"Critère de réparation inconnu: {repair_criterion}")
+
+        # Chromosome: 'routes' (croisement BCRC + réparation par insertion)
+        # ou 'giant_tour' (permutation des clients, croisement OX puis
+        # découpage optimal Split: pas de réparation, voir giant_tour.py)
+        if chromosome not in ('routes', 'giant_tour'):
+            raise ValueError(f"Chromosome inconnu: {chromosome}")
+        self.chromosome = chromosome
+
+        # Critères d'arrêt (en plus du nombre de générations), testés entre
+        # deux générations: temps total en secondes depuis le lancement de
+        # run(), générations sans amélioration de la meilleure solution,
+        # coût cible, écart relatif à la borne inférieure (bounds.py,
+        # 0.0 = borne atteinte). None = critère désactivé.
+        self.max_time = max_time
+        self.max_stagnation = max_stagnation
+        self.target_cost = target_cost
+        self.lower_bound_gap = lower_bound_gap
+        self.lower_bound = None
+        # Raison de l'arrêt (disponible après run()): 'generations',
+        # 'time_limit', 'stagnation', 'target_cost' ou 'lower_bound'
+        self.stop_reason = None
+        self.generations_done = 0
+        self._last_improvement = 0 # Génération de la dernière amélioration
+
+        # Checkpoint: état complet (population, meilleure solution, compteur
+        # de générations, état du générateur aléatoire, statistiques VND)
+        # écrit toutes les 'checkpoint_interval' générations dans
+        # 'checkpoint_path' (None = désactivé). Voir save_checkpoint / resume.
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self._resumed = False
+        self._elapsed_offset = 0.0 # Temps déjà écoulé avant la reprise
+
+        # Démarrage à chaud: solutions graines (.sol, CSV de résultats, listes
+        # de tournées ou Individual, voir warm_start.py), rendues faisables
+        # puis placées en tête de la population initiale.
+        self.seeds = seeds or []
+
         self.population = []
         self.best_solution = None
+        # Temps écoulé entre le lancement de run() et la 1ère génération
+        self.time_to_first_generation = None
+
+        # Statistiques par opérateur de la VND (disponibles après run())
+        self.ls_stats = LocalSearchStats(deterministic=seed is not None)
 
     def _initialize_population(self):
         """
@@ -42,21 +235,63 @@ class MemeticAlgorithm:
         Doit créer des solutions FAISABLES.
         Avec la nouvelle contrainte dure t_i <= l_i, nous devons
         filtrer les solutions initiales invalides.
+        Générateur: rend la main après chaque individu ajouté (la meilleure
+        solution est tenue à jour au fil de la construction).
+        Si 'max_time' est écoulé, la construction s'arrête dès qu'il y a au
+        moins un individu (population incomplète).
         """
         print("Initialisation de la population (filtrage des solutions invalides)...")
         self.population = []
         attempts = 0
-        MAX_INIT_ATTEMPTS = self.pop_size * 200 # Augmentation de la sécurité
+        # Chaque tentative randomisée donne (presque toujours) une solution
+        # différente: inutile de prévoir une marge énorme.
+        MAX_INIT_ATTEMPTS = self.pop_size * 20
+
+        seen = set()     # Représentations déjà présentes dans la population
+        duplicates = []  # Doublons valides (utilisés seulement en dernier recours)
 
-        while len(self.population) < self.pop_size and attempts < MAX_INIT_ATTEMPTS:
-            new_individual = self._create_initial_solution()
-            new_individual.calculate_fitness(self.problem)
+        # Démarrage à chaud: les graines d'abord
+        for seed_individual in load_seeds(self.seeds[:self.pop_size], self.problem, self._repair):
+            seed_individual.calculate_fitness(self.problem, self.penalty_weights)
+            key = tuple(seed_individual.representation)
+            if seed_individual.fitness == float('inf') or key in seen:
+                continue
+            seen.add(key)
+            self.population.append(seed_individual)
+            self._update_best([seed_individual])
+            yield
+        if self.seeds:
+            print(f"  > {len(self.population)} solution(s) graine(s) injectée(s) sur {len(self.seeds)}")
+
+        candidates = self._initial_candidates(MAX_INIT_ATTEMPTS)
+        for new_individual in candidates:
+            if len(self.population) >= self.pop_size:
+                break
+            if self.population and self._remaining_time() == 0.0:
+                print(f"  > Temps maximal atteint pendant l'initialisation ({len(self.population)} individus)")
+                break
+            attempts += 1
             
             # On n'ajoute que les solutions valides (non infinies)
-            if new_individual.fitness != float('inf'):
-                self.population.append(new_individual)
-            
-            attempts += 1
+            if new_individual.fitness == float('inf'):
+                continue
+
+            # ... et distinctes
+            key = tuple(new_individual.representation)
+            if key in seen:
+                duplicates.append(new_individual)
+                continue
+            seen.add(key)
+            self.population.append(new_individual)
+            self._update_best([new_individual])
+            if len(self.population) >= self.pop_size:
+                break
+            yield
+        candidates.close() # Annule les constructions parallèles encore en attente
+
+        # Compléter avec des doublons si on n'a pas trouvé assez de solutions distinctes
+        for new_individual in duplicates[:self.pop_size - len(self.population)]:
+            self.population.append(new_individual)
         
         if not self.population:
             # Si on n'a trouvé AUCUNE solution valide
@@ -70,7 +305,47 @@ class MemeticAlgorithm:
         
         # Initialiser la meilleure solution
         self.best_solution = min(self.population, key=lambda ind: ind.fitness)
-        print(f"Population initiale VALIDE créée ({len(self.population)} individus). Meilleure fitness: {self.best_solution.fitness:.2f}")
+        print(f"Population initiale VALIDE créée ({len(self.population)} individus, "
+              f"{len(seen)} solutions distinctes en {attempts} tentatives). "
+              f"Meilleure fitness: {self.best_solution.fitness:.2f}")
+
+    def _initial_candidates(self, max_attempts):
+        """
+        Générateur des solutions initiales évaluées, une par tentative
+        (1ère: heuristique déterministe, ensuite variantes randomisées).
+        En mode parallèle, les constructions sont réparties sur le pool de
+        processus (une graine par tentative, tirée ici) avec une fenêtre de
+        2 tâches par worker; les résultats sont rendus dans l'ordre des
+        tentatives (reproductible) et les tâches restantes sont annulées
+        dès que le générateur est fermé.
+        """
+        if self._executor is None:
+            for attempt in range(max_attempts):
+                if attempt == 0:
+                    new_individual = self._create_initial_solution()
+                else:
+                    new_individual = self._create_randomized_solution()
+                new_individual.calculate_fitness(self.problem)
+                yield new_individual
+            return
+
+        # Générateur de graines dédié: le flux aléatoire principal ne dépend
+        # pas du nombre de tâches lancées (donc du nombre de workers)
+        seeds = random.Random(random.getrandbits(64))
+        pending = deque()
+        submitted = 0
+        try:
+            while pending or submitted < max_attempts:
+                while submitted < max_attempts and len(pending) < 2 * self.workers:
+                    task = (seeds.getrandbits(64), submitted > 0)
+                    pending.append(self._executor.submit(_worker_construct, task))
+                    submitted += 1
+                new_individual = Individual(pending.popleft().result())
+                new_individual.calculate_fitness(self.problem)
+                yield new_individual
+        finally:
+            for future in pending:
+                future.cancel()
 
     def _create_initial_solution(self):
         """
@@ -78,7 +353,10 @@ class MemeticAlgorithm:
         
         C'est beaucoup plus lent, mais beaucoup plus intelligent.
         Cela va drastiquement réduire le nombre de véhicules initial.
+        (Délègue à constructors.py si un autre constructeur est choisi.)
         """
+        if self.constructor != 'best_insertion':
+            return self._build_with_constructor(randomized=False)
         
         # 1. Trier les clients par "due date" (l_i)
         clients_to_insert = sorted(
@@ -89,71 +367,28 @@ class MemeticAlgorithm:
         routes = [] # Liste de listes (tournées)
         unserved_clients = [] # Clients que nous n'arrivons pas à insérer
 
+        # Meilleures insertions en cache par (client, tournée): capacité et
+        # incompatibilités testées en O(1), seule la tournée modifiée est
+        # réévaluée après une insertion.
+        cache = InsertionCache(routes, self.problem)
+
         for client_id in clients_to_insert:
-            client_to_insert = self.problem.get_node(client_id)
-            if not client_to_insert: continue
-
-            best_insertion_cost = float('inf')
-            best_route_idx = -1
-            best_position_idx = -1
-
-            # 2. Essayer d'insérer ce client dans la MEILLEURE position
-            for r_idx, route in enumerate(routes):
-                
-                # --- Vérifications rapides (pour la tournée entière) ---
-                
-                # 2a. Capacité
-                current_demand = sum(self.problem.get_node(c_id)['demand'] for c_id in route)
-                if current_demand + client_to_insert['demand'] > self.problem.vehicle_capacity:
-                    continue # Route pleine
-
-                # 2b. Incompatibilité
-                is_incompatible = False
-                for existing_client_id in route:
-                    pair = tuple(sorted((client_id, existing_client_id)))
-                    if pair in self.problem.incompatibilities:
-                        is_incompatible = True
-                        break
-                if is_incompatible:
-                    continue # Incompatible avec un client de cette route
-                
-                # --- Vérification de chaque position (coûteux) ---
-                
-                # On calcule le coût actuel de la tournée
-                original_route_cost = _calculate_route_cost(route, self.problem)
-                
-                for pos in range(len(route) + 1):
-                    # Essayer d'insérer le client à la position 'pos'
-                    new_route = route[:pos] + [client_id] + route[pos:]
-                    
-                    # 2c. Vérifier la validité (Temps)
-                    new_route_cost = _calculate_route_cost(new_route, self.problem)
-                    
-                    if new_route_cost == float('inf'):
-                        continue # Cette position viole les temps
-
-                    # C'est une insertion valide. Calculer "l'augmentation" de coût
-                    insertion_cost_increase = new_route_cost - original_route_cost
-                    
-                    if insertion_cost_increase < best_insertion_cost:
-                        best_insertion_cost = insertion_cost_increase
-                        best_route_idx = r_idx
-                        best_position_idx = pos
+            if not self.problem.get_node(client_id): continue
+
+            # 2. Chercher la MEILLEURE position valide (toutes tournées)
+            best = cache.best(client_id)
             
             # 3. Décision: Insérer ou créer une nouvelle route?
-            if best_route_idx != -1:
+            if best is not None:
                 # On a trouvé un emplacement valide. On l'insère.
-                routes[best_route_idx].insert(best_position_idx, client_id)
-            else:
+                _, best_route_idx, best_position_idx = best
+                cache.insert(client_id, best_route_idx, best_position_idx)
+            elif _calculate_route_cost([client_id], self.problem) != float('inf'):
                 # AUCUN emplacement valide n'a été trouvé dans les tournées existantes.
-                # On crée une nouvelle tournée pour ce client.
-                new_route = [client_id]
-                
-                # On vérifie que le client est servable seul
-                if _calculate_route_cost(new_route, self.problem) != float('inf'):
-                    routes.append(new_route)
-                else:
-                    unserved_clients.append(client_id)
+                # On crée une nouvelle tournée pour ce client (servable seul).
+                cache.open_route(client_id)
+            else:
+                unserved_clients.append(client_id)
         
         # 4. Signaler si des clients n'ont pas pu être servis
         if unserved_clients:
@@ -169,6 +404,52 @@ class MemeticAlgorithm:
             
         return Individual(representation)
 
+    def _build_with_constructor(self, randomized):
+        """Solution construite par un constructeur de constructors.py."""
+        build = CONSTRUCTORS[self.constructor]
+        if self.constructor == 'i1':
+            return build(self.problem, randomized=randomized, criterion=self.i1_criterion)
+        return build(self.problem, randomized=randomized)
+
+    def _create_randomized_solution(self, noise=0.1, max_seed_clients=3, removal_rate=0.2):
+        """
+        Variante RANDOMISÉE de la "Best Insertion" (diversité de la population initiale):
+        1. Quelques clients "graines" tirés au hasard ouvrent chacun une tournée.
+        2. Les autres sont insérés au mieux, triés par l_i bruité
+           (bruit uniforme d'au plus 'noise' x l'horizon du dépôt).
+        3. Une fraction aléatoire (jusqu'à 'removal_rate') des clients est
+           retirée puis réinsérée au mieux, dans un ordre aléatoire.
+        Avec un autre constructeur, on utilise sa propre variante randomisée.
+        """
+        if self.constructor != 'best_insertion':
+            return self._build_with_constructor(randomized=True)
+
+        horizon = self.problem.depot['l']
+        noisy_due = {
+            client_id: client['l'] + random.uniform(0, noise * horizon)
+            for client_id, client in self.problem.clients.items()
+        }
+        clients_to_insert = sorted(noisy_due, key=noisy_due.get)
+
+        # 1. Clients graines (servables seuls)
+        routes = []
+        for client_id in random.sample(clients_to_insert, random.randint(0, min(max_seed_clients, len(clients_to_insert)))):
+            if _calculate_route_cost([client_id], self.problem) != float('inf'):
+                routes.append([client_id])
+                clients_to_insert.remove(client_id)
+
+        # 2. Meilleure insertion dans l'ordre bruité
+        routes = _repair_with_best_insertion(routes, clients_to_insert, self.problem, self._repair)
+
+        # 3. Retrait aléatoire + réinsertion
+        served = [c for route in routes for c in route]
+        removed = random.sample(served, int(len(served) * random.uniform(0, removal_rate)))
+        removed_set = set(removed)
+        routes = [[c for c in route if c not in removed_set] for route in routes]
+        routes = _repair_with_best_insertion([r for r in routes if r], removed, self.problem, self._repair)
+
+        return _build_individual(routes)
+
     def _selection(self, k=3):
         """
         Sélection par tournoi (Taille k=3).
@@ -178,64 +459,697 @@ class MemeticAlgorithm:
         que la taille du tournoi (k).
         """
         
+        # Avec la gestion de la diversité, le tournoi se fait sur la
+        # fitness biaisée (coût + diversité) au lieu du coût seul.
+        if self.diversity and self._biased_fitness:
+            key = lambda ind: self._biased_fitness.get(ind, float('inf'))
+        else:
+            key = lambda ind: ind.fitness
+
         # Si la population est trop petite pour un tournoi,
         # on retourne juste le meilleur individu disponible.
         if len(self.population) < k:
-            return min(self.population, key=lambda ind: ind.fitness)
+            return min(self.population, key=key)
         
         # Comportement normal
         tournament = random.sample(self.population, k)
-        return min(tournament, key=lambda ind: ind.fitness) 
+        return min(tournament, key=key) 
+
+    # -----------------------------------------------------------------------
+    # GESTION DE LA DIVERSITÉ (fitness biaisée, sélection des survivants)
+    # -----------------------------------------------------------------------
+
+    def _distance(self, ind_a: Individual, ind_b: Individual):
+        """Distance broken pairs, mise en cache pour la paire."""
+        cached = self._proximity.setdefault(ind_a, {})
+        if ind_b not in cached:
+            distance = ind_a.broken_pairs_distance(ind_b)
+            cached[ind_b] = distance
+            self._proximity.setdefault(ind_b, {})[ind_a] = distance
+        return cached[ind_b]
+
+    def _forget(self, ind: Individual):
+        """Retire un individu du cache des distances."""
+        for other in self._proximity.pop(ind, {}):
+            self._proximity.get(other, {}).pop(ind, None)
+
+    def _track(self, ind: Individual):
+        """Ajoute un individu au pool suivi (une ligne de distances)."""
+        row = []
+        for other, distances in self._sorted_distances.items():
+            distance = self._distance(ind, other)
+            bisect.insort(distances, distance)
+            row.append(distance)
+        row.sort()
+        self._sorted_distances[ind] = row
+
+    def _untrack(self, ind: Individual):
+        """Retire un individu du pool suivi et du cache des distances."""
+        self._sorted_distances.pop(ind, None)
+        for other, distances in self._sorted_distances.items():
+            distance = self._proximity[ind][other]
+            del distances[bisect.bisect_left(distances, distance)]
+        self._forget(ind)
+
+    def _sync_tracked(self, pool):
+        """Aligne le pool suivi sur 'pool' (seuls les écarts sont calculés)."""
+        members = set(pool)
+        for ind in [ind for ind in self._sorted_distances if ind not in members]:
+            self._untrack(ind)
+        for ind in pool:
+            if ind not in self._sorted_distances:
+                self._track(ind)
+
+    def _diversity_contribution(self, ind: Individual):
+        """Distance moyenne aux 'n_closest' plus proches individus du pool suivi."""
+        closest = self._sorted_distances[ind][:self.n_closest]
+        return sum(closest) / len(closest) if closest else 0.0
+
+    def _has_better_clone(self, ind: Individual, pool):
+        """Vrai si un autre individu du pool, au moins aussi bon, est à distance nulle."""
+        distances = self._sorted_distances[ind]
+        if not distances or distances[0] > 0.0:
+            return False
+        return any(other is not ind and other.fitness <= ind.fitness and self._proximity[ind][other] == 0.0
+                   for other in pool)
+
+    def _compute_biased_fitness(self, pool):
+        """
+        Fitness biaisée (à minimiser) de chaque individu du pool (le pool
+        suivi, voir _sync_tracked):
+            rang_coût + (1 - nb_élites / taille) * rang_diversité
+        (rangs normalisés dans [0, 1]; forte diversité = bon rang).
+        """
+        n = len(pool)
+        if n < 2:
+            return {ind: 0.0 for ind in pool}
+
+        by_cost = sorted(pool, key=lambda ind: ind.fitness)
+        by_diversity = sorted(pool, key=lambda ind: -self._diversity_contribution(ind))
+        cost_rank = {ind: r / (n - 1) for r, ind in enumerate(by_cost)}
+        diversity_rank = {ind: r / (n - 1) for r, ind in enumerate(by_diversity)}
+
+        diversity_weight = 1.0 - min(self.elite_size, n) / n
+        return {ind: cost_rank[ind] + diversity_weight * diversity_rank[ind] for ind in pool}
+
+    def _survivor_selection(self, pool, size):
+        """
+        Réduit le pool à 'size' individus: on supprime d'abord les clones
+        (distance nulle à un autre individu; le moins bon des deux), puis
+        l'individu de plus mauvaise fitness biaisée. Le meilleur individu
+        (coût) n'est jamais supprimé.
+        Les distances sont tenues à jour incrémentalement (pool suivi):
+        chaque suppression retire une ligne, seuls les rangs sont recalculés.
+        """
+        pool = list(pool)
+        self._sync_tracked(pool)
+        while len(pool) > size:
+            best = min(pool, key=lambda ind: ind.fitness)
+            clones = [ind for ind in pool if ind is not best and self._has_better_clone(ind, pool)]
+            if clones:
+                victim = max(clones, key=lambda ind: ind.fitness)
+            else:
+                biased = self._compute_biased_fitness(pool)
+                victim = max((ind for ind in pool if ind is not best), key=lambda ind: biased[ind])
+            pool.remove(victim)
+            self._untrack(victim)
+        return pool
+
+    def _refresh_biased_fitness(self):
+        """
+        Recalcule la fitness biaisée de la population courante et purge
+        le cache des distances des individus qui n'en font plus partie.
+        """
+        if not self.diversity:
+            return
+        self._sync_tracked(self.population)
+        alive = set(self.population)
+        for ind in [ind for ind in self._proximity if ind not in alive]:
+            self._forget(ind)
+        self._biased_fitness = self._compute_biased_fitness(self.population)
+
+    def _child_budget(self, remaining_time, remaining_evals, children_left):
+        """
+        Budget de recherche locale d'un enfant: le budget restant de la
+        génération divisé par le nombre d'enfants restant à créer
+        (ce qu'un enfant n'utilise pas profite aux suivants).
+        Retourne None si aucun budget n'est configuré.
+        """
+        if remaining_time is None and remaining_evals is None:
+            return None
+        max_seconds = remaining_time / children_left if remaining_time is not None else None
+        max_evaluations = remaining_evals // children_left if remaining_evals is not None else None
+        return SearchBudget(max_seconds, max_evaluations)
+
+    def _repair_feasibility(self, individual: Individual) -> Individual:
+        """
+        Réparation d'un individu infaisable (mode pénalisé):
+          1. recherche locale avec des pénalités x10 puis x100,
+          2. sinon, on retire des tournées les clients en violation
+             et on les réinsère par "Best Insertion" (mode strict).
+        Retourne un individu évalué en mode strict.
+        """
+        for factor in (10, 100):
+            individual = apply_local_search(individual, self.problem, self.ls_stats,
+                                            penalties=self.penalty_weights.scaled(factor))
+            individual.calculate_fitness(self.problem)
+            if individual.fitness != float('inf'):
+                return individual
+
+        routes = _get_routes(individual)
+        removed = []
+        for route in routes:
+            violation = _route_violation(route, self.problem)
+            while route and violation > 1e-9:
+                # Retirer le client dont le départ réduit le plus la violation
+                best_idx = min(
+                    range(len(route)),
+                    key=lambda i: _route_violation(route[:i] + route[i+1:], self.problem)
+                )
+                removed.append(route.pop(best_idx))
+                violation = _route_violation(route, self.problem)
+
+        removed.sort(key=lambda cid: self.problem.get_node(cid)['l'])
+        routes = _repair_with_best_insertion([r for r in routes if r], removed, self.problem, self._repair)
+        repaired = _build_individual(routes)
+        repaired.calculate_fitness(self.problem)
+        return repaired
+
+    def _create_child(self, budget: SearchBudget = None) -> Individual:
+        """
+        Crée un enfant: sélection, puis croisement, mutation, recherche
+        locale (étape mémétique) et évaluation (voir _breed).
+        """
+        parent1 = self._selection()
+        parent2 = self._selection()
+
+        child, feasibility = self._breed(parent1, parent2, budget)
+        if self.penalized:
+            self.penalty_weights.record(*feasibility)
+        return child
+
+    def _breed(self, parent1: Individual, parent2: Individual, budget: SearchBudget = None):
+        """
+        Crée un enfant à partir de deux parents (utilisé aussi dans les
+        processus workers). Retourne (enfant évalué, faisabilité avant
+        réparation sous la forme (temps OK, capacité OK)).
+        """
+        # b. Croisement
+        if random.random() < self.crossover_rate:
+            if self.chromosome == 'giant_tour':
+                child = crossover_giant_tour(parent1, parent2, self.problem)
+            else:
+                child = crossover(parent1, parent2, self.problem, self._repair)
+        else:
+            child = Individual(parent1.representation.copy()) # Clone
 
-    def run(self):
+        # c. Mutation
+        if random.random() < self.mutation_rate:
+            child = mutation(child, self.problem, self._repair)
+
+        # d. ÉTAPE MÉMÉTIQUE: Optimisation Locale
+        child = apply_local_search(child, self.problem, self.ls_stats, budget, self.penalty_weights)
+
+        # e. Évaluation du nouvel individu
+        child.calculate_fitness(self.problem, self.penalty_weights)
+
+        feasibility = (child.time_warp <= 1e-9, child.excess_load <= 1e-9)
+
+        # f. Mode pénalisé: réparation éventuelle
+        if self.penalized and not child.is_feasible and random.random() < self.repair_rate:
+            repaired = self._repair_feasibility(child)
+            if repaired.fitness != float('inf'):
+                child = repaired
+                child.calculate_fitness(self.problem, self.penalty_weights)
+
+        return child, feasibility
+
+    def _create_children_parallel(self, count):
+        """
+        Crée 'count' enfants en parallèle. La sélection et les graines sont
+        tirées ici (processus maître); seuls les représentations, graines et
+        instantanés (statistiques VND, poids de pénalité) circulent.
+        Les résultats sont traités dans l'ordre des tâches: reproductible.
+        """
+        # Budget de la génération réparti uniformément entre les enfants
+        max_seconds = self.ls_time_per_generation / count if self.ls_time_per_generation is not None else None
+        max_evals = self.ls_evals_per_generation // count if self.ls_evals_per_generation is not None else None
+
+        baseline_stats = self.ls_stats.copy()
+        weights_snapshot = self.penalty_weights.copy() if self.penalized else None
+
+        tasks = []
+        for _ in range(count):
+            parent1 = self._selection()
+            parent2 = self._selection()
+            tasks.append((parent1.representation, parent2.representation,
+                          random.getrandbits(64), max_seconds, max_evals,
+                          baseline_stats, weights_snapshot))
+
+        children = []
+        for representation, feasibility, worker_stats in self._executor.map(_worker_breed, tasks):
+            self.ls_stats.merge(worker_stats, baseline_stats)
+            if self.penalized:
+                self.penalty_weights.record(*feasibility)
+            child = Individual(representation)
+            child.calculate_fitness(self.problem, self.penalty_weights)
+            children.append(child)
+        return children
+
+    def _start_workers(self):
+        """Démarre le pool de processus (chaque worker charge l'instance une fois)."""
+        mga_kwargs = {
+            'pop_size': self.pop_size,
+            'generations': self.generations,
+            'crossover_rate': self.crossover_rate,
+            'mutation_rate': self.mutation_rate,
+            'elite_size': self.elite_size,
+            'penalized': self.penalized,
+            'repair_rate': self.repair_rate,
+            'constructor': self.constructor,
+            'repair_criterion': self.repair_criterion,
+            'i1_params': self.i1_params,
+            'regret_k': self.regret_k,
+            'chromosome': self.chromosome,
+        }
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.problem.filepath, self.problem.alpha, self.problem.beta, mga_kwargs),
+        )
+
+    def _stop_workers(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _update_best(self, candidates):
+        """
+        Met à jour la meilleure solution globale à partir des candidats
+        FAISABLES (en mode pénalisé, un infaisable ne devient jamais la
+        meilleure solution).
+        """
+        feasible = [ind for ind in candidates if ind.is_feasible and ind.fitness != float('inf')]
+        if not feasible:
+            return
+        current_best = min(feasible, key=lambda ind: ind.fitness)
+        if self.best_solution is None or current_best.fitness < self.best_solution.fitness:
+            self.best_solution = current_best
+
+    def _remaining_time(self):
+        """Secondes restantes avant 'max_time' (None = pas de limite)."""
+        if self.max_time is None:
+            return None
+        return max(0.0, self.max_time - (time.perf_counter() - self._start_time))
+
+    def _route_minimization_phase(self):
+        """
+        Applique la réduction du nombre de véhicules à la meilleure solution,
+        optimise le résultat localement, puis l'injecte dans la population
+        (à la place du pire individu). Le budget 'route_min_time' et la
+        recherche locale sont bornés par le temps restant ('max_time').
+        """
+        remaining = self._remaining_time()
+        if remaining == 0.0:
+            return
+        time_limit = self.route_min_time if remaining is None else min(self.route_min_time, remaining)
+        source = self.best_solution
+        reduced = minimize_routes(source, self.problem, time_limit=time_limit)
+        remaining = self._remaining_time()
+        budget = SearchBudget(max_seconds=remaining) if remaining is not None else None
+        reduced = apply_local_search(reduced, self.problem, self.ls_stats, budget)
+        reduced.calculate_fitness(self.problem)
+
+        print(f"  > Réduction des véhicules: {source.num_vehicles} -> {reduced.num_vehicles} "
+              f"(fitness {source.fitness:.2f} -> {reduced.fitness:.2f})")
+
+        if reduced.fitness == float('inf') or reduced.num_vehicles >= source.num_vehicles:
+            return
+
+        worst_idx = max(range(len(self.population)), key=lambda i: self.population[i].fitness)
+        self.population[worst_idx] = reduced
+        if reduced.fitness < self.best_solution.fitness:
+            self.best_solution = reduced
+
+    def run(self, callback=None):
         """
         Lance l'exécution de l'algorithme génétique mémétique.
+        'callback(incumbent)' (optionnel) est appelé à chaque nouvelle
+        meilleure solution (voir run_iter).
         """
-        self._initialize_population()
-        
-        # Boucle principale des générations
-        for g in range(self.generations):
-            new_population = []
-
-            # 1. ÉLITISME: Conserver les meilleurs individus
-            sorted_pop = sorted(self.population, key=lambda ind: ind.fitness)
-            elites = sorted_pop[:self.elite_size]
-            new_population.extend(elites)
-
-            # 2. Remplir le reste de la population
-            while len(new_population) < self.pop_size:
-                # 2a. Sélection
-                parent1 = self._selection()
-                parent2 = self._selection()
-
-                # 2b. Croisement
-                if random.random() < self.crossover_rate:
-                    child = crossover(parent1, parent2, self.problem)
-                else:
-                    child = Individual(parent1.representation.copy()) # Clone
+        for incumbent in self.run_iter():
+            if callback is not None:
+                callback(incumbent)
+        return self.best_solution
+
+    def run_iter(self):
+        """
+        Version "anytime" de run(): générateur qui produit un Incumbent à
+        chaque nouvelle meilleure solution faisable (pendant la construction
+        de la population initiale, puis au plus une fois par génération).
+        L'appelant peut s'arrêter quand il veut (break, close()): il détient
+        toujours la meilleure solution trouvée jusque-là, et stop_reason
+        vaut alors 'interrupted'.
+        """
+        self._start_time = time.perf_counter() - self._elapsed_offset
+        if self._resumed:
+            random.setstate(self._random_state)
+        elif self.seed is not None:
+            random.seed(self.seed)
+
+        if self.workers > 1:
+            self._start_workers()
+        steps = self._run()
+        try:
+            best = None
+            for generation in steps:
+                if self.best_solution is not None and self.best_solution is not best:
+                    best = self.best_solution
+                    yield Incumbent(best, time.perf_counter() - self._start_time, generation)
+        except GeneratorExit:
+            self.stop_reason = 'interrupted'
+            raise
+        finally:
+            steps.close()
+            self._stop_workers()
+
+    def _run(self):
+        """
+        Boucle principale (voir run_iter). Générateur: rend la main avec le
+        numéro de génération (0 = population initiale) à chaque point où
+        la meilleure solution a pu changer.
+        """
+        if self._resumed:
+            # Reprise d'un checkpoint: la population est déjà restaurée
+            print(f"Reprise à la génération {self.generations_done + 1} "
+                  f"(meilleure fitness: {self.best_solution.fitness:.2f})")
+            yield self.generations_done
+        else:
+            for _ in self._initialize_population():
+                yield 0
+            yield 0
 
-                # 2c. Mutation
-                if random.random() < self.mutation_rate:
-                    child = mutation(child, self.problem)
+            if self.route_min_time:
+                print("Phase de réduction du nombre de véhicules...")
+                self._route_minimization_phase()
+                yield 0
 
-                # 2d. ÉTAPE MÉMÉTIQUE: Optimisation Locale
-                child = apply_local_search(child, self.problem)
-                
-                # 2e. Évaluation du nouvel individu
-                child.calculate_fitness(self.problem)
-                
-                new_population.append(child)
+            if self.replacement == 'steady_state':
+                self.population.sort(key=lambda ind: ind.fitness)
 
-            # Mettre à jour la population
-            self.population = new_population
+            self.time_to_first_generation = time.perf_counter() - self._start_time
+            print(f"Temps jusqu'à la 1ère génération: {self.time_to_first_generation:.2f}s")
 
-            # Mettre à jour la meilleure solution globale
-            current_best = min(self.population, key=lambda ind: ind.fitness)
-            if current_best.fitness < self.best_solution.fitness:
-                self.best_solution = current_best
+        if self.lower_bound_gap is not None and self.lower_bound is None:
+            self.lower_bound = lower_bound(self.problem)
+            print(f"Borne inférieure: {self.lower_bound:.2f}")
+
+        # Boucle principale des générations
+        self.stop_reason = 'generations'
+        for g in range(self.generations_done, self.generations):
+            best_fitness = self.best_solution.fitness
+            reason = self._check_stop(g - self._last_improvement)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Arrêt avant la génération {g+1}: {reason}")
+                break
+
+            # Mode pénalisé: les poids ont pu changer, on ré-évalue
+            if self.penalized:
+                for ind in self.population:
+                    ind.calculate_fitness(self.problem, self.penalty_weights)
+                if self.replacement == 'steady_state':
+                    self.population.sort(key=lambda ind: ind.fitness)
+
+            # La population a pu changer (migrants, réduction de routes...)
+            self._refresh_biased_fitness()
+
+            if self.replacement == 'steady_state':
+                self._steady_state_generation()
+            else:
+                self._generational_generation()
 
             print(f"Génération {g+1}/{self.generations} | Meilleure Fitness: {self.best_solution.fitness:.2f}")
 
+            # Réduction périodique du nombre de véhicules (en parallèle du MGA)
+            if self.route_min_time and self.route_min_interval and (g + 1) % self.route_min_interval == 0:
+                self._route_minimization_phase()
+                if self.replacement == 'steady_state':
+                    self.population.sort(key=lambda ind: ind.fitness)
+
+            self._after_generation(g)
+            self.generations_done = g + 1
+            if self.best_solution.fitness < best_fitness:
+                self._last_improvement = g + 1
+
+            if self.checkpoint_path and (g + 1) % self.checkpoint_interval == 0:
+                self.save_checkpoint(self.checkpoint_path)
+            yield g + 1
+
         # Fin de l'algorithme
         print("\n--- Optimisation Terminée ---")
-        return self.best_solution
\ No newline at end of file
+
+    # ---------------------------------------------------------------------------
+    # CHECKPOINT / REPRISE
+    # ---------------------------------------------------------------------------
+
+    def save_checkpoint(self, path):
+        """
+        Écrit l'état du MGA dans 'path' (pickle binaire; représentations
+        stockées en tableaux d'entiers compacts). L'écriture est atomique:
+        fichier temporaire puis os.replace, un crash ne laisse jamais un
+        checkpoint à moitié écrit.
+        """
+        state = {
+            'problem': (self.problem.filepath, self.problem.alpha, self.problem.beta),
+            'params': self._params,
+            'population': [array('i', ind.representation) for ind in self.population],
+            'best': array('i', self.best_solution.representation),
+            'generations_done': self.generations_done,
+            'last_improvement': self._last_improvement,
+            'elapsed': time.perf_counter() - self._start_time,
+            'time_to_first_generation': self.time_to_first_generation,
+            'lower_bound': self.lower_bound,
+            'random_state': random.getstate(),
+            'ls_stats': self.ls_stats,
+            'penalty_weights': self.penalty_weights,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def resume(cls, path, problem: ProblemInstance = None):
+        """
+        Recrée le MGA enregistré dans le checkpoint 'path': run() (ou
+        run_iter()) reprend alors à la génération suivante, avec la même
+        population, le même état aléatoire et les mêmes statistiques.
+        'problem' évite de recharger l'instance (sinon relue depuis le
+        fichier d'origine).
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        if problem is None:
+            problem = ProblemInstance(*state['problem'])
+
+        mga = cls(problem, **state['params'])
+        mga.penalty_weights = state['penalty_weights']
+        mga.population = []
+        for representation in state['population']:
+            ind = Individual(list(representation))
+            ind.calculate_fitness(problem, mga.penalty_weights)
+            mga.population.append(ind)
+        mga.best_solution = Individual(list(state['best']))
+        mga.best_solution.calculate_fitness(problem, mga.penalty_weights)
+
+        mga.generations_done = state['generations_done']
+        mga._last_improvement = state['last_improvement']
+        mga._elapsed_offset = state['elapsed']
+        mga.time_to_first_generation = state['time_to_first_generation']
+        mga.lower_bound = state['lower_bound']
+        mga.ls_stats = state['ls_stats']
+        mga._random_state = state['random_state']
+        mga._resumed = True
+        return mga
+
+    def _check_stop(self, stagnation):
+        """
+        Raison d'arrêter avant la prochaine génération (None = continuer).
+        'stagnation' = nombre de générations sans amélioration.
+        """
+        best = self.best_solution.fitness if self.best_solution is not None else float('inf')
+        if self.target_cost is not None and best <= self.target_cost:
+            return 'target_cost'
+        if self.lower_bound is not None and best <= self.lower_bound * (1 + self.lower_bound_gap):
+            return 'lower_bound'
+        if self.max_stagnation is not None and stagnation >= self.max_stagnation:
+            return 'stagnation'
+        if self.max_time is not None and time.perf_counter() - self._start_time >= self.max_time:
+            return 'time_limit'
+        return None
+
+    def _generational_generation(self):
+        """
+        Une génération en mode générationnel: élitisme puis
+        reconstruction complète de la population.
+        """
+        new_population = []
+
+        # 1. ÉLITISME: Conserver les meilleurs individus
+        sorted_pop = sorted(self.population, key=lambda ind: ind.fitness)
+        elites = sorted_pop[:self.elite_size]
+        new_population.extend(elites)
+
+        # Budget de recherche locale restant pour cette génération
+        remaining_ls_time = self.ls_time_per_generation
+        remaining_ls_evals = self.ls_evals_per_generation
+
+        # 2. Remplir le reste de la population
+        if self._executor is not None:
+            new_population.extend(self._create_children_parallel(self.pop_size - len(new_population)))
+
+        while len(new_population) < self.pop_size:
+            # Part équitable du budget de recherche locale restant
+            children_left = self.pop_size - len(new_population)
+            budget = self._child_budget(remaining_ls_time, remaining_ls_evals, children_left)
+
+            child = self._create_child(budget)
+
+            if budget is not None:
+                if remaining_ls_time is not None:
+                    remaining_ls_time = max(0.0, remaining_ls_time - budget.elapsed())
+                if remaining_ls_evals is not None:
+                    remaining_ls_evals = max(0, remaining_ls_evals - budget.evaluations)
+            
+            new_population.append(child)
+
+        # Mettre à jour la population
+        if self.diversity:
+            # Survivants choisis parmi anciens + enfants (clones et
+            # individus peu utiles à la diversité éliminés en premier)
+            children = new_population[len(elites):]
+            self.population = self._survivor_selection(self.population + children, self.pop_size)
+            self._refresh_biased_fitness()
+        else:
+            self.population = new_population
+
+        # Mettre à jour la meilleure solution globale
+        self._update_best(self.population)
+
+    def _steady_state_generation(self):
+        """
+        Une "génération" en mode steady-state: autant d'enfants que le mode
+        générationnel en crée (pop_size - elite_size), mais chaque enfant est
+        inséré dès sa création et peut être choisi comme parent juste après.
+        Pas de tri complet, pas de copie d'élites, pas de nouvelle liste.
+        """
+        num_children = max(1, self.pop_size - self.elite_size)
+        max_seconds = self.ls_time_per_generation / num_children if self.ls_time_per_generation is not None else None
+        max_evals = self.ls_evals_per_generation // num_children if self.ls_evals_per_generation is not None else None
+
+        created = 0
+        while created < num_children:
+            if self._executor is not None:
+                # Lot de 'workers' enfants créés en parallèle, insérés un par un
+                children = self._create_children_parallel(min(self.workers, num_children - created))
+            else:
+                budget = None
+                if max_seconds is not None or max_evals is not None:
+                    budget = SearchBudget(max_seconds, max_evals)
+                children = [self._create_child(budget)]
+
+            for child in children:
+                if self._steady_state_insert(child):
+                    self._update_best([child])
+            created += len(children)
+
+    def _steady_state_insert(self, child: Individual):
+        """
+        Insère un enfant dans la population triée (par fitness croissante).
+        L'enfant remplace, parmi les individus MOINS BONS que lui, celui qui
+        lui ressemble le plus (le plus d'arêtes communes), ce qui limite les
+        quasi-clones; à égalité, le pire. Les clones exacts et les enfants
+        moins bons que toute la population sont rejetés.
+        Retourne True si l'enfant a été inséré.
+        """
+        if child.fitness == float('inf'):
+            return False
+
+        if self.diversity:
+            # L'enfant entre, puis la sélection des survivants retire
+            # un clone ou l'individu de plus mauvaise fitness biaisée.
+            fitnesses = [ind.fitness for ind in self.population]
+            self.population.insert(bisect.bisect_right(fitnesses, child.fitness), child)
+            survivors = set(self._survivor_selection(self.population, self.pop_size))
+            self.population = [ind for ind in self.population if ind in survivors]
+            self._refresh_biased_fitness()
+            return child in survivors
+
+        fitnesses = [ind.fitness for ind in self.population]
+        first_worse = bisect.bisect_right(fitnesses, child.fitness)
+        if first_worse >= len(self.population):
+            return False # Moins bon que tout le monde
+
+        child_edges = child.edges()
+        # Clone exact (même fitness, mêmes arêtes) déjà présent ?
+        for ind in self.population[bisect.bisect_left(fitnesses, child.fitness):first_worse]:
+            if ind.edges() == child_edges:
+                return False
+
+        # Plus semblable parmi les moins bons (le pire à égalité)
+        worse = range(first_worse, len(self.population))
+        victim_idx = max(worse, key=lambda i: (len(child_edges & self.population[i].edges()), i))
+        del self.population[victim_idx]
+        self.population.insert(first_worse, child)
+        return True
+
+    def _after_generation(self, g):
+        """
+        Point d'extension appelé à la fin de chaque génération
+        (ne fait rien ici; utilisé par le modèle en îles pour la migration).
+        """
+        pass
+
+    def immigrate(self, representations):
+        """
+        Intègre des solutions venues de l'extérieur (migrants): elles sont
+        évaluées et remplacent les pires individus de la population (en
+        mode steady-state, via _steady_state_insert). Les clones d'individus
+        déjà présents sont rejetés et la population reste triée.
+        Retourne le nombre de migrants acceptés.
+        """
+        migrants = []
+        for representation in representations:
+            migrant = Individual(list(representation))
+            migrant.calculate_fitness(self.problem, self.penalty_weights)
+            if migrant.fitness != float('inf'):
+                migrants.append(migrant)
+
+        self.population.sort(key=lambda ind: ind.fitness)
+        if self.replacement == 'steady_state':
+            accepted = [migrant for migrant in migrants if self._steady_state_insert(migrant)]
+        else:
+            present = {ind.edges() for ind in self.population}
+            accepted = []
+            for migrant in migrants:
+                if len(accepted) == len(self.population):
+                    break
+                edges = migrant.edges()
+                if edges not in present:
+                    present.add(edges)
+                    accepted.append(migrant)
+            for i, migrant in enumerate(accepted):
+                self.population[-(i + 1)] = migrant
+            self.population.sort(key=lambda ind: ind.fitness)
+        self._update_best(accepted)
+        return len(accepted)
+
+    def get_operator_statistics(self):
+        """
+        Statistiques par opérateur de recherche locale (appels, taux de
+        succès, temps cumulé, gain, gain par seconde).
+        """
+        return self.ls_stats.summary()
\ No newline at end of file
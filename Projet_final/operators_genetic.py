@@ -3,6 +3,8 @@
 import random
 from individual import Individual
 from problem import ProblemInstance
+from insertion import InsertionCache, I1Criterion, RegretCriterion, NoiseCriterion
+from insertion import repair_with_i1, repair_with_regret, repair_with_noise
 
 # On a besoin de cette fonction pour le Crossover et la Réparation
 try:
@@ -42,8 +44,13 @@ def _get_representation_from_routes(routes):
 # OPÉRATEUR 1: CROSSOVER (BCRC) - (Inchangé)
 # ---------------------------------------------------------------------------
 
-def crossover(parent1: Individual, parent2: Individual, problem: ProblemInstance) -> Individual:
-    """Opérateur de Croisement (Crossover) "Best-Cost Route Crossover" (BCRC)."""
+def crossover(parent1: Individual, parent2: Individual, problem: ProblemInstance,
+              criterion=None) -> Individual:
+    """
+    Opérateur de Croisement (Crossover) "Best-Cost Route Crossover" (BCRC).
+    'criterion' (I1Criterion ou RegretCriterion) choisit la réparation I1
+    ou par regret au lieu de la Best Insertion.
+    """
    
     
     routes_p1 = _get_routes_from_representation(parent1.representation)
@@ -81,57 +88,39 @@ def crossover(parent1: Individual, parent2: Individual, problem: ProblemInstance
             key=lambda cid: problem.get_node(cid)['l']
         )
         
-        child_routes = _repair_with_best_insertion(child_routes, missing_clients_list, problem)
+        child_routes = _repair_with_best_insertion(child_routes, missing_clients_list, problem, criterion)
 
     new_representation = _get_representation_from_routes(child_routes)
     return Individual(new_representation)
 
-def _repair_with_best_insertion(routes, missing_clients, problem: ProblemInstance):
-    """Logique de réparation "Best Insertion" (utilisée par Crossover et Destroy)."""
-   
-    
+def _repair_with_best_insertion(routes, missing_clients, problem: ProblemInstance, criterion=None):
+    """
+    Logique de réparation "Best Insertion" (utilisée par Crossover et Destroy).
+    Les meilleures insertions sont gardées en cache par (client, tournée):
+    seule la tournée modifiée est réévaluée après chaque insertion.
+    Avec un 'criterion', on utilise à la place le critère I1 de Solomon
+    (I1Criterion: détour + décalage des heures de service), le regret-k
+    (RegretCriterion: clients difficiles d'abord) ou des coûts bruités
+    (NoiseCriterion).
+    """
+    if isinstance(criterion, I1Criterion):
+        return repair_with_i1(routes, missing_clients, problem, criterion)
+    if isinstance(criterion, RegretCriterion):
+        return repair_with_regret(routes, missing_clients, problem, criterion)
+    if isinstance(criterion, NoiseCriterion):
+        return repair_with_noise(routes, missing_clients, problem, criterion)
+
+    cache = InsertionCache(routes, problem)
     for client_id in missing_clients:
-        client_to_insert = problem.get_node(client_id)
-        if not client_to_insert: continue
-
-        best_insertion_cost = float('inf')
-        best_route_idx = -1
-        best_position_idx = -1
-
-        for r_idx, route in enumerate(routes):
-            current_demand = sum(problem.get_node(c_id)['demand'] for c_id in route)
-            if current_demand + client_to_insert['demand'] > problem.vehicle_capacity:
-                continue 
-
-            is_incompatible = False
-            for existing_client_id in route:
-                pair = tuple(sorted((client_id, existing_client_id)))
-                if pair in problem.incompatibilities:
-                    is_incompatible = True; break
-            if is_incompatible: continue
-            
-            original_route_cost = _calculate_route_cost(route, problem)
-            
-            for pos in range(len(route) + 1):
-                new_route = route[:pos] + [client_id] + route[pos:]
-                new_route_cost = _calculate_route_cost(new_route, problem)
-                
-                if new_route_cost == float('inf'): continue
-
-                insertion_cost_increase = new_route_cost - original_route_cost
-                
-                if insertion_cost_increase < best_insertion_cost:
-                    best_insertion_cost = insertion_cost_increase
-                    best_route_idx = r_idx
-                    best_position_idx = pos
-        
-        if best_route_idx != -1:
-            routes[best_route_idx].insert(best_position_idx, client_id)
-        else:
-            new_route = [client_id]
-            if _calculate_route_cost(new_route, problem) != float('inf'):
-                routes.append(new_route)
-            # else: le client ne peut pas être servi (on l'ignore)
+        if not problem.get_node(client_id): continue
+
+        best = cache.best(client_id)
+        if best is not None:
+            _, r_idx, pos = best
+            cache.insert(client_id, r_idx, pos)
+        elif _calculate_route_cost([client_id], problem) != float('inf'):
+            cache.open_route(client_id)
+        # else: le client ne peut pas être servi (on l'ignore)
 
     return routes
 
@@ -140,7 +129,19 @@ def _repair_with_best_insertion(routes, missing_clients, problem: ProblemInstanc
 # OPÉRATEUR 2: MUTATION (Mis à jour avec "DESTROY")
 # ---------------------------------------------------------------------------
 
-def mutation_destroy_route(individual: Individual, problem: ProblemInstance) -> Individual:
+def _remove_route(routes, problem: ProblemInstance, candidates=1):
+    """
+    Retire de 'routes' (sur place) une tournée tirée parmi les 'candidates'
+    plus petites (1 = la plus petite, plus facile à réinsérer). Retourne
+    ses clients, triés par urgence (l_i) pour maximiser les chances de
+    réinsertion.
+    """
+    routes.sort(key=len)
+    removed = routes.pop(random.randrange(min(candidates, len(routes))) if candidates > 1 else 0)
+    removed.sort(key=lambda cid: problem.get_node(cid)['l'])
+    return removed
+
+def mutation_destroy_route(individual: Individual, problem: ProblemInstance, criterion=None) -> Individual:
     """
     NOUVELLE MUTATION: Opérateur "Destroy Route" (Agressif).
     
@@ -156,20 +157,14 @@ def mutation_destroy_route(individual: Individual, problem: ProblemInstance) ->
 
     # 1. Choisir une tournée à détruire
     #    Stratégie: choisir la plus petite (plus facile à réinsérer)
-    routes.sort(key=len)
-    route_to_destroy = routes.pop(0) # Retire la plus petite tournée
-    
-    clients_to_reinsert = route_to_destroy
+    clients_to_reinsert = _remove_route(routes, problem)
     
     if not clients_to_reinsert:
         return individual # La tournée était vide, rien à faire
 
     # 2. Ré-insérer les clients orphelins dans les tournées restantes
-    #    On trie par urgence (l_i) pour maximiser les chances de succès
-    clients_to_reinsert.sort(key=lambda cid: problem.get_node(cid)['l'])
-    
     remaining_routes = routes
-    repaired_routes = _repair_with_best_insertion(remaining_routes, clients_to_reinsert, problem)
+    repaired_routes = _repair_with_best_insertion(remaining_routes, clients_to_reinsert, problem, criterion)
     
     # 3. Retourner le nouvel individu (qui a potentiellement moins de véhicules)
     new_representation = _get_representation_from_routes(repaired_routes)
@@ -205,17 +200,18 @@ def mutation_swap(individual: Individual, problem) -> Individual:
     return Individual(new_representation)
 
 
-def mutation(individual: Individual, problem: ProblemInstance) -> Individual:
+def mutation(individual: Individual, problem: ProblemInstance, criterion=None) -> Individual:
     """
     Fonction de mutation principale (MISE À JOUR).
-    Donne une chance à la nouvelle mutation "Destroy".
+    Donne une chance à la nouvelle mutation "Destroy"
+    ('criterion': réparation I1 ou regret, voir _repair_with_best_insertion).
     """
     
     rand_val = random.random()
     
     if rand_val < 0.25:
         # 25% de chance: Mutation Agressive "Destroy Route"
-        return mutation_destroy_route(individual, problem)
+        return mutation_destroy_route(individual, problem, criterion)
     
     elif rand_val < 0.75:
         # 50% de chance: Mutation "Exchange" (Inter-Tournée)
@@ -1,21 +1,30 @@
-# Fichier: operators_local_search.py (MIS À JOUR AVEC EXCHANGE INTER-ROUTES)
+# Fichier: operators_local_search.py (MIS À JOUR AVEC VND ADAPTATIVE ET CROSS-EXCHANGE)
 
 import random
 import itertools
-from individual import Individual
+import time
+from individual import Individual, PenaltyWeights
 from problem import ProblemInstance
+from vector_scoring import InsertionScorer, vector_scoring_available
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # ---------------------------------------------------------------------------
-# FONCTION UTILITAIRE (Inchangée)
+# FONCTIONS UTILITAIRES
 # ---------------------------------------------------------------------------
 
-def _calculate_route_cost(route, problem: ProblemInstance):
+def _calculate_route_cost(route, problem: ProblemInstance, penalties: PenaltyWeights = None):
     """
     Calcule le coût d'une SEULE tournée (Modèle "Strict").
-   
+    En mode pénalisé ('penalties' fourni), le time warp et l'excès de
+    charge sont ajoutés au coût au lieu de rendre la tournée invalide.
     """
     total_distance = 0
     total_delay_penalty = 0    # Pénalité Beta (t_i - e_i)
+    time_warp = 0.0
     current_time = 0.0
     last_node_id = 0 
 
@@ -30,7 +39,10 @@ def _calculate_route_cost(route, problem: ProblemInstance):
         start_service_time = max(client['e'], arrival_time)
         
         if start_service_time > client['l']:
-            return float('inf') # Invalide (Contrainte Dure)
+            if penalties is None:
+                return float('inf') # Invalide (Contrainte Dure)
+            time_warp += start_service_time - client['l']
+            start_service_time = client['l']
 
         delay_penalty = start_service_time - client['e']
         total_delay_penalty += delay_penalty
@@ -44,21 +56,123 @@ def _calculate_route_cost(route, problem: ProblemInstance):
         total_distance + 
         (problem.beta * total_delay_penalty)
     )
+    if penalties is not None:
+        excess_load = max(0.0, _route_demand(route, problem) - problem.vehicle_capacity)
+        cost += penalties.time_warp_weight * time_warp + penalties.capacity_weight * excess_load
     return cost
 
+def _route_violation(route, problem: ProblemInstance):
+    """
+    Mesure de l'infaisabilité d'une tournée (0 si faisable):
+    "time warp" (retour dans le temps nécessaire pour respecter l_i)
+    + excès de charge.
+    """
+    time_warp = 0.0
+    current_time = 0.0
+    last_node_id = 0
+    for client_id in route:
+        client = problem.get_node(client_id)
+        arrival_time = current_time + problem.get_distance(last_node_id, client_id)
+        start_service_time = max(client['e'], arrival_time)
+        if start_service_time > client['l']:
+            time_warp += start_service_time - client['l']
+            start_service_time = client['l']
+        current_time = start_service_time + client['s']
+        last_node_id = client_id
+    excess_load = max(0.0, _route_demand(route, problem) - problem.vehicle_capacity)
+    return time_warp + excess_load
+
+def _route_demand(route, problem: ProblemInstance):
+    """Demande totale d'une tournée."""
+    return sum(problem.get_node(c_id)['demand'] for c_id in route)
+
+def _get_routes(individual: Individual):
+    """Extrait les tournées (listes de clients) d'un individu."""
+    routes = []
+    current_route = []
+    for node_id in individual.representation[1:]:
+        if node_id == 0:
+            if current_route:
+                routes.append(current_route)
+            current_route = []
+        else:
+            current_route.append(node_id)
+    return routes
+
+def _build_individual(routes):
+    """Reconstruit un individu à partir d'une liste de tournées."""
+    new_representation = [0]
+    for route in routes:
+        if route: new_representation.extend(route); new_representation.append(0)
+    return Individual(new_representation)
+
+def _calculate_solution_cost(individual: Individual, problem: ProblemInstance,
+                             penalties: PenaltyWeights = None):
+    """
+    Coût Z d'une solution, sans modifier l'individu
+    (somme des coûts de tournées + alpha par véhicule).
+    La capacité est vérifiée ici car _calculate_route_cost l'ignore
+    (en mode strict; en mode pénalisé elle est dans le coût de tournée).
+    """
+    total = 0.0
+    for route in _get_routes(individual):
+        if penalties is None and _route_demand(route, problem) > problem.vehicle_capacity:
+            return float('inf')
+        total += _calculate_route_cost(route, problem, penalties) + problem.alpha
+    return total
+
 # ---------------------------------------------------------------------------
-# OPÉRATEUR 1: 2-OPT (Intra-Tournée) (Inchangé)
+# BUDGET DE RECHERCHE LOCALE
 # ---------------------------------------------------------------------------
 
-def _apply_2_opt_to_route(route, problem: ProblemInstance):
+class SearchBudget:
+    """
+    Budget d'un appel de recherche locale: temps (secondes) et/ou nombre
+    d'évaluations de mouvements. None = pas de limite.
+    Les opérateurs appellent consume() à chaque mouvement évalué et
+    s'arrêtent proprement dès que exhausted() est vrai.
+    """
+
+    def __init__(self, max_seconds=None, max_evaluations=None):
+        self.max_seconds = max_seconds
+        self.max_evaluations = max_evaluations
+        self.start_time = time.perf_counter()
+        self.evaluations = 0
+
+    def consume(self, n=1):
+        self.evaluations += n
+
+    def elapsed(self):
+        return time.perf_counter() - self.start_time
+
+    def exhausted(self):
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return True
+        if self.max_seconds is not None and self.elapsed() >= self.max_seconds:
+            return True
+        return False
+
+def _budget_exhausted(budget):
+    """Compte une évaluation et indique si le budget est épuisé."""
+    if budget is None:
+        return False
+    budget.consume()
+    return budget.exhausted()
+
+# ---------------------------------------------------------------------------
+# OPÉRATEUR 1: 2-OPT (Intra-Tournée)
+# ---------------------------------------------------------------------------
+
+def _apply_2_opt_to_route(route, problem: ProblemInstance, budget: SearchBudget = None,
+                          penalties: PenaltyWeights = None):
     """
     Applique une recherche locale 2-opt sur une SEULE tournée.
-   
+    S'arrête (avec la meilleure tournée trouvée) si le budget est épuisé.
     """
     if len(route) < 2:
         return route 
     best_route = route
-    best_cost = _calculate_route_cost(best_route, problem)
+    best_cost = _calculate_route_cost(best_route, problem, penalties)
     if best_cost == float('inf'):
         return best_route
     improved = True
@@ -67,8 +181,10 @@ def _apply_2_opt_to_route(route, problem: ProblemInstance):
         for i in range(len(best_route) - 1):
             for j in range(i + 1, len(best_route)):
                 if j - i < 1: continue
+                if _budget_exhausted(budget):
+                    return best_route
                 new_route = best_route[:i] + best_route[i:j+1][::-1] + best_route[j+1:]
-                new_cost = _calculate_route_cost(new_route, problem)
+                new_cost = _calculate_route_cost(new_route, problem, penalties)
                 if new_cost < best_cost - 1e-5: 
                     best_route = new_route
                     best_cost = new_cost
@@ -78,95 +194,282 @@ def _apply_2_opt_to_route(route, problem: ProblemInstance):
                 break 
     return best_route
 
+def _apply_2_opt_intra_route(individual: Individual, problem: ProblemInstance,
+                             budget: SearchBudget = None,
+                             penalties: PenaltyWeights = None) -> Individual:
+    """
+    Applique le 2-opt à chaque tournée de l'individu.
+    Retourne le MÊME objet si aucune tournée n'a été améliorée.
+    """
+    routes = _get_routes(individual)
+    improved = False
+    for r_idx, route in enumerate(routes):
+        if budget is not None and budget.exhausted():
+            break
+        improved_route = _apply_2_opt_to_route(route, problem, budget, penalties)
+        if improved_route is not route:
+            routes[r_idx] = improved_route
+            improved = True
+
+    if not improved:
+        return individual
+    return _build_individual(routes)
+
 # ---------------------------------------------------------------------------
-# OPÉRATEUR 2: RELOCATE (Inter-Tournées) (Inchangé)
+# OPÉRATEUR 2: RELOCATE (Inter-Tournées)
 # ---------------------------------------------------------------------------
 
-def _apply_relocate_inter_route(individual: Individual, problem: ProblemInstance) -> Individual:
+def _apply_relocate_inter_route(individual: Individual, problem: ProblemInstance,
+                                budget: SearchBudget = None,
+                                penalties: PenaltyWeights = None) -> Individual:
     """
-    Tente de déplacer des clients entre les tournées.
-   
+    Tente de déplacer un client vers une autre tournée.
+    Parcourt TOUT le voisinage (dans un ordre aléatoire) et applique le
+    premier déplacement améliorant: si rien n'est retourné de nouveau,
+    l'individu est un optimum local pour Relocate (ou le budget est épuisé).
+    En mode strict, sur les grandes solutions, les positions d'arrivée sont
+    évaluées d'un coup avec NumPy (voir _best_relocation_vectorized).
     """
     
-    routes = []
-    current_route = []
-    for node_id in individual.representation[1:]:
-        if node_id == 0:
-            if current_route:
-                routes.append(current_route)
-            current_route = []
-        else:
-            current_route.append(node_id)
-            
+    routes = _get_routes(individual)
     if len(routes) < 2:
         return individual
 
-    num_attempts = len(problem.clients) 
-    
-    for _ in range(num_attempts):
-        try:
-            idx_r1, idx_r2 = random.sample(range(len(routes)), 2)
-        except ValueError:
-            break 
-            
-        r1 = routes[idx_r1]
-        r2 = routes[idx_r2]
-        
-        if not r1: continue
+    route_costs = [_calculate_route_cost(r, problem, penalties) for r in routes]
+    route_demands = [_route_demand(r, problem) for r in routes]
 
-        idx_client = random.randrange(len(r1))
-        client_to_move = r1[idx_client]
+    scorer = None
+    if penalties is None and vector_scoring_available(len(individual.representation)):
+        scorer = InsertionScorer(routes, problem)
+        route_bits = [_route_bits(r) for r in routes]
 
-        cost_r1_old = _calculate_route_cost(r1, problem)
-        cost_r2_old = _calculate_route_cost(r2, problem)
-        
-        if cost_r1_old == float('inf') or cost_r2_old == float('inf'):
+    r1_order = list(range(len(routes)))
+    random.shuffle(r1_order)
+
+    for idx_r1 in r1_order:
+        r1 = routes[idx_r1]
+        if route_costs[idx_r1] == float('inf'):
             continue
-            
-        cost_before = cost_r1_old + cost_r2_old
-        if len(r1) == 1:
-            cost_before += problem.alpha
-
-        r1_new = r1[:idx_client] + r1[idx_client+1:]
-        cost_r1_new = _calculate_route_cost(r1_new, problem)
-
-        best_r2_new = None
-        best_cost_after = float('inf')
-
-        for i in range(len(r2) + 1):
-            r2_new = r2[:i] + [client_to_move] + r2[i:]
-            cost_r2_new = _calculate_route_cost(r2_new, problem)
-            
-            if cost_r2_new == float('inf'):
+
+        client_order = list(range(len(r1)))
+        random.shuffle(client_order)
+
+        for idx_client in client_order:
+            client_to_move = r1[idx_client]
+            client_demand = problem.get_node(client_to_move)['demand']
+
+            r1_new = r1[:idx_client] + r1[idx_client+1:]
+            cost_r1_new = _calculate_route_cost(r1_new, problem, penalties)
+            if cost_r1_new == float('inf'):
                 continue
 
-            is_incompatible = False
-            for existing_client_id in r2: 
-                pair = tuple(sorted((client_to_move, existing_client_id)))
-                if pair in problem.incompatibilities:
-                    is_incompatible = True; break
-            if is_incompatible:
-                cost_r2_new = float('inf'); continue
-
-            cost_after = cost_r1_new + cost_r2_new
-            
-            if cost_after < best_cost_after:
-                best_cost_after = cost_after
-                best_r2_new = r2_new
-        
-        if best_cost_after < cost_before - 1e-5:
-            routes[idx_r1] = r1_new
-            routes[idx_r2] = best_r2_new
-            
-            new_representation = [0]
-            for route in routes:
-                if route: new_representation.extend(route); new_representation.append(0)
-            return Individual(new_representation) 
+            # Gain obtenu en retirant le client (+ alpha si la tournée disparaît)
+            removal_gain = route_costs[idx_r1] - cost_r1_new
+            if not r1_new:
+                removal_gain += problem.alpha
+
+            best_delta = float('inf')
+            best_idx_r2 = -1
+            best_r2_new = None
+
+            out_of_budget = False
+            if scorer is not None:
+                best_delta, best_idx_r2, best_r2_new, out_of_budget = _best_relocation_vectorized(
+                    scorer, routes, route_costs, route_demands, route_bits,
+                    idx_r1, client_to_move, removal_gain, problem, budget)
+                routes_to_scan = []
+            else:
+                routes_to_scan = routes
+
+            for idx_r2, r2 in enumerate(routes_to_scan):
+                if out_of_budget:
+                    break
+                if idx_r2 == idx_r1 or route_costs[idx_r2] == float('inf'):
+                    continue
+
+                # Vérifications rapides: capacité (mode strict) puis incompatibilité
+                if penalties is None and route_demands[idx_r2] + client_demand > problem.vehicle_capacity:
+                    continue
+
+                is_incompatible = False
+                for existing_client_id in r2: 
+                    pair = tuple(sorted((client_to_move, existing_client_id)))
+                    if pair in problem.incompatibilities:
+                        is_incompatible = True; break
+                if is_incompatible:
+                    continue
+
+                for i in range(len(r2) + 1):
+                    if _budget_exhausted(budget):
+                        out_of_budget = True
+                        break
+                    r2_new = r2[:i] + [client_to_move] + r2[i:]
+                    cost_r2_new = _calculate_route_cost(r2_new, problem, penalties)
+                    if cost_r2_new == float('inf'):
+                        continue
+
+                    delta = cost_r2_new - route_costs[idx_r2]
+                    if delta < best_delta:
+                        best_delta = delta
+                        best_idx_r2 = idx_r2
+                        best_r2_new = r2_new
+
+            if best_idx_r2 != -1 and best_delta < removal_gain - 1e-5:
+                routes[idx_r1] = r1_new
+                routes[best_idx_r2] = best_r2_new
+                return _build_individual(routes)
+
+            if out_of_budget:
+                return individual
 
     return individual
 
+def _route_bits(route):
+    """Masque binaire des clients d'une tournée."""
+    bits = 0
+    for client_id in route:
+        bits |= 1 << client_id
+    return bits
+
+def _best_relocation_vectorized(scorer: InsertionScorer, routes, route_costs, route_demands, route_bits,
+                                idx_r1, client_id, removal_gain, problem: ProblemInstance,
+                                budget: SearchBudget = None):
+    """
+    Meilleure position d'arrivée (hors tournée idx_r1) du client, en mode
+    strict: toutes les positions sont notées d'un coup (faisabilité
+    temporelle + borne inférieure), puis seules les positions faisables
+    sont simulées, par borne croissante, tant que la borne peut encore
+    battre la meilleure position ET rendre le déplacement améliorant.
+    Retourne (delta, idx_r2, nouvelle tournée r2, budget épuisé ?).
+    """
+    demand = problem.get_node(client_id)['demand']
+    incomp_mask = problem.get_incompatibility_mask(client_id)
+    allowed = np.array([
+        idx_r2 != idx_r1 and route_costs[idx_r2] != float('inf')
+        and route_demands[idx_r2] + demand <= problem.vehicle_capacity
+        and not (incomp_mask & route_bits[idx_r2])
+        for idx_r2 in range(len(routes))
+    ], dtype=bool)
+
+    best = (float('inf'), -1, -1)
+    best_r2_new = None
+    for idx_r2, pos, lower_bound in scorer.score(client_id, allowed):
+        if lower_bound > best[0] + 1e-6 or lower_bound >= removal_gain - 1e-5:
+            break # Positions triées par borne: plus rien d'utile
+        if _budget_exhausted(budget):
+            return best[0], best[1], best_r2_new, True
+        r2_new = routes[idx_r2][:pos] + [client_id] + routes[idx_r2][pos:]
+        cost_r2_new = _calculate_route_cost(r2_new, problem)
+        if cost_r2_new == float('inf'):
+            continue
+        candidate = (cost_r2_new - route_costs[idx_r2], idx_r2, pos)
+        if candidate < best:
+            best = candidate
+            best_r2_new = r2_new
+    return best[0], best[1], best_r2_new, False
+
+# ---------------------------------------------------------------------------
+# CONCATÉNATION DE SEGMENTS (Vérifications O(1) pour les opérateurs inter-tournées)
+# ---------------------------------------------------------------------------
+#
+# Un segment (suite fixe de clients) est résumé par (D, EF, L, ok):
+#   - départ du dernier client = max(t + D, EF) si on arrive en t au premier,
+#   - faisable (fenêtres de temps) si t <= L,
+#   - ok = False si le segment est infaisable quel que soit t.
+# La concaténation de deux segments se fait en O(1), ce qui permet de
+# tester la faisabilité temporelle d'une tournée recomposée sans la re-simuler.
+# Le coût exact (distance + pénalité beta) n'est calculé que pour les
+# candidats faisables.
+
+# Segment "dépôt": départ à t = 0
+_DEPOT_SEGMENT = (0.0, 0.0, float('inf'), True)
+
+def _node_segment(client_id, problem: ProblemInstance):
+    """Segment réduit à un seul client."""
+    node = problem.get_node(client_id)
+    return (node['s'], node['e'] + node['s'], node['l'], True)
+
+def _concat_segments(seg1, last1, seg2, first2, problem: ProblemInstance):
+    """Concatène seg1 (finissant par last1) et seg2 (commençant par first2)."""
+    D1, EF1, L1, ok1 = seg1
+    D2, EF2, L2, ok2 = seg2
+    d = problem.get_distance(last1, first2)
+    ok = ok1 and ok2 and EF1 + d <= L2
+    return (D1 + d + D2, max(EF1 + d + D2, EF2), min(L1, L2 - D1 - d), ok)
+
+def _route_profile(route, problem: ProblemInstance):
+    """
+    Pré-calcule, pour une tournée, les données de préfixes (depuis le dépôt)
+    et de suffixes: segments temporels, demandes, masques de clients et
+    masques d'incompatibilité.
+    """
+    n = len(route)
+
+    prefix = [_DEPOT_SEGMENT] * (n + 1)
+    demand_prefix = [0.0] * (n + 1)
+    for i, client_id in enumerate(route):
+        last = route[i - 1] if i > 0 else 0
+        prefix[i + 1] = _concat_segments(prefix[i], last, _node_segment(client_id, problem), client_id, problem)
+        demand_prefix[i + 1] = demand_prefix[i] + problem.get_node(client_id)['demand']
+
+    suffix = [None] * (n + 1)
+    bits_suffix = [0] * (n + 1)
+    incomp_suffix = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        client_id = route[i]
+        seg = _node_segment(client_id, problem)
+        if suffix[i + 1] is not None:
+            seg = _concat_segments(seg, client_id, suffix[i + 1], route[i + 1], problem)
+        suffix[i] = seg
+        bits_suffix[i] = bits_suffix[i + 1] | (1 << client_id)
+        incomp_suffix[i] = incomp_suffix[i + 1] | problem.get_incompatibility_mask(client_id)
+
+    return {
+        'route': route,
+        'prefix': prefix,
+        'suffix': suffix,
+        'demand_prefix': demand_prefix,
+        'bits_suffix': bits_suffix,
+        'incomp_suffix': incomp_suffix,
+    }
+
+def _segments_from(route, start, max_length, problem: ProblemInstance):
+    """
+    Segments route[start:start+m] pour m = 1..max_length, construits
+    incrémentalement. Retourne une liste de (seg, demande, bits, incomp).
+    """
+    segments = []
+    seg = None
+    demand = 0.0
+    bits = 0
+    incomp = 0
+    for pos in range(start, min(start + max_length, len(route))):
+        client_id = route[pos]
+        node_seg = _node_segment(client_id, problem)
+        seg = node_seg if seg is None else _concat_segments(seg, route[pos - 1], node_seg, client_id, problem)
+        demand += problem.get_node(client_id)['demand']
+        bits |= 1 << client_id
+        incomp |= problem.get_incompatibility_mask(client_id)
+        segments.append((seg, demand, bits, incomp))
+    return segments
+
+def _is_time_feasible(profile, head_end, middle, middle_seg, tail_start, problem: ProblemInstance):
+    """
+    Faisabilité temporelle de: route[:head_end] + middle + route[tail_start:]
+    (profile = _route_profile de 'route'), en O(1).
+    """
+    route = profile['route']
+    seg = profile['prefix'][head_end]
+    last = route[head_end - 1] if head_end > 0 else 0
+    if middle:
+        seg = _concat_segments(seg, last, middle_seg, middle[0], problem)
+        last = middle[-1]
+    if tail_start < len(route):
+        seg = _concat_segments(seg, last, profile['suffix'][tail_start], route[tail_start], problem)
+    return seg[3]
+
 # ---------------------------------------------------------------------------
-# NOUVEL OPÉRATEUR 3: EXCHANGE (Inter-Tournées / 2-Opt Inter)
+# OPÉRATEUR 3: EXCHANGE (Inter-Tournées / 2-Opt Inter)
 # ---------------------------------------------------------------------------
 
 def _check_incompatibility_in_route(route, problem: ProblemInstance):
@@ -176,7 +479,9 @@ def _check_incompatibility_in_route(route, problem: ProblemInstance):
             return True # Incompatible
     return False
 
-def _apply_exchange_inter_route(individual: Individual, problem: ProblemInstance) -> Individual:
+def _apply_exchange_inter_route(individual: Individual, problem: ProblemInstance,
+                                budget: SearchBudget = None,
+                                penalties: PenaltyWeights = None) -> Individual:
     """
     Tente d'échanger les "queues" de deux tournées (2-Opt Inter-Route).
     
@@ -187,118 +492,371 @@ def _apply_exchange_inter_route(individual: Individual, problem: ProblemInstance
     
     A': 0 -> A_head -> B_tail -> 0
     B': 0 -> B_head -> A_tail -> 0
+
+    Toutes les paires de tournées et tous les points de coupe sont
+    parcourus (ordre aléatoire des paires), premier échange améliorant.
+    Capacité, incompatibilités (masques) et fenêtres de temps (segments)
+    sont vérifiées en O(1) avant de calculer le coût. En mode pénalisé,
+    seules les incompatibilités restent un filtre dur.
     """
     
-    routes = []
-    current_route = []
-    for node_id in individual.representation[1:]:
-        if node_id == 0:
-            if current_route:
-                routes.append(current_route)
-            current_route = []
-        else:
-            current_route.append(node_id)
-            
+    routes = _get_routes(individual)
     if len(routes) < 2:
         return individual
 
-    num_attempts = len(problem.clients) # Nombre de tentatives
+    route_costs = [_calculate_route_cost(r, problem, penalties) for r in routes]
+    profiles = [_route_profile(r, problem) for r in routes]
 
-    for _ in range(num_attempts):
-        try:
-            idx_r1, idx_r2 = random.sample(range(len(routes)), 2)
-        except ValueError:
-            break 
-            
+    route_pairs = list(itertools.combinations(range(len(routes)), 2))
+    random.shuffle(route_pairs)
+
+    for idx_r1, idx_r2 in route_pairs:
         r1 = routes[idx_r1]
         r2 = routes[idx_r2]
-        
-        if not r1 or not r2: continue
-
-        # Choisir un point de coupe pour chaque tournée
-        cut_point_1 = random.randrange(len(r1))
-        cut_point_2 = random.randrange(len(r2))
-        
-        # Définir les têtes et les queues
-        r1_head, r1_tail = r1[:cut_point_1], r1[cut_point_1:]
-        r2_head, r2_tail = r2[:cut_point_2], r2[cut_point_2:]
-        
-        # Créer les nouvelles tournées
-        r1_new = r1_head + r2_tail
-        r2_new = r2_head + r1_tail
 
-        # 1. Vérifier les incompatibilités (vérification rapide)
-        #    On vérifie qu'un client de r1_head n'est pas incompatible
-        #    avec un client de r2_tail (et vice-versa).
-        
-        # (Pour simplifier, on vérifie juste la tournée finale)
-        if _check_incompatibility_in_route(r1_new, problem):
-            continue
-        if _check_incompatibility_in_route(r2_new, problem):
+        if route_costs[idx_r1] == float('inf') or route_costs[idx_r2] == float('inf'):
             continue
 
-        # 2. Vérifier les coûts
-        cost_r1_old = _calculate_route_cost(r1, problem)
-        cost_r2_old = _calculate_route_cost(r2, problem)
-        
-        if cost_r1_old == float('inf') or cost_r2_old == float('inf'):
+        p1, p2 = profiles[idx_r1], profiles[idx_r2]
+        cost_before = route_costs[idx_r1] + route_costs[idx_r2]
+
+        for cut_point_1 in range(len(r1)):
+            for cut_point_2 in range(len(r2)):
+                # Échanger les deux queues entières revient à échanger les tournées
+                if cut_point_1 == 0 and cut_point_2 == 0:
+                    continue
+                if _budget_exhausted(budget):
+                    return individual
+
+                # 1. Capacité (demandes cumulées)
+                demand_r1_new = p1['demand_prefix'][cut_point_1] + p2['demand_prefix'][-1] - p2['demand_prefix'][cut_point_2]
+                demand_r2_new = p2['demand_prefix'][cut_point_2] + p1['demand_prefix'][-1] - p1['demand_prefix'][cut_point_1]
+                if penalties is None and (demand_r1_new > problem.vehicle_capacity or
+                                          demand_r2_new > problem.vehicle_capacity):
+                    continue
+
+                # 2. Incompatibilités: queue de r2 contre tête de r1 (et inversement)
+                head1_bits = p1['bits_suffix'][0] & ~p1['bits_suffix'][cut_point_1]
+                head2_bits = p2['bits_suffix'][0] & ~p2['bits_suffix'][cut_point_2]
+                if p2['incomp_suffix'][cut_point_2] & head1_bits:
+                    continue
+                if p1['incomp_suffix'][cut_point_1] & head2_bits:
+                    continue
+
+                # 3. Fenêtres de temps (concaténation tête + queue)
+                r2_tail = r2[cut_point_2:]
+                r1_tail = r1[cut_point_1:]
+                if penalties is None:
+                    if not _is_time_feasible(p1, cut_point_1, r2_tail, p2['suffix'][cut_point_2], len(r1), problem):
+                        continue
+                    if not _is_time_feasible(p2, cut_point_2, r1_tail, p1['suffix'][cut_point_1], len(r2), problem):
+                        continue
+
+                # 4. Coût exact des deux nouvelles tournées
+                r1_new = r1[:cut_point_1] + r2_tail
+                r2_new = r2[:cut_point_2] + r1_tail
+                cost_after = (_calculate_route_cost(r1_new, problem, penalties) +
+                              _calculate_route_cost(r2_new, problem, penalties))
+                
+                # 5. Accepter si amélioration
+                if cost_after < cost_before - 1e-5:
+                    routes[idx_r1] = r1_new
+                    routes[idx_r2] = r2_new
+                    return _build_individual(routes)
+
+    # Si aucune amélioration trouvée
+    return individual
+
+# ---------------------------------------------------------------------------
+# OPÉRATEUR 4: CROSS-EXCHANGE (Échange de segments entre tournées)
+# ---------------------------------------------------------------------------
+
+# Longueur maximale (k) des segments échangés par CROSS-exchange
+CROSS_MAX_SEGMENT_LENGTH = 3
+
+def _apply_cross_exchange(individual: Individual, problem: ProblemInstance,
+                          budget: SearchBudget = None,
+                          penalties: PenaltyWeights = None,
+                          max_segment_length=CROSS_MAX_SEGMENT_LENGTH) -> Individual:
+    """
+    CROSS-exchange: échange deux segments d'au plus k clients entre deux
+    tournées (un des segments peut être vide: déplacement d'un segment).
+
+    A: 0 -> A_head -> X -> A_tail -> 0
+    B: 0 -> B_head -> Y -> B_tail -> 0
+
+    Devient:
+
+    A': 0 -> A_head -> Y -> A_tail -> 0
+    B': 0 -> B_head -> X -> B_tail -> 0
+
+    Filtres O(1) (capacité, masques d'incompatibilité, concaténation de
+    segments pour les fenêtres de temps) avant le calcul du coût exact.
+    Premier échange améliorant. En mode pénalisé, seules les
+    incompatibilités restent un filtre dur.
+    """
+
+    routes = _get_routes(individual)
+    if len(routes) < 2:
+        return individual
+
+    route_costs = [_calculate_route_cost(r, problem, penalties) for r in routes]
+    profiles = [_route_profile(r, problem) for r in routes]
+    # segments[r][i] = segments commençant en i (longueurs 1..k)
+    segments = [
+        [_segments_from(r, i, max_segment_length, problem) for i in range(len(r))]
+        for r in routes
+    ]
+    empty_segment = (None, 0.0, 0, 0)
+
+    route_pairs = list(itertools.combinations(range(len(routes)), 2))
+    random.shuffle(route_pairs)
+
+    for idx_r1, idx_r2 in route_pairs:
+        r1 = routes[idx_r1]
+        r2 = routes[idx_r2]
+
+        if route_costs[idx_r1] == float('inf') or route_costs[idx_r2] == float('inf'):
             continue
-            
-        cost_before = cost_r1_old + cost_r2_old
-        
-        cost_r1_new = _calculate_route_cost(r1_new, problem)
-        cost_r2_new = _calculate_route_cost(r2_new, problem)
-        
-        if cost_r1_new == float('inf') or cost_r2_new == float('inf'):
-            continue # Invalide (temps, capa)
 
-        cost_after = cost_r1_new + cost_r2_new
-        
-        # 3. Accepter si amélioration
-        if cost_after < cost_before - 1e-5:
-            routes[idx_r1] = r1_new
-            routes[idx_r2] = r2_new
-            
-            # Reconstruire et retourner l'individu amélioré
-            new_representation = [0]
-            for route in routes:
-                if route: new_representation.extend(route); new_representation.append(0)
-            return Individual(new_representation) 
+        p1, p2 = profiles[idx_r1], profiles[idx_r2]
+        bits_r1, bits_r2 = p1['bits_suffix'][0], p2['bits_suffix'][0]
+        demand_r1, demand_r2 = p1['demand_prefix'][-1], p2['demand_prefix'][-1]
+        cost_before = route_costs[idx_r1] + route_costs[idx_r2] + 2 * problem.alpha
+
+        # Candidats X (dans r1) et Y (dans r2): (début, longueur, données)
+        # Le segment vide est représenté une seule fois par position d'insertion.
+        candidates_1 = [(i, 0, empty_segment) for i in range(len(r1) + 1)]
+        for i in range(len(r1)):
+            for m, data in enumerate(segments[idx_r1][i], start=1):
+                candidates_1.append((i, m, data))
+        candidates_2 = [(j, 0, empty_segment) for j in range(len(r2) + 1)]
+        for j in range(len(r2)):
+            for m, data in enumerate(segments[idx_r2][j], start=1):
+                candidates_2.append((j, m, data))
+
+        for i, m1, (seg_x, demand_x, bits_x, incomp_x) in candidates_1:
+            for j, m2, (seg_y, demand_y, bits_y, incomp_y) in candidates_2:
+                if m1 == 0 and m2 == 0:
+                    continue
+                if _budget_exhausted(budget):
+                    return individual
+
+                # 1. Capacité (mode strict)
+                if penalties is None:
+                    if demand_r1 - demand_x + demand_y > problem.vehicle_capacity:
+                        continue
+                    if demand_r2 - demand_y + demand_x > problem.vehicle_capacity:
+                        continue
+
+                # 2. Incompatibilités (masques)
+                if incomp_y & (bits_r1 & ~bits_x):
+                    continue
+                if incomp_x & (bits_r2 & ~bits_y):
+                    continue
+
+                # 3. Fenêtres de temps (concaténation de segments)
+                x = r1[i:i + m1]
+                y = r2[j:j + m2]
+                if penalties is None:
+                    if not _is_time_feasible(p1, i, y, seg_y, i + m1, problem):
+                        continue
+                    if not _is_time_feasible(p2, j, x, seg_x, j + m2, problem):
+                        continue
+
+                # 4. Coût exact (alpha économisé si une tournée se vide)
+                r1_new = r1[:i] + y + r1[i + m1:]
+                r2_new = r2[:j] + x + r2[j + m2:]
+                cost_after = (
+                    _calculate_route_cost(r1_new, problem, penalties) +
+                    _calculate_route_cost(r2_new, problem, penalties) +
+                    problem.alpha * (bool(r1_new) + bool(r2_new))
+                )
+
+                if cost_after < cost_before - 1e-5:
+                    routes[idx_r1] = r1_new
+                    routes[idx_r2] = r2_new
+                    return _build_individual(routes)
 
-    # Si aucune amélioration trouvée
     return individual
 
 # ---------------------------------------------------------------------------
-# FONCTION PRINCIPALE (Wrapper) - MISE À JOUR
+# ORDONNANCEUR VND ADAPTATIF
 # ---------------------------------------------------------------------------
 
-def apply_local_search(individual: Individual, problem: ProblemInstance) -> Individual:
+# Opérateurs disponibles pour la VND, dans l'ordre par défaut.
+LOCAL_SEARCH_OPERATORS = [
+    ('2-opt', _apply_2_opt_intra_route),
+    ('relocate', _apply_relocate_inter_route),
+    ('exchange', _apply_exchange_inter_route),
+    ('cross', _apply_cross_exchange),
+]
+
+class LocalSearchStats:
+    """
+    Statistiques par opérateur de recherche locale (appels, succès,
+    temps, gain), partagées entre tous les appels de apply_local_search.
+
+    Elles servent à ordonner les opérateurs par "gain par seconde"
+    et à sauter (la plupart du temps) ceux qui n'améliorent presque jamais.
+    Avec deterministic=True, le coût est mesuré en mouvements évalués
+    plutôt qu'en secondes (ordre reproductible pour une graine donnée).
+    """
+
+    def __init__(self, operators=None, min_calls=30, skip_threshold=0.02, exploration=0.1,
+                 deterministic=False):
+        self.operators = list(operators or LOCAL_SEARCH_OPERATORS)
+        self.min_calls = min_calls            # Appels avant de pouvoir sauter un opérateur
+        self.skip_threshold = skip_threshold  # Taux de succès en dessous duquel on saute
+        self.exploration = exploration        # Probabilité de l'essayer quand même
+        self.deterministic = deterministic
+        self.stats = {
+            name: {'appels': 0, 'succes': 0, 'temps': 0.0, 'evaluations': 0, 'gain': 0.0}
+            for name, _ in self.operators
+        }
+
+    def copy(self):
+        """Copie indépendante (mêmes paramètres, mêmes compteurs)."""
+        clone = LocalSearchStats(self.operators, self.min_calls, self.skip_threshold, self.exploration,
+                                 self.deterministic)
+        clone.stats = {name: dict(s) for name, s in self.stats.items()}
+        return clone
+
+    def merge(self, other: 'LocalSearchStats', baseline: 'LocalSearchStats'):
+        """
+        Ajoute ce que 'other' a accumulé depuis 'baseline' (copie dont il
+        est issu). Sert à rapatrier les statistiques des processus workers.
+        """
+        for name, s in self.stats.items():
+            for key in s:
+                s[key] += other.stats[name][key] - baseline.stats[name][key]
+
+    def record(self, name, elapsed, gain, improved, evaluations=0):
+        """Enregistre le résultat d'un appel d'opérateur."""
+        s = self.stats[name]
+        s['appels'] += 1
+        s['temps'] += elapsed
+        s['evaluations'] += evaluations
+        if improved:
+            s['succes'] += 1
+            s['gain'] += gain
+
+    def success_rate(self, name):
+        s = self.stats[name]
+        return s['succes'] / s['appels'] if s['appels'] else 0.0
+
+    def gain_per_second(self, name):
+        s = self.stats[name]
+        return s['gain'] / s['temps'] if s['temps'] > 0 else 0.0
+
+    def gain_per_evaluation(self, name):
+        s = self.stats[name]
+        return s['gain'] / s['evaluations'] if s['evaluations'] > 0 else 0.0
+
+    def ordered_operators(self):
+        """
+        Ordre adaptatif: les opérateurs jamais essayés d'abord
+        (optimisme), puis par gain par seconde (ou par évaluation) décroissant.
+        """
+        efficiency = self.gain_per_evaluation if self.deterministic else self.gain_per_second
+        return sorted(
+            self.operators,
+            key=lambda op: (self.stats[op[0]]['appels'] > 0, -efficiency(op[0]))
+        )
+
+    def should_skip(self, name):
+        """Saute un opérateur peu rentable, sauf exploration aléatoire."""
+        if self.stats[name]['appels'] < self.min_calls:
+            return False
+        if self.success_rate(name) >= self.skip_threshold:
+            return False
+        return random.random() >= self.exploration
+
+    def summary(self):
+        """Résumé par opérateur (pour l'affichage / l'export)."""
+        rows = []
+        for name, _ in self.operators:
+            s = self.stats[name]
+            rows.append({
+                'operateur': name,
+                'appels': s['appels'],
+                'succes': s['succes'],
+                'taux_succes': self.success_rate(name),
+                'temps': s['temps'],
+                'evaluations': s['evaluations'],
+                'gain': s['gain'],
+                'gain_par_seconde': self.gain_per_second(name),
+            })
+        return rows
+
+# ---------------------------------------------------------------------------
+# FONCTION PRINCIPALE (Wrapper) - VND
+# ---------------------------------------------------------------------------
+
+def apply_local_search(individual: Individual, problem: ProblemInstance,
+                       stats: LocalSearchStats = None,
+                       budget: SearchBudget = None,
+                       penalties: PenaltyWeights = None) -> Individual:
     """
     Fonction principale (wrapper) appelée par mga.py.
-    Applique 2-Opt, PUIS Relocate, PUIS Exchange.
-   
+    Descente à voisinages variables (VND): on applique les opérateurs
+    dans l'ordre; dès qu'un opérateur améliore, on repart du premier.
+    On s'arrête quand aucun opérateur n'améliore (optimum local).
+
+    Si 'stats' est fourni, l'ordre des opérateurs est adaptatif et
+    les résultats de chaque appel y sont enregistrés.
+
+    Si 'budget' (SearchBudget: secondes et/ou évaluations) est fourni,
+    l'appel s'arrête dès qu'il est épuisé et retourne la meilleure
+    solution trouvée jusque-là. Après l'appel, budget.evaluations et
+    budget.elapsed() indiquent ce qui a été consommé.
+
+    Si 'penalties' est fourni, la recherche se fait en mode pénalisé:
+    elle peut traverser (et retourner) des solutions infaisables en
+    fenêtres de temps / capacité.
     """
-    
-    # --- 1. Optimisation 2-Opt (Intra-tournée) ---
-    new_representation = [0]
-    current_route = []
-    for node_id in individual.representation[1:]:
-        if node_id == 0:
-            if current_route:
-                improved_route = _apply_2_opt_to_route(current_route, problem)
-                new_representation.extend(improved_route)
-                new_representation.append(0)
-            current_route = []
+    current = individual
+    current_cost = _calculate_solution_cost(current, problem, penalties)
+    if current_cost == float('inf'):
+        return individual # Pas de recherche locale sur une solution invalide
+
+    # Budget illimité par défaut: sert seulement à compter les évaluations
+    if budget is None:
+        budget = SearchBudget()
+
+    operators = stats.ordered_operators() if stats else LOCAL_SEARCH_OPERATORS
+
+    k = 0
+    while k < len(operators):
+        if budget.exhausted():
+            break
+        name, operator = operators[k]
+
+        if stats and stats.should_skip(name):
+            k += 1
+            continue
+
+        start = time.perf_counter()
+        evaluations_before = budget.evaluations
+        candidate = operator(current, problem, budget, penalties)
+        elapsed = time.perf_counter() - start
+
+        gain = 0.0
+        if candidate is not current:
+            candidate_cost = _calculate_solution_cost(candidate, problem, penalties)
+            gain = current_cost - candidate_cost
+        improved = gain > 1e-5
+
+        if stats:
+            stats.record(name, elapsed, gain, improved, budget.evaluations - evaluations_before)
+
+        if improved:
+            current, current_cost = candidate, candidate_cost
+            # Retour au premier voisinage (ordre ré-évalué)
+            if stats:
+                operators = stats.ordered_operators()
+            k = 0
         else:
-            current_route.append(node_id)
-            
-    individual_after_2opt = Individual(new_representation)
-    
-    # --- 2. Optimisation Relocate (Inter-tournées) ---
-    individual_after_relocate = _apply_relocate_inter_route(individual_after_2opt, problem)
-    
-    # --- 3. NOUVEAU: Optimisation Exchange (Inter-tournées) ---
-    individual_after_exchange = _apply_exchange_inter_route(individual_after_relocate, problem)
-    
-    # Retourner l'individu final, triplement optimisé
-    return individual_after_exchange
\ No newline at end of file
+            k += 1
+
+    return current
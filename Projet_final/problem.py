@@ -2,6 +2,11 @@ import math
 import json
 import itertools # <-- NOUVEL IMPORT pour comparer les paires
 
+try:
+    import numpy as np
+except ImportError:
+    np = None # NumPy est optionnel (calculs vectorisés désactivés)
+
 class ProblemInstance:
     """
     Cette classe contient toutes les données d'une instance du VRPTW-C.
@@ -10,13 +15,17 @@ class ProblemInstance:
     """
     
     def __init__(self, filepath, alpha, beta):
+        self.filepath = filepath # Conservé pour recharger l'instance (processus workers)
         self.alpha = alpha
         self.beta = beta
         self.clients = {}
         self.depot = None
         self.vehicle_capacity = 0 
         self.incompatibilities = set()
+        # Masque binaire par client: bit j à 1 si le client est incompatible avec j
+        self.incompatibility_masks = {}
         self.distance_matrix = []
+        self._distance_array = None # Copie NumPy de distance_matrix (créée à la demande)
         
         print(f"--- 1. Chargement de l'instance JSON ---")
         self._load_json_instance(filepath)
@@ -116,6 +125,7 @@ class ProblemInstance:
         except FileNotFoundError:
             print(f"Fichier d'incompatibilité manuelle '{incomp_filepath}' non trouvé.")
             self.incompatibilities = set()
+            self.incompatibility_masks = {}
             
     
     # NOUVELLE FONCTION
@@ -174,6 +184,12 @@ class ProblemInstance:
         """Ajoute une paire d'incompatibilité à l'ensemble."""
         pair = tuple(sorted((client1, client2)))
         self.incompatibilities.add(pair)
+        self.incompatibility_masks[client1] = self.incompatibility_masks.get(client1, 0) | (1 << client2)
+        self.incompatibility_masks[client2] = self.incompatibility_masks.get(client2, 0) | (1 << client1)
+
+    def get_incompatibility_mask(self, client_id):
+        """Masque binaire des clients incompatibles avec 'client_id'."""
+        return self.incompatibility_masks.get(client_id, 0)
             
     
     # (Le reste du fichier: _calculate_distances, get_distance, get_node
@@ -209,6 +225,17 @@ class ProblemInstance:
         except IndexError:
             return 0 
 
+    def get_distance_array(self):
+        """
+        Matrice des distances sous forme de tableau NumPy (construite une
+        seule fois). Retourne None si NumPy n'est pas installé.
+        """
+        if np is None:
+            return None
+        if self._distance_array is None:
+            self._distance_array = np.array(self.distance_matrix, dtype=float)
+        return self._distance_array
+
     def get_node(self, node_id):
         """Récupère le dictionnaire de données pour un nœud (client ou dépôt)."""
         if node_id == 0:
@@ -0,0 +1,242 @@
+# Fichier: route_minimization.py
+#
+# Phase de RÉDUCTION DU NOMBRE DE VÉHICULES (Ejection Pool).
+#
+# Avec un coût fixe alpha élevé, le nombre de véhicules domine la fonction
+# objectif. Cette phase essaie de supprimer des tournées une par une:
+#   1. On retire une tournée et on place ses clients dans un "pool d'éjection".
+#   2. On réinsère les clients du pool un par un:
+#        a. insertion faisable (meilleure position),
+#        b. sinon "squeeze": insertion infaisable puis réparation en
+#           déplaçant des clients de la tournée vers d'autres tournées,
+#        c. sinon "ejection": insertion en éjectant jusqu'à k clients de la
+#           tournée (ceux-ci retournent dans le pool).
+#   3. Si le pool est vidé, la tournée est supprimée pour de bon.
+# Des compteurs p[v] (nombre d'échecs d'insertion du client v) orientent les
+# éjections vers les clients "faciles" et évitent de tourner en rond.
+
+import random
+import time
+import itertools
+from individual import Individual
+from problem import ProblemInstance
+from operators_local_search import _calculate_route_cost, _route_demand, _route_violation
+from operators_local_search import _get_routes, _build_individual
+from vector_scoring import _route_schedule, _insertion_delta
+
+# ---------------------------------------------------------------------------
+# FONCTIONS UTILITAIRES
+# ---------------------------------------------------------------------------
+
+def _route_bits(route):
+    """Masque binaire des clients d'une tournée."""
+    bits = 0
+    for client_id in route:
+        bits |= 1 << client_id
+    return bits
+
+def _is_compatible(client_id, route, problem: ProblemInstance):
+    """Le client peut-il partager la tournée (incompatibilités) ?"""
+    return not (problem.get_incompatibility_mask(client_id) & _route_bits(route))
+
+def _best_feasible_insertion(routes, client_id, problem: ProblemInstance, exclude=None):
+    """
+    Meilleure insertion FAISABLE du client (évaluée sans re-simuler les
+    tournées, voir _insertion_delta). Retourne (r_idx, position) ou None.
+    """
+    demand = problem.get_node(client_id)['demand']
+    best = None
+    best_increase = float('inf')
+
+    for r_idx, route in enumerate(routes):
+        if r_idx == exclude:
+            continue
+        if _route_demand(route, problem) + demand > problem.vehicle_capacity:
+            continue
+        if not _is_compatible(client_id, route, problem):
+            continue
+
+        schedule = _route_schedule(route, problem)
+        for pos in range(len(route) + 1):
+            increase = _insertion_delta(route, schedule, pos, client_id, problem)
+            if increase is None:
+                continue
+            if increase < best_increase:
+                best_increase = increase
+                best = (r_idx, pos)
+    return best
+
+# ---------------------------------------------------------------------------
+# MOUVEMENTS D'INSERTION: SQUEEZE ET EJECTION
+# ---------------------------------------------------------------------------
+
+def _try_squeeze(routes, client_id, problem: ProblemInstance, max_candidates=3):
+    """
+    "Squeeze": insère le client à une position infaisable (violation
+    minimale), puis tente de rendre la tournée faisable en déplaçant
+    certains de ses clients vers d'autres tournées.
+    Modifie 'routes' et retourne True en cas de succès.
+    """
+    # Positions candidates triées par violation croissante
+    candidates = []
+    for r_idx, route in enumerate(routes):
+        if not _is_compatible(client_id, route, problem):
+            continue
+        for pos in range(len(route) + 1):
+            new_route = route[:pos] + [client_id] + route[pos:]
+            candidates.append((_route_violation(new_route, problem), r_idx, pos))
+    candidates.sort()
+
+    for _, r_idx, pos in candidates[:max_candidates]:
+        trial_routes = [r.copy() for r in routes]
+        trial_routes[r_idx].insert(pos, client_id)
+
+        # Réparation gloutonne: on sort des clients tant que c'est infaisable
+        violation = _route_violation(trial_routes[r_idx], problem)
+        while violation > 1e-9:
+            best_move = None
+            best_violation = violation
+            for u in trial_routes[r_idx]:
+                if u == client_id:
+                    continue
+                reduced = [c for c in trial_routes[r_idx] if c != u]
+                reduced_violation = _route_violation(reduced, problem)
+                if reduced_violation >= best_violation:
+                    continue
+                target = _best_feasible_insertion(trial_routes, u, problem, exclude=r_idx)
+                if target is not None:
+                    best_move = (u, target)
+                    best_violation = reduced_violation
+            if best_move is None:
+                break
+            u, (t_idx, t_pos) = best_move
+            trial_routes[r_idx].remove(u)
+            trial_routes[t_idx].insert(t_pos, u)
+            violation = best_violation
+
+        if violation <= 1e-9 and _route_demand(trial_routes[r_idx], problem) <= problem.vehicle_capacity:
+            routes[:] = trial_routes
+            return True
+
+    return False
+
+def _try_ejection(routes, client_id, problem: ProblemInstance, penalties, max_ejected=2):
+    """
+    Insertion avec éjection: insère le client dans une tournée en retirant
+    jusqu'à 'max_ejected' clients, en minimisant la somme des compteurs
+    p[u] des clients éjectés (puis leur nombre).
+    Modifie 'routes' et retourne la liste des clients éjectés (None si échec).
+    """
+    incompat_mask = problem.get_incompatibility_mask(client_id)
+    best = None
+    best_key = (float('inf'), float('inf'))
+
+    for r_idx, route in enumerate(routes):
+        # Les clients incompatibles doivent obligatoirement être éjectés
+        forced = [u for u in route if incompat_mask & (1 << u)]
+        if len(forced) > max_ejected:
+            continue
+        others = [u for u in route if u not in forced]
+
+        for extra in range(max_ejected - len(forced) + 1):
+            for combo in itertools.combinations(others, extra):
+                ejected = forced + list(combo)
+                if not ejected:
+                    continue
+                key = (sum(penalties.get(u, 0) for u in ejected), len(ejected))
+                if key >= best_key:
+                    continue
+                reduced = [c for c in route if c not in ejected]
+                for pos in range(len(reduced) + 1):
+                    new_route = reduced[:pos] + [client_id] + reduced[pos:]
+                    if _route_demand(new_route, problem) > problem.vehicle_capacity:
+                        break
+                    if _calculate_route_cost(new_route, problem) != float('inf'):
+                        best_key = key
+                        best = (r_idx, new_route, ejected)
+                        break
+
+    if best is None:
+        return None
+    r_idx, new_route, ejected = best
+    routes[r_idx] = new_route
+    return ejected
+
+# ---------------------------------------------------------------------------
+# FONCTION PRINCIPALE
+# ---------------------------------------------------------------------------
+
+def _try_remove_route(routes, route_idx, problem: ProblemInstance, penalties, deadline,
+                      max_ejected=2, max_iterations=1000):
+    """
+    Tente de supprimer la tournée 'route_idx' via le pool d'éjection.
+    Retourne les nouvelles tournées en cas de succès, sinon None
+    (échec, délai dépassé ou trop d'itérations).
+    """
+    routes = [r.copy() for r in routes]
+    ejection_pool = routes.pop(route_idx)
+    random.shuffle(ejection_pool)
+
+    for _ in range(max_iterations):
+        if not ejection_pool:
+            break
+        if time.perf_counter() >= deadline:
+            return None
+
+        client_id = ejection_pool.pop() # LIFO
+
+        # a. Insertion faisable
+        insertion = _best_feasible_insertion(routes, client_id, problem)
+        if insertion is not None:
+            r_idx, pos = insertion
+            routes[r_idx].insert(pos, client_id)
+            continue
+
+        # b. Squeeze
+        if _try_squeeze(routes, client_id, problem):
+            continue
+
+        # c. Éjection (le client devient plus "difficile")
+        penalties[client_id] = penalties.get(client_id, 0) + 1
+        ejected = _try_ejection(routes, client_id, problem, penalties, max_ejected)
+        if ejected is None:
+            return None # Client impossible à placer
+        ejection_pool.extend(ejected)
+
+    if ejection_pool:
+        return None
+    return [r for r in routes if r]
+
+def minimize_routes(individual: Individual, problem: ProblemInstance, time_limit=10.0,
+                    max_ejected=2) -> Individual:
+    """
+    Réduit le nombre de véhicules de 'individual' en supprimant des
+    tournées tant que le budget de temps (secondes) le permet.
+    Retourne un NOUVEL individu (fitness calculée), jamais infaisable:
+    si aucune tournée n'a pu être supprimée, c'est une copie de l'entrée.
+    """
+    deadline = time.perf_counter() + time_limit
+    routes = _get_routes(individual)
+    penalties = {}
+
+    # Ordre d'essai: les petites tournées d'abord (plus faciles à vider),
+    # avec une part d'aléatoire; on réessaie tant qu'il reste du temps.
+    failed = set()
+    while len(routes) > 1 and time.perf_counter() < deadline:
+        candidates = [i for i in range(len(routes)) if tuple(routes[i]) not in failed]
+        if not candidates:
+            break
+        candidates.sort(key=lambda i: len(routes[i]) + random.random() * 2)
+        route_idx = candidates[0]
+
+        new_routes = _try_remove_route(routes, route_idx, problem, penalties, deadline, max_ejected)
+        if new_routes is None:
+            failed.add(tuple(routes[route_idx]))
+            continue
+
+        routes = new_routes
+        failed.clear()
+
+    result = _build_individual(routes)
+    result.calculate_fitness(problem)
+    return result
@@ -0,0 +1,464 @@
+# Fichier: tabu.py
+#
+# RECHERCHE TABOU GRANULAIRE: troisième moteur (config MOTEUR = "tabu"),
+# ou phase d'intensification après le MGA (TABOU_INTENSIFICATION).
+#
+# - Voisinages inter-tournées: relocate (client inséré avant / après un
+#   voisin), swap (échange de deux clients), 2-opt* (échange des fins de
+#   deux tournées, crée l'arc c -> v). Mouvements "granulaires": v parcourt
+#   seulement les 'neighbors' plus proches voisins compatibles de c.
+# - Deltas incrémentaux: le delta d'un mouvement est gardé en cache tant
+#   que ses deux tournées n'ont pas changé (seuls les mouvements touchant
+#   les deux tournées modifiées sont réévalués). Relocate: retrait (en
+#   cache par tournée) + insertion par décalage (_insertion_delta).
+#   Swap / 2-opt*: capacité et incompatibilités par masques, faisabilité
+#   temporelle en O(1) par concaténation de segments; le coût exact n'est
+#   calculé que pour les candidats faisables.
+# - Liste tabou par attributs: les arcs supprimés par un mouvement ne
+#   peuvent pas être recréés pendant 'tenure' itérations, sauf aspiration
+#   (nouvelle meilleure solution).
+# - Mémoire des solutions visitées: empreinte (XOR des empreintes des arcs,
+#   mise à jour en O(1)); un mouvement qui ramène à une solution déjà
+#   visitée est refusé, et chaque cycle détecté allonge la durée tabou.
+
+import random
+import time
+from problem import ProblemInstance
+from individual import Individual
+from operators_local_search import apply_local_search, LocalSearchStats, SearchBudget
+from operators_local_search import _calculate_route_cost, _get_routes, _build_individual
+from operators_local_search import _route_profile, _node_segment, _concat_segments
+from vector_scoring import _route_schedule, _insertion_delta
+from constructors import CONSTRUCTORS, initial_solution
+from mga import Incumbent
+
+MASK_64 = (1 << 64) - 1
+
+def _arc_hash(a, b):
+    """Empreinte 64 bits de l'arc a -> b (mélange "splitmix64")."""
+    z = (a * 0x9E3779B97F4A7C15 + b * 0xBF58476D1CE4E5B9 + 0x94D049BB133111EB) & MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return z ^ (z >> 31)
+
+def _route_arcs(route):
+    """Arcs d'une tournée, dépôt compris (aucun pour une tournée vide)."""
+    if not route:
+        return []
+    nodes = [0] + route + [0]
+    return list(zip(nodes, nodes[1:]))
+
+MOVE_KINDS = ('relocate', 'swap', '2-opt*')
+
+class TabuSearch:
+    """
+    Moteur tabou (voir l'en-tête du fichier). Même interface que
+    MemeticAlgorithm et ALNS: run() / run_iter(), best_solution,
+    stop_reason, get_operator_statistics().
+    """
+
+    def __init__(self, problem: ProblemInstance, iterations, neighbors=20,
+                 tenure=(7, 15), max_tenure_bonus=30, final_local_search=True,
+                 initial=None, constructor='best_insertion', seeds=None, seed=None,
+                 max_time=None, max_stagnation=None, target_cost=None):
+        self.problem = problem
+        self.iterations = iterations
+        self.neighbors = neighbors
+        # Durée tabou tirée dans [tenure_min, tenure_max], allongée de 1 à
+        # chaque cycle détecté (au plus 'max_tenure_bonus'), puis raccourcie
+        # de 1 toutes les 100 itérations sans cycle.
+        self.tenure = tenure
+        self.max_tenure_bonus = max_tenure_bonus
+        # VND du MGA appliquée à la meilleure solution en fin de recherche
+        self.final_local_search = final_local_search
+
+        # Solution de départ: 'initial' (ex: meilleure solution du MGA), sinon
+        # constructeur + graines comme l'ALNS
+        self.initial = initial
+        if constructor != 'best_insertion' and constructor not in CONSTRUCTORS:
+            raise ValueError(f"Constructeur initial inconnu: {constructor}")
+        self.constructor = constructor
+        self.seeds = seeds or []
+        self.seed = seed
+
+        self.max_time = max_time
+        self.max_stagnation = max_stagnation
+        self.target_cost = target_cost
+
+        self.best_solution = None
+        self.time_to_first_generation = None # Temps jusqu'à la solution initiale
+        self.stop_reason = None
+        self.generations_done = 0            # Itérations effectuées
+        self.cycles_detected = 0
+        self.ls_stats = LocalSearchStats(deterministic=seed is not None)
+        # Statistiques par voisinage: mouvements appliqués, améliorants,
+        # temps d'évaluation, gain
+        self.move_stats = {kind: {'appels': 0, 'succes': 0, 'temps': 0.0, 'evaluations': 0, 'gain': 0.0}
+                           for kind in MOVE_KINDS}
+
+    # ---------------------------------------------------------------------------
+    # ÉTAT DE LA SOLUTION COURANTE
+    # ---------------------------------------------------------------------------
+
+    def _load(self, individual: Individual):
+        """Initialise les données par tournée (les indices de tournées restent fixes)."""
+        self.routes = [route.copy() for route in _get_routes(individual)]
+        n = len(self.routes)
+        self.costs = [0.0] * n
+        self.demands = [0.0] * n
+        self.bits = [0] * n
+        self.versions = [0] * n
+        self.route_hashes = [0] * n
+        self.route_of = {}
+        self.pos_of = {}
+        self._profiles = [None] * n  # _route_profile, calculé à la demande
+        self._schedules = [None] * n # _route_schedule, calculé à la demande
+        self._removal = [None] * n   # delta de retrait de chaque position
+        self.solution_hash = 0
+        for r_idx in range(n):
+            self._refresh_route(r_idx)
+        self.current_cost = sum(self.costs) + self.problem.alpha * self._num_vehicles()
+        self._move_cache = {}
+
+    def _refresh_route(self, r_idx):
+        """La tournée r_idx a changé: coût, demande, masques, positions, empreinte."""
+        route = self.routes[r_idx]
+        self.costs[r_idx] = _calculate_route_cost(route, self.problem) if route else 0.0
+        self.demands[r_idx] = sum(self.problem.get_node(c)['demand'] for c in route)
+        bits = 0
+        for pos, client_id in enumerate(route):
+            bits |= 1 << client_id
+            self.route_of[client_id] = r_idx
+            self.pos_of[client_id] = pos
+        self.bits[r_idx] = bits
+        self.versions[r_idx] += 1
+        self._profiles[r_idx] = self._schedules[r_idx] = self._removal[r_idx] = None
+
+        route_hash = 0
+        for a, b in _route_arcs(route):
+            route_hash ^= _arc_hash(a, b)
+        self.solution_hash ^= self.route_hashes[r_idx] ^ route_hash
+        self.route_hashes[r_idx] = route_hash
+
+    def _num_vehicles(self):
+        return sum(1 for route in self.routes if route)
+
+    def _profile(self, r_idx):
+        if self._profiles[r_idx] is None:
+            self._profiles[r_idx] = _route_profile(self.routes[r_idx], self.problem)
+        return self._profiles[r_idx]
+
+    def _schedule(self, r_idx):
+        if self._schedules[r_idx] is None:
+            self._schedules[r_idx] = _route_schedule(self.routes[r_idx], self.problem)
+        return self._schedules[r_idx]
+
+    def _removal_delta(self, r_idx, pos):
+        """Variation du coût (alpha compris si la tournée se vide) en retirant route[pos]."""
+        if self._removal[r_idx] is None:
+            self._removal[r_idx] = [None] * len(self.routes[r_idx])
+        deltas = self._removal[r_idx]
+        if deltas[pos] is None:
+            route = self.routes[r_idx]
+            if len(route) == 1:
+                deltas[pos] = -self.costs[r_idx] - self.problem.alpha
+            else:
+                deltas[pos] = _calculate_route_cost(route[:pos] + route[pos + 1:], self.problem) - self.costs[r_idx]
+        return deltas[pos]
+
+    def _incompatible(self, client_id, bits):
+        """Vrai si le client est incompatible avec un des clients de 'bits'."""
+        return bool(self.problem.get_incompatibility_mask(client_id) & bits)
+
+    # ---------------------------------------------------------------------------
+    # MOUVEMENTS: nouvelles tournées, arcs supprimés / créés, delta
+    # ---------------------------------------------------------------------------
+
+    def _new_routes(self, kind, c, v, side):
+        """(r1, r2, nouvelle tournée r1, nouvelle tournée r2) du mouvement."""
+        r1, r2 = self.route_of[c], self.route_of[v]
+        route1, route2 = self.routes[r1], self.routes[r2]
+        i, j = self.pos_of[c], self.pos_of[v]
+        if kind == 'relocate':
+            pos = j + side # side: 0 = avant v, 1 = après v
+            return r1, r2, route1[:i] + route1[i + 1:], route2[:pos] + [c] + route2[pos:]
+        if kind == 'swap':
+            return r1, r2, route1[:i] + [v] + route1[i + 1:], route2[:j] + [c] + route2[j + 1:]
+        # 2-opt*: r1 = début de r1 jusqu'à c + fin de r2 depuis v
+        return r1, r2, route1[:i + 1] + route2[j:], route2[:j] + route1[i + 1:]
+
+    def _arcs(self, kind, c, v, side):
+        """(arcs supprimés, arcs créés) du mouvement."""
+        r1, r2 = self.route_of[c], self.route_of[v]
+        route1, route2 = self.routes[r1], self.routes[r2]
+        i, j = self.pos_of[c], self.pos_of[v]
+        p1 = route1[i - 1] if i > 0 else 0
+        n1 = route1[i + 1] if i + 1 < len(route1) else 0
+        p2 = route2[j - 1] if j > 0 else 0
+        n2 = route2[j + 1] if j + 1 < len(route2) else 0
+        if kind == 'relocate':
+            a, b = (p2, v) if side == 0 else (v, n2)
+            removed = [(p1, c), (c, n1), (a, b)]
+            added = [(p1, n1), (a, c), (c, b)]
+        elif kind == 'swap':
+            removed = [(p1, c), (c, n1), (p2, v), (v, n2)]
+            added = [(p1, v), (v, n1), (p2, c), (c, n2)]
+        else:
+            removed = [(c, n1), (p2, v)]
+            added = [(c, v), (p2, n1)]
+        return [arc for arc in removed if arc != (0, 0)], [arc for arc in added if arc != (0, 0)]
+
+    def _evaluate(self, kind, c, v, side):
+        """Delta exact du coût Z du mouvement, ou None s'il est infaisable."""
+        problem = self.problem
+        r1, r2 = self.route_of[c], self.route_of[v]
+        route1, route2 = self.routes[r1], self.routes[r2]
+        i, j = self.pos_of[c], self.pos_of[v]
+        q_c = problem.get_node(c)['demand']
+        q_v = problem.get_node(v)['demand']
+
+        if kind == 'relocate':
+            if self.demands[r2] + q_c > problem.vehicle_capacity or self._incompatible(c, self.bits[r2]):
+                return None
+            insertion = _insertion_delta(route2, self._schedule(r2), j + side, c, problem)
+            if insertion is None:
+                return None
+            return self._removal_delta(r1, i) + insertion
+
+        if kind == 'swap':
+            if self.demands[r1] - q_c + q_v > problem.vehicle_capacity or \
+               self.demands[r2] - q_v + q_c > problem.vehicle_capacity:
+                return None
+            if self._incompatible(v, self.bits[r1] & ~(1 << c)) or self._incompatible(c, self.bits[r2] & ~(1 << v)):
+                return None
+            # Faisabilité temporelle en O(1): préfixe + client + suffixe
+            for r_idx, route, pos, client_id in ((r1, route1, i, v), (r2, route2, j, c)):
+                profile = self._profile(r_idx)
+                last = route[pos - 1] if pos > 0 else 0
+                seg = _concat_segments(profile['prefix'][pos], last, _node_segment(client_id, problem), client_id, problem)
+                if pos + 1 < len(route):
+                    seg = _concat_segments(seg, client_id, profile['suffix'][pos + 1], route[pos + 1], problem)
+                if not seg[3]:
+                    return None
+        else:
+            profile1, profile2 = self._profile(r1), self._profile(r2)
+            # Capacité et incompatibilités (préfixes / suffixes)
+            if profile1['demand_prefix'][i + 1] + self.demands[r2] - profile2['demand_prefix'][j] > problem.vehicle_capacity or \
+               profile2['demand_prefix'][j] + self.demands[r1] - profile1['demand_prefix'][i + 1] > problem.vehicle_capacity:
+                return None
+            head1 = self.bits[r1] & ~profile1['bits_suffix'][i + 1]
+            head2 = self.bits[r2] & ~profile2['bits_suffix'][j]
+            if head1 & profile2['incomp_suffix'][j] or head2 & profile1['incomp_suffix'][i + 1]:
+                return None
+            # Faisabilité temporelle en O(1)
+            if not _concat_segments(profile1['prefix'][i + 1], c, profile2['suffix'][j], v, problem)[3]:
+                return None
+            if i + 1 < len(route1):
+                last = route2[j - 1] if j > 0 else 0
+                if not _concat_segments(profile2['prefix'][j], last, profile1['suffix'][i + 1], route1[i + 1], problem)[3]:
+                    return None
+
+        # Coût exact des deux tournées recomposées (candidats faisables seulement)
+        _, _, new1, new2 = self._new_routes(kind, c, v, 0)
+        delta = 0.0
+        for r_idx, route in ((r1, new1), (r2, new2)):
+            cost = _calculate_route_cost(route, problem) if route else -problem.alpha
+            if cost == float('inf'):
+                return None
+            delta += cost - self.costs[r_idx]
+        return delta
+
+    def _candidate_moves(self):
+        """Mouvements granulaires (genre, c, v, côté): v parmi les plus proches voisins compatibles de c."""
+        problem = self.problem
+        moves = []
+        swaps = set()
+        for c in problem.clients:
+            incomp = problem.get_incompatibility_mask(c)
+            compatible = [v for v in problem.clients if v != c and not incomp & (1 << v)]
+            compatible.sort(key=lambda v: problem.get_distance(c, v))
+            for v in compatible[:self.neighbors]:
+                moves.append(('relocate', c, v, 0))
+                moves.append(('relocate', c, v, 1))
+                moves.append(('2-opt*', c, v, 0))
+                if (v, c) not in swaps:
+                    swaps.add((c, v))
+                    moves.append(('swap', c, v, 0))
+        return moves
+
+    def _move_delta(self, move):
+        """Delta du mouvement, en cache tant que ses deux tournées n'ont pas changé."""
+        kind, c, v, side = move
+        r1, r2 = self.route_of[c], self.route_of[v]
+        cached = self._move_cache.get(move)
+        if cached is not None and cached[0] == self.versions[r1] and cached[1] == self.versions[r2] \
+                and cached[2] == (r1, r2):
+            return cached[3]
+        start = time.perf_counter()
+        delta = self._evaluate(kind, c, v, side)
+        stats = self.move_stats[kind]
+        stats['temps'] += time.perf_counter() - start
+        stats['evaluations'] += 1
+        self._move_cache[move] = (self.versions[r1], self.versions[r2], (r1, r2), delta)
+        return delta
+
+    def _apply(self, move, delta):
+        kind, c, v, side = move
+        r1, r2, new1, new2 = self._new_routes(kind, c, v, side)
+        self.routes[r1] = new1
+        self.routes[r2] = new2
+        self._refresh_route(r1)
+        self._refresh_route(r2)
+        self.current_cost += delta
+
+    # ---------------------------------------------------------------------------
+    # BOUCLE PRINCIPALE
+    # ---------------------------------------------------------------------------
+
+    def run(self, callback=None):
+        """Lance la recherche tabou; 'callback(incumbent)' à chaque nouvelle meilleure solution."""
+        for incumbent in self.run_iter():
+            if callback is not None:
+                callback(incumbent)
+        return self.best_solution
+
+    def run_iter(self):
+        """Générateur "anytime": un Incumbent à chaque nouvelle meilleure solution (voir mga.py)."""
+        self._start_time = time.perf_counter()
+        if self.seed is not None:
+            random.seed(self.seed)
+        try:
+            yield from self._run()
+        except GeneratorExit:
+            self.stop_reason = 'interrupted'
+            raise
+
+    def _check_stop(self, stagnation):
+        """Raison d'arrêter avant la prochaine itération (None = continuer)."""
+        if self.target_cost is not None and self.best_solution.fitness <= self.target_cost:
+            return 'target_cost'
+        if self.max_stagnation is not None and stagnation >= self.max_stagnation:
+            return 'stagnation'
+        if self.max_time is not None and time.perf_counter() - self._start_time >= self.max_time:
+            return 'time_limit'
+        return None
+
+    def _run(self):
+        problem = self.problem
+        current = self.initial if self.initial is not None else initial_solution(problem, self.constructor, self.seeds)
+        current.calculate_fitness(problem)
+        if current.fitness == float('inf'):
+            raise Exception("Solution de départ infaisable (tabou).")
+        self.best_solution = current
+        self.time_to_first_generation = time.perf_counter() - self._start_time
+        print(f"Solution initiale: {current.fitness:.2f} ({current.num_vehicles} véhicules)")
+        yield Incumbent(current, self.time_to_first_generation, 0)
+
+        self._load(current)
+        moves = self._candidate_moves()
+        best_cost = self.current_cost
+        visited = {self.solution_hash}
+        tabu = {}           # arc -> dernière itération où il est tabou
+        tenure_bonus = 0
+        last_cycle = 0
+        last_improvement = 0
+
+        self.stop_reason = 'generations'
+        for it in range(self.iterations):
+            reason = self._check_stop(it - last_improvement)
+            if reason is not None:
+                self.stop_reason = reason
+                print(f"Arrêt avant l'itération {it+1}: {reason}")
+                break
+
+            # Meilleur mouvement admissible (non tabou et vers une solution
+            # non visitée, ou aspiration)
+            chosen = None
+            chosen_delta = float('inf')
+            chosen_arcs = None
+            revisit_delta = float('inf') # Meilleur mouvement refusé car déjà visité
+            for move in moves:
+                if self.route_of[move[1]] == self.route_of[move[2]]:
+                    continue # Voisinages inter-tournées uniquement
+                delta = self._move_delta(move)
+                if delta is None or delta >= chosen_delta:
+                    continue
+                removed, added = self._arcs(*move)
+                new_hash = self.solution_hash
+                for a, b in removed + added:
+                    new_hash ^= _arc_hash(a, b)
+                if self.current_cost + delta < best_cost - 1e-9:
+                    pass # Aspiration: nouvelle meilleure solution
+                elif new_hash in visited:
+                    revisit_delta = min(revisit_delta, delta)
+                    continue
+                elif any(tabu.get(arc, -1) >= it for arc in added):
+                    continue
+                chosen, chosen_delta, chosen_arcs = move, delta, removed
+
+            if revisit_delta < chosen_delta: # Sans la mémoire, la recherche cyclerait
+                self.cycles_detected += 1
+                tenure_bonus = min(self.max_tenure_bonus, tenure_bonus + 1)
+                last_cycle = it
+
+            if chosen is None:
+                self.stop_reason = 'no_move'
+                print(f"Aucun mouvement admissible à l'itération {it+1}")
+                break
+
+            self._apply(chosen, chosen_delta)
+            visited.add(self.solution_hash)
+            expiry = it + random.randint(*self.tenure) + tenure_bonus
+            for arc in chosen_arcs:
+                tabu[arc] = expiry
+            if it - last_cycle >= 100 and tenure_bonus > 0:
+                tenure_bonus -= 1
+                last_cycle = it
+
+            stats = self.move_stats[chosen[0]]
+            stats['appels'] += 1
+            if chosen_delta < 0:
+                stats['succes'] += 1
+                stats['gain'] -= chosen_delta
+
+            if self.current_cost < best_cost - 1e-9:
+                best_cost = self.current_cost
+                last_improvement = it + 1
+                self.best_solution = _build_individual([route for route in self.routes if route])
+                self.best_solution.calculate_fitness(problem)
+                yield Incumbent(self.best_solution, time.perf_counter() - self._start_time, it + 1)
+
+            if (it + 1) % 100 == 0:
+                print(f"Itération {it+1}/{self.iterations} | Meilleure Fitness: {best_cost:.2f} "
+                      f"| Courante: {self.current_cost:.2f} | cycles détectés: {self.cycles_detected}")
+            self.generations_done = it + 1
+
+        # VND finale, limitée au temps restant si 'max_time' est fixé
+        budget = None
+        if self.max_time is not None:
+            budget = SearchBudget(max_seconds=self.max_time - (time.perf_counter() - self._start_time))
+        if self.final_local_search and (budget is None or budget.max_seconds > 0):
+            polished = apply_local_search(self.best_solution, problem, self.ls_stats, budget)
+            polished.calculate_fitness(problem)
+            if polished.fitness < self.best_solution.fitness:
+                self.best_solution = polished
+                yield Incumbent(polished, time.perf_counter() - self._start_time, self.generations_done)
+
+        print("\n--- Optimisation Terminée (tabou) ---")
+
+    def get_operator_statistics(self):
+        """Statistiques par voisinage tabou, puis VND finale."""
+        rows = []
+        for kind in MOVE_KINDS:
+            s = self.move_stats[kind]
+            rows.append({
+                'operateur': f"tabou {kind}",
+                'appels': s['appels'],
+                'succes': s['succes'],
+                'taux_succes': s['succes'] / s['appels'] if s['appels'] else 0.0,
+                'temps': s['temps'],
+                'evaluations': s['evaluations'],
+                'gain': s['gain'],
+                'gain_par_seconde': s['gain'] / s['temps'] if s['temps'] > 0 else 0.0,
+            })
+        return rows + self.ls_stats.summary()
@@ -0,0 +1,95 @@
+# Projet/tools/bench_repair.py
+#
+# Compare les réparations (best insertion, regret-k, I1, bruitée): on détruit
+# aléatoirement une part des clients de solutions initiales, on répare,
+# et on mesure la qualité (coût Z, véhicules) et le temps de réparation.
+import os
+import sys
+import io
+import time
+import random
+import argparse
+import contextlib
+
+# Base directory is the project root (parent of this tools folder)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from problem import ProblemInstance
+from mga import MemeticAlgorithm
+from insertion import I1Criterion, RegretCriterion, NoiseCriterion
+from operators_genetic import _repair_with_best_insertion
+from operators_local_search import _get_routes, _build_individual
+
+METHODS = {
+    'best': None,
+    'regret2': RegretCriterion(2),
+    'regret3': RegretCriterion(3),
+    'regretm': RegretCriterion('m'),
+    'i1': I1Criterion(),
+    'noise': NoiseCriterion(), # Réparation bruitée de l'ALNS
+}
+
+
+def _destroyed_copies(problem, count, destroy_rate, seed):
+    """(tournées partielles, clients retirés) à partir de solutions initiales variées."""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        mga = MemeticAlgorithm(problem, count, 0, 0.0, 0.0, 0)
+        solutions = [mga._create_randomized_solution() for _ in range(count)]
+
+    cases = []
+    for solution in solutions:
+        routes = _get_routes(solution)
+        clients = [c for route in routes for c in route]
+        removed = random.sample(clients, max(1, int(len(clients) * destroy_rate)))
+        removed_set = set(removed)
+        routes = [[c for c in route if c not in removed_set] for route in routes]
+        removed.sort(key=lambda cid: problem.get_node(cid)['l'])
+        cases.append(([r for r in routes if r], removed))
+    return cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare la qualité et le temps des réparations par insertion.")
+    parser.add_argument('instance', help="Fichier d'instance JSON (ex: data/json/R101.json)")
+    parser.add_argument('--methods', nargs='+', choices=list(METHODS.keys()), default=list(METHODS.keys()))
+    parser.add_argument('--cases', type=int, default=10, help="Nombre de solutions détruites/réparées")
+    parser.add_argument('--destroy', type=float, default=0.3, help="Part des clients retirés")
+    parser.add_argument('--alpha', type=float, default=100)
+    parser.add_argument('--beta', type=float, default=2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        problem = ProblemInstance(args.instance, args.alpha, args.beta)
+    cases = _destroyed_copies(problem, args.cases, args.destroy, args.seed)
+
+    print(f"{'méthode':<10} | {'Z moyen':>12} | {'véhicules':>9} | {'temps (s)':>9} | {'gain Z / s':>12}")
+    reference = None
+    for name in args.methods:
+        total_z = total_vehicles = total_time = 0.0
+        for routes, removed in cases:
+            routes = [r.copy() for r in routes]
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                routes = _repair_with_best_insertion(routes, list(removed), problem, METHODS[name])
+            total_time += time.perf_counter() - start
+            repaired = _build_individual(routes)
+            repaired.calculate_fitness(problem)
+            total_z += repaired.fitness
+            total_vehicles += repaired.num_vehicles
+
+        mean_z = total_z / len(cases)
+        if reference is None:
+            reference = mean_z
+        # Qualité par unité de temps: gain de Z par rapport à la 1ère méthode, par seconde de réparation
+        gain_per_second = (reference - mean_z) / (total_time / len(cases)) if total_time > 0 else 0.0
+        print(f"{name:<10} | {mean_z:>12.2f} | {total_vehicles / len(cases):>9.2f} | "
+              f"{total_time / len(cases):>9.4f} | {gain_per_second:>12.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
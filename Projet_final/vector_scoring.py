@@ -0,0 +1,187 @@
+# Fichier: vector_scoring.py
+#
+# ÉVALUATION VECTORISÉE (NumPy) DES INSERTIONS.
+#
+# La solution est "aplatie" en emplacements d'insertion: un emplacement par
+# paire de nœuds consécutifs (p, n) d'une tournée, dépôt compris. Pour un
+# client c, une seule expression NumPy donne, sur TOUS les emplacements de
+# TOUTES les tournées:
+#   - le détour d(p,c) + d(c,n) - d(p,n),
+#   - la faisabilité temporelle (heure de départ de p, heure de début au
+#     plus tard de n),
+#   - une borne inférieure de la hausse de coût: détour + beta x (retard de c
+#     + décalage de n); les clients suivants ne peuvent qu'ajouter du retard.
+# Les appelants n'évaluent ensuite exactement que les emplacements
+# faisables, par borne inférieure croissante, en s'arrêtant dès que la borne
+# dépasse le meilleur coût exact trouvé.
+
+from problem import ProblemInstance
+
+try:
+    import numpy as np
+except ImportError:
+    np = None # Sans NumPy, les appelants gardent leurs boucles Python
+
+# En dessous de ce nombre d'emplacements, les boucles Python restent plus rapides
+VECTOR_MIN_SLOTS = 64
+TIME_TOLERANCE = 1e-6
+
+# ---------------------------------------------------------------------------
+# CALENDRIER D'UNE TOURNÉE ET COÛT D'UNE INSERTION (sans re-simulation)
+# ---------------------------------------------------------------------------
+
+def _route_schedule(route, problem: ProblemInstance):
+    """
+    Calendrier d'une tournée (supposée faisable):
+      start[k]  = heure de début de service du k-ième client,
+      latest[k] = heure de début au plus tard du k-ième client telle que
+                  la suite de la tournée reste faisable.
+    """
+    n = len(route)
+    start = [0.0] * n
+    current_time = 0.0
+    last = 0
+    for k, client_id in enumerate(route):
+        client = problem.get_node(client_id)
+        current_time = max(client['e'], current_time + problem.get_distance(last, client_id))
+        start[k] = current_time
+        current_time += client['s']
+        last = client_id
+
+    latest = [0.0] * n
+    for k in range(n - 1, -1, -1):
+        client = problem.get_node(route[k])
+        latest[k] = client['l']
+        if k < n - 1:
+            latest[k] = min(latest[k], latest[k + 1] - client['s'] - problem.get_distance(route[k], route[k + 1]))
+    return start, latest
+
+def _insertion_delta(route, schedule, pos, client_id, problem: ProblemInstance):
+    """
+    Hausse EXACTE du coût de tournée (distance + beta x retards) si le
+    client est inséré à la position 'pos', ou None si une fenêtre de temps
+    est violée. 'schedule' = _route_schedule(route) (tournée faisable).
+
+    - Faisabilité en O(1): le client doit commencer avant l_u, et son
+      successeur avant son heure de début au plus tard.
+    - Retards: celui du client, plus le décalage ("push forward") des
+      clients suivants; le décalage diminue de l'attente de chaque client
+      et s'arrête dès qu'il est absorbé (O(1) dans le cas courant, au pire
+      la fin de la tournée).
+    """
+    start, latest = schedule
+    client = problem.get_node(client_id)
+    i = route[pos - 1] if pos > 0 else 0
+    departure_i = start[pos - 1] + problem.get_node(i)['s'] if pos > 0 else 0.0
+
+    d_iu = problem.get_distance(i, client_id)
+    start_u = max(client['e'], departure_i + d_iu)
+    if start_u > client['l']:
+        return None
+    delay = start_u - client['e']
+
+    j = route[pos] if pos < len(route) else 0
+    d_uj = problem.get_distance(client_id, j)
+    if pos < len(route):
+        new_start_j = max(problem.get_node(j)['e'], start_u + client['s'] + d_uj)
+        if new_start_j > latest[pos]:
+            return None
+        shift = max(0.0, new_start_j - start[pos])
+        k = pos
+        while shift > 0:
+            delay += shift
+            k += 1
+            if k == len(route):
+                break
+            previous = route[k - 1]
+            arrival = start[k - 1] + problem.get_node(previous)['s'] + problem.get_distance(previous, route[k])
+            shift = max(0.0, shift - (start[k] - arrival)) # Attente absorbée
+
+    return d_iu + d_uj - problem.get_distance(i, j) + problem.beta * delay
+
+# ---------------------------------------------------------------------------
+# SCORE VECTORISÉ DES INSERTIONS
+# ---------------------------------------------------------------------------
+
+def vector_scoring_available(num_slots):
+    """Vrai si NumPy est disponible et que la solution est assez grande."""
+    return np is not None and num_slots >= VECTOR_MIN_SLOTS
+
+class InsertionScorer:
+    """
+    Emplacements d'insertion d'un ensemble de tournées, sous forme de
+    tableaux NumPy par tournée (concaténés à la demande): après une
+    modification, seuls les tableaux de la tournée concernée sont refaits.
+    """
+
+    def __init__(self, routes, problem: ProblemInstance):
+        self.problem = problem
+        self.distances = problem.get_distance_array()
+        self._route_slots = [self._build_slots(route) for route in routes]
+        self._flat = None
+
+    def _build_slots(self, route):
+        """Tableaux des emplacements d'une tournée (m clients -> m + 1 emplacements)."""
+        problem = self.problem
+        start, latest = _route_schedule(route, problem)
+        departure = [0.0] + [start[k] + problem.get_node(c)['s'] for k, c in enumerate(route)]
+        return (
+            np.array([0] + route),                                   # p
+            np.array(route + [0]),                                   # n
+            np.array(departure),                                     # départ de p
+            np.array(start + [0.0]),                                 # début de n
+            np.array(latest + [float('inf')]),                       # début au plus tard de n
+            np.array([problem.get_node(c)['e'] for c in route] + [0.0]), # e de n
+        )
+
+    def update_route(self, r_idx, route):
+        """La tournée r_idx a changé (ou vient d'être créée si r_idx == nombre de tournées)."""
+        if r_idx == len(self._route_slots):
+            self._route_slots.append(self._build_slots(route))
+        else:
+            self._route_slots[r_idx] = self._build_slots(route)
+        self._flat = None
+
+    @property
+    def num_slots(self):
+        return sum(len(slots[0]) for slots in self._route_slots)
+
+    def _flatten(self):
+        if self._flat is None:
+            columns = [np.concatenate([slots[i] for slots in self._route_slots]) for i in range(6)]
+            sizes = [len(slots[0]) for slots in self._route_slots]
+            slot_route = np.repeat(np.arange(len(sizes)), sizes)
+            offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int)
+            slot_pos = np.arange(len(slot_route)) - offsets[slot_route]
+            self._flat = columns + [slot_route, slot_pos]
+        return self._flat
+
+    def score(self, client_id, allowed_routes=None):
+        """
+        Score de toutes les insertions du client.
+        'allowed_routes': tableau booléen par tournée (capacité,
+        incompatibilités...) ou None.
+        Retourne (r_idx, position, borne inférieure) des emplacements
+        temporellement faisables, triés par (borne, r_idx, position).
+        """
+        prev, nxt, departure, start_next, latest_next, e_next, slot_route, slot_pos = self._flatten()
+        D = self.distances
+        client = self.problem.get_node(client_id)
+
+        d_prev = D[prev, client_id]
+        d_next = D[client_id, nxt]
+        start_u = np.maximum(client['e'], departure + d_prev)
+        new_start_next = np.maximum(e_next, start_u + client['s'] + d_next)
+
+        # Tolérance: les heures au plus tard sont calculées à rebours (arrondis);
+        # les appelants confirment de toute façon par une évaluation exacte.
+        feasible = (start_u <= client['l'] + TIME_TOLERANCE) & (new_start_next <= latest_next + TIME_TOLERANCE)
+        if allowed_routes is not None:
+            feasible &= allowed_routes[slot_route]
+
+        shift = np.where(nxt == 0, 0.0, new_start_next - start_next)
+        lower_bound = d_prev + d_next - D[prev, nxt] + self.problem.beta * (start_u - client['e'] + shift)
+
+        idx = np.nonzero(feasible)[0]
+        order = idx[np.lexsort((slot_pos[idx], slot_route[idx], lower_bound[idx]))]
+        return list(zip(slot_route[order].tolist(), slot_pos[order].tolist(), lower_bound[order].tolist()))
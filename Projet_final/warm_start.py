@@ -0,0 +1,99 @@
+# Fichier: warm_start.py
+#
+# DÉMARRAGE À CHAUD: solutions "graines" injectées dans la population
+# initiale du MGA (paramètre 'seeds' / config SOLUTIONS_INITIALES).
+#
+# Sources acceptées:
+#   - fichier .sol (Vrp-Set: lignes "Route #k: c1 c2 ..."),
+#   - CSV de résultats du MGA (results_mga: colonne "Route" = "0 -> a -> ... -> 0"),
+#   - liste de tournées [[c1, c2, ...], ...] ou Individual.
+# Chaque graine est rendue faisable pour l'instance courante (clients
+# inconnus ou en double retirés, clients violant capacité / fenêtres de
+# temps / incompatibilités retirés, puis tous les clients manquants
+# réinsérés par la réparation habituelle).
+
+import os
+import csv
+import re
+from individual import Individual
+from problem import ProblemInstance
+from operators_genetic import _repair_with_best_insertion
+from operators_local_search import _calculate_route_cost, _get_routes, _build_individual
+
+_SOL_ROUTE = re.compile(r'^\s*Route\s*#\s*\d+\s*:(.*)$', re.IGNORECASE)
+
+# ---------------------------------------------------------------------------
+# LECTURE DES SOURCES
+# ---------------------------------------------------------------------------
+
+def read_sol_file(path):
+    """Tournées d'un fichier .sol ("Route #k: c1 c2 ...")."""
+    routes = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            match = _SOL_ROUTE.match(line)
+            if match:
+                routes.append([int(token) for token in match.group(1).split()])
+    return routes
+
+def read_results_csv(path):
+    """Tournées d'un CSV de résultats du MGA (lignes "Véhicule, 0 -> ... -> 0, ...")."""
+    routes = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if len(row) >= 2 and '->' in row[1]:
+                nodes = [int(token) for token in row[1].split('->')]
+                routes.append([node_id for node_id in nodes if node_id != 0])
+    return routes
+
+def load_routes(source):
+    """Tournées (listes de clients) d'une source (chemin, liste de tournées ou Individual)."""
+    if isinstance(source, Individual):
+        return _get_routes(source)
+    if isinstance(source, (str, os.PathLike)):
+        extension = os.path.splitext(str(source))[1].lower()
+        if extension == '.sol':
+            return read_sol_file(source)
+        if extension == '.csv':
+            return read_results_csv(source)
+        raise ValueError(f"Format de solution inconnu: {source}")
+    return [list(route) for route in source]
+
+# ---------------------------------------------------------------------------
+# RÉPARATION DE FAISABILITÉ
+# ---------------------------------------------------------------------------
+
+def repair_seed(routes, problem: ProblemInstance, criterion=None) -> Individual:
+    """
+    Rend une graine faisable pour 'problem': chaque tournée est parcourue
+    dans l'ordre et un client n'est gardé que si la tournée reste faisable
+    (capacité, incompatibilités, fenêtres de temps strictes); les clients
+    écartés et ceux absents de la graine sont réinsérés par
+    _repair_with_best_insertion ('criterion' comme pour le MGA).
+    """
+    seen = set()
+    kept_routes = []
+    for route in routes:
+        kept, demand, incomp = [], 0.0, 0
+        for client_id in route:
+            if client_id not in problem.clients or client_id in seen:
+                continue
+            client_demand = problem.get_node(client_id)['demand']
+            if demand + client_demand > problem.vehicle_capacity or incomp & (1 << client_id):
+                continue
+            if _calculate_route_cost(kept + [client_id], problem) == float('inf'):
+                continue
+            kept.append(client_id)
+            seen.add(client_id)
+            demand += client_demand
+            incomp |= problem.get_incompatibility_mask(client_id)
+        if kept:
+            kept_routes.append(kept)
+
+    missing = sorted((c for c in problem.clients if c not in seen), key=lambda cid: problem.get_node(cid)['l'])
+    kept_routes = _repair_with_best_insertion(kept_routes, missing, problem, criterion)
+    return _build_individual(kept_routes)
+
+def load_seeds(sources, problem: ProblemInstance, criterion=None):
+    """Individus (faisables, non évalués) construits à partir des sources."""
+    return [repair_seed(load_routes(source), problem, criterion) for source in sources]